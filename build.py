@@ -7,6 +7,7 @@ nuitka_args = [
     '--assume-yes-for-downloads',
     '--plugin-enable=numpy',
     '--include-data-dir=data=data',
+    '--include-package=scripts',  # modules, events and tools are imported lazily by name
     '--output-dir=Release',
     '--user-plugin=nuitka_plugins/MediapipePlugin.py',
     '--user-plugin=nuitka_plugins/OpenvinoPlugin.py',
@@ -5,8 +5,13 @@ from scripts.tools.logger import get_logger
 log = get_logger(__name__)
 from motioninput_api import MotionInputAPI as Api
 import ast
-from typing import Any, Optional
+import json
+import time
+from collections import OrderedDict
+from threading import Thread
+from typing import Any, Dict, List, Optional
 from scripts.tools.json_editors.config_editor import ConfigEditor
+from scripts.tools.json_editors.json_patch import diff, split_pointer, validate_operation
 
 api = Api()
 
@@ -21,11 +26,19 @@ ERRORS = {
     "bad_request": "Invalid request format, requests should be of the form <keyword>:<request>",
     "bad_operator": f"Invalid operator used, only GET, UPDATE, ADD, REMOVE, START, END and REBOOT requests are supported",
     "bad_json": f"Invalid JSON path. Paths must be prefixed with {', '.join(EDITORS)}",
-    "illegal_config_operation": "The request you made cannot be performed on the config file"
+    "illegal_config_operation": "The request you made cannot be performed on the config file",
+    "bad_batch": "BATCH requests take a JSON list of UPDATE, ADD and REMOVE requests",
+    "bad_mget": "MGET requests take a JSON list of paths",
+    "bad_mupdate": "MUPDATE requests take a JSON object of paths and values or a JSON patch list",
+    "bad_version": "GET_SINCE requests take a version returned by a previous GET_SINCE",
+    "already_recording": "A gesture is already being recorded, poll RECORD: PROGRESS until it is done"
 }
 CONTROL_COMMANDS = ("START", "STOP", "END", "SHOW",
                     "HIDE", "REBOOT", "CURRENT_STATE")
 SPEECH_ON_SUFFIX = "_speech"
+RECORD_PROGRESS = "PROGRESS"  # RECORD: PROGRESS returns the progress of the gesture recording
+BATCH_OPERATORS = ("UPDATE", "ADD", "REMOVE")  # the requests that can be sent in one BATCH
+VERSION_HISTORY = 32  # versions of the JSON files kept for GET_SINCE
 
 events_editor = api.events_editor()
 
@@ -62,11 +75,22 @@ class Communicator:
             "RECORD": self._process_record_request,
             # "HEATMAP": self._process_heatmap_request,
             "CALIBRATE_MODULE": self._process_calibration_request,
-            "SPEECH": self._process_speech_request
+            "SPEECH": self._process_speech_request,
+            "BATCH": self._process_batch_request,
+            "MGET": self._process_mget_request,
+            "MUPDATE": self._process_mupdate_request,
+            "GET_SINCE": self._process_get_since_request
         }
         self.operation = None
         self.request = None
         self.out = None
+        self._unsaved_editors = None  # editors changed by the current BATCH, saved once it is done
+        self._record_thread = None  # thread of the background RECORD
+        # version -> data of all the JSON files at that version, the data is shared so not copied
+        self._versions = OrderedDict()
+        self._revisions = None  # revisions of the editors at the last version
+        # started from the time, so that the versions of a previous run are not mistaken for the ones of this run
+        self._next_version = int(time.time() * 1000)
 
     def process_command(self, request: str) -> str:
         """Processes a command sent from front end and sends back a response
@@ -108,15 +132,27 @@ class Communicator:
 
 
     def _process_get_request(self, request: str) -> str:
-        list_request, json_path = self._unpack_request(request)
-        editor = self._get_json(list_request[0])
-        if request in EDITORS:
-            self.out[request] = editor.get_all_data()
-        else:
-            self.out[request] = editor.get_data(json_path)
+        self.out[request] = self._get(request)
+        return self.out
+
+
+    def _process_mget_request(self, request: str) -> str:
+        paths = self._load_json(request, ERRORS["bad_mget"])
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            raise TypeError(ERRORS["bad_mget"])
+        for path in paths:
+            self.out[path] = self._get(path)
         return self.out
 
 
+    def _get(self, path: str) -> Any:
+        list_request, json_path = self._unpack_request(path)
+        editor = self._get_json(list_request[0])
+        if path in EDITORS:
+            return editor.get_all_data()
+        return editor.get_data(json_path)
+
+
     @staticmethod
     def _reboot():
         api.stop()
@@ -204,7 +240,7 @@ class Communicator:
             json_path, object_to_add)
         if list_request[0] == "mode":
             editor.add(json_path, object_to_add + SPEECH_ON_SUFFIX)
-        editor.save()
+        self._save(editor)
         return "Object added to JSON file"
 
 
@@ -221,12 +257,24 @@ class Communicator:
             return "No speech change from before"
         else:
             raise TypeError("Unknown error processing speech request")
-        editor.save()
+        self._save(editor)
         return "Registered Speech Change"
 
 
     def _process_record_request(self, request: str) -> str:
+        if request.strip() == RECORD_PROGRESS:
+            return api.get_record_progress()
         parameter_dict = ast.literal_eval(request)
+        # the recorder and the editors it changes are shared, so only one recording at a time
+        if (self._record_thread is not None and self._record_thread.is_alive()) or \
+                api.get_record_progress()["state"] == "recording":
+            raise RuntimeError(ERRORS["already_recording"])
+        if parameter_dict.get("background") == "True":
+            # the GUI polls "RECORD: PROGRESS" meanwhile
+            self._record_thread = Thread(target=self._record_in_background, args=(parameter_dict,), daemon=True,
+                                         name="Thread record gesture")
+            self._record_thread.start()
+            return "Recording started"
         try:
             out = api.record_gesture(parameter_dict)
         except Exception as error:
@@ -234,6 +282,14 @@ class Communicator:
         return out
 
 
+    @staticmethod
+    def _record_in_background(parameter_dict: dict) -> None:
+        try:
+            api.record_gesture(parameter_dict)
+        except Exception:
+            pass  # the error is logged and kept in the record progress
+
+
     def _process_update_request(self, request: str) -> str:
         request, value = self._split_by_delim(request, "=")
         list_request, json_path = self._unpack_request(request)
@@ -246,7 +302,7 @@ class Communicator:
                 normal_mode_values = ast.literal_eval(value)
                 update_with_speech_values = normal_mode_values + SPEECH_EVENTS
                 editor.update(json_path + SPEECH_ON_SUFFIX, str(update_with_speech_values))
-        editor.save()
+        self._save(editor)
         # self._reboot() #Changes take effect
         return "JSON updated"
 
@@ -261,9 +317,137 @@ class Communicator:
         self.out[request] = editor.remove(json_path)
         if list_request[0] == "mode":
             editor.remove(json_path + SPEECH_ON_SUFFIX)
-        editor.save()
+        self._save(editor)
+        return self.out
+
+
+    def _process_batch_request(self, request: str) -> str:
+        """Applies all the requests of the batch and then saves each changed JSON once.
+        If any of the requests fails none of the changes are kept.
+        """
+        requests = self._load_json(request, ERRORS["bad_batch"])
+        if not isinstance(requests, list):
+            raise TypeError(ERRORS["bad_batch"])
+        self._unsaved_editors = {}
+        try:
+            for batch_request in requests:
+                operation, batch_request = self._split_by_delim(batch_request, ": ")
+                if operation not in BATCH_OPERATORS:
+                    raise TypeError(ERRORS["bad_batch"])
+                self.VALID_OPERATORS[operation](batch_request)
+        except Exception:
+            for editor in self._unsaved_editors.values():
+                editor.discard_changes()
+            raise
+        finally:
+            editors, self._unsaved_editors = self._unsaved_editors, None
+        for editor in editors.values():
+            editor.save()
+        return f"{len(requests)} requests applied"
+
+
+    def _process_mupdate_request(self, request: str) -> str:
+        """Applies all the changes in memory, checking the types of the new values against the values they replace,
+        and then saves each changed JSON once. If any of the changes fails none of them are kept.
+        Takes either {"JSON/path": value, ...} or a JSON patch list [{"op": ..., "path": "/JSON/path", ...}, ...]
+        """
+        changes = self._load_json(request, ERRORS["bad_mupdate"])
+        if isinstance(changes, dict):
+            changes = [{"op": "replace", "path": path, "value": value} for path, value in changes.items()]
+        elif not isinstance(changes, list):
+            raise TypeError(ERRORS["bad_mupdate"])
+        # the operations of each JSON, with the paths relative to it
+        operations = {}
+        for operation in changes:
+            validate_operation(operation)
+            keys = split_pointer(operation["path"])
+            editor_name = keys[0]
+            self._get_json(editor_name)
+            if editor_name == "config" and operation["op"] not in ("replace", "test"):
+                raise PermissionError(ERRORS["illegal_config_operation"])
+            path = "/" + "/".join(key.replace("~", "~0").replace("/", "~1") for key in keys[1:])
+            operations.setdefault(editor_name, []).append(dict(operation, path=path))
+            if editor_name == "mode":
+                operations["mode"].extend(self._speech_mode_operations(dict(operation, path=path), keys[1:]))
+
+        try:
+            for editor_name, editor_operations in operations.items():
+                EDITORS[editor_name].apply_patch(editor_operations)
+        except Exception:
+            for editor_name in operations:
+                EDITORS[editor_name].discard_changes()
+            raise
+        for editor_name in operations:
+            self._save(EDITORS[editor_name])
+        return f"{len(changes)} changes applied"
+
+
+    @staticmethod
+    def _speech_mode_operations(operation: Dict[str, Any], keys: List[str]) -> List[Dict[str, Any]]:
+        """Like ADD and REMOVE, adding or removing a mode also adds or removes its speech mode.
+
+        :param operation: operation on the mode JSON, with the path relative to it
+        :param keys: the keys of the path
+        :return: the operations on the speech mode
+        """
+        if operation["op"] not in ("add", "remove") or len(keys) != 2 or keys[0] != "modes" or \
+                keys[1].endswith(SPEECH_ON_SUFFIX):
+            return []
+        if operation["op"] == "remove" and keys[1] + SPEECH_ON_SUFFIX not in EDITORS["mode"].get_data("modes"):
+            return []  # REMOVE ignores a missing speech mode too
+        return [dict(operation, path=operation["path"] + SPEECH_ON_SUFFIX)]
+
+
+    def _process_get_since_request(self, request: str) -> str:
+        """Returns what changed in the JSON files since the given version, as the smallest changed subtrees.
+        An empty request or a version no longer known returns all the data.
+        """
+        request = request.strip()
+        try:
+            since = int(request) if request else None
+        except ValueError:
+            raise TypeError(ERRORS["bad_version"])
+        version = self._get_version()
+        old_data = self._versions.get(since)
+        new_data = self._versions[version]
+        changed, removed = {}, []
+        for editor_name, data in new_data.items():
+            if old_data is None:
+                changed[editor_name] = data
+                continue
+            editor_changed, editor_removed = diff(old_data[editor_name], data, editor_name)
+            changed.update(editor_changed)
+            removed.extend(editor_removed)
+        self.out = {"version": version, "full": old_data is None, "changed": changed, "removed": removed}
         return self.out
 
+
+    def _get_version(self) -> int:
+        revisions = {editor_name: editor.get_revision() for editor_name, editor in EDITORS.items()}
+        if revisions != self._revisions:
+            self._revisions = revisions
+            self._versions[self._next_version] = {editor_name: editor.get_all_data()
+                                                  for editor_name, editor in EDITORS.items()}
+            self._next_version += 1
+            if len(self._versions) > VERSION_HISTORY:
+                self._versions.popitem(last=False)
+        return next(reversed(self._versions))
+
+
+    @staticmethod
+    def _load_json(request: str, error: str) -> Any:
+        try:
+            return json.loads(request)
+        except ValueError:
+            raise TypeError(error)
+
+
+    def _save(self, editor) -> None:
+        if self._unsaved_editors is not None:
+            self._unsaved_editors[id(editor)] = editor
+        else:
+            editor.save()
+
     @ staticmethod
     def _split_by_delim(inp: str, delim: str) -> Optional[list[str]]:
         out = inp.split(delim)
@@ -22,7 +22,7 @@ if(Test-Path $outputname){
 $wdc = ""
 $linktime = 'no'
 
-$cmd = "./$virtual_env_name/Scripts/python.exe -m nuitka $wdc --lto=$linktime --windows-disable-console --assume-yes-for-downloads --standalone --nofollow-import-to='openvino' --plugin-enable=numpy --output-dir=$outputname '$mainname.py'"
+$cmd = "./$virtual_env_name/Scripts/python.exe -m nuitka $wdc --lto=$linktime --windows-disable-console --assume-yes-for-downloads --standalone --include-package=scripts --nofollow-import-to='openvino' --plugin-enable=numpy --output-dir=$outputname '$mainname.py'"
 Invoke-Expression $cmd
 
 $mediapipe = $outputpath + '\mediapipe'
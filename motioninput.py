@@ -1,68 +1,39 @@
 import os
-import struct
-import time
-from concurrent.futures import ThreadPoolExecutor
+import sys
 from subprocess import Popen
+from threading import Thread
 
 from communicator import Communicator
 from motioninput_api import MotionInputAPI
-from scripts.tools.json_editors.config_editor import ConfigEditor
+from scripts.tools import Config
+from scripts.tools.ipc_server import IPCServer, NamedPipeTransport, UnixSocketTransport
 
-PIPE_PATH = r'\\.\pipe\NPtest'  # ! hardcoded named pipe: NPtest
 
-
-config_editor = ConfigEditor()
-communicator = Communicator()
-
-
-"""Constantly reads the named pipe connected with the GUI exe.
-To be passed to concurrent.futures' ThreadPoolExecutor so that
-it can run on background thread.
-Message format: <4bytes int: str msg length> <actual str msg>
-E.g. 5 hello
+"""Serves the requests of the GUI exe on a background thread (see scripts/tools/ipc_server.py)
+while MI runs on the main thread.
+On Windows the GUI exe serves the named pipe set in the config (ipc/pipe_name), which is connected
+to as soon as it exists. Elsewhere a Unix socket (ipc/socket_path) is listened on instead.
 """
 
 
-def read_pipe():
-    global pipe_active
-    pipe_active = True
-    # HACKY: waits for GUI exe to fully start the ServerPipe which python connects to
-    time.sleep(4)
-
-    # open named pipe for IPC with GUI
-    with open(PIPE_PATH, 'r+b', 0) as pipe:
-        print("opened pipe")
-        while pipe_active:
-            # reads 4 bytes i.e. int representing msg length
-            msg_length = struct.unpack('I', pipe.read(4))[0]
-            msg = pipe.read(msg_length).decode(
-                'ascii')  # reads actual msg string
-
-            # msg = input()  # Manual input for testing
-            print(f"Frontend says: {msg}")
-            out = communicator.process_command(msg)
-            print(f"Backend says: {out}")
-            if not out:
-                print("Closing communication")
-                msg_to_send = "Communication Closed".encode('ascii')
-                pipe_active = False
-                pipe.close()
-                break
-            msg_to_send = out.encode('ascii')
-            pipe.write(struct.pack('I', len(msg_to_send)) + msg_to_send)
-            pipe.seek(0)
-            # TODO handle case where GUI windows is closed
+def create_ipc_server() -> IPCServer:
+    config = Config()
+    if sys.platform == "win32":
+        transport = NamedPipeTransport(config.get_data("ipc/pipe_name"), config.get_data("ipc/connect_timeout"))
+    else:
+        transport = UnixSocketTransport(config.get_data("ipc/socket_path"))
+    return IPCServer(Communicator(), transport, config.get_data("ipc/codec"), config.get_data("ipc/push_interval"),
+                     MotionInputAPI.get_status)
 
 
 if __name__ == "__main__":
     gui_process = Popen(os.path.join(os.path.dirname(os.path.realpath(__file__)), "netcoreapp3.1", "WpfParent.exe"))
     # gui_process = Popen(os.path.join(os.path.dirname( os.path.realpath(__file__)), "MI_WpfGUI.exe"))
 
-    executor = ThreadPoolExecutor(1)
-    # places read_pipe() into a background thread
-    future_pipe = executor.submit(read_pipe)
+    ipc_server = create_ipc_server()
+    Thread(target=ipc_server.run, daemon=True, name="Thread IPC").start()
 
-    while pipe_active:
+    while ipc_server.is_running():
         MotionInputAPI.run()
 
 
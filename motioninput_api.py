@@ -6,19 +6,22 @@ This is the starting point of MI
 ''' 
 # Standard
 import os
+import sys
 import time
 from threading import Lock
-from typing import Set
+from typing import Any, Optional, Set
 
 # Local
-from scripts.tools.logger import logger_config, logger_stop
-from scripts import *
+from scripts.tools.logger import logger_config, logger_stop, set_log_frame
+from scripts.gesture_loader import MODULES
+from scripts.tools import Config, ConfigEditor, EventEditor, GestureEditor, ModeEditor
+# Camera, View, Model and ModeController are imported in start(), so that the heavy dependencies
+# (OpenCV, mediapipe, ...) are not loaded before MI is actually started
 
 # TODO: KeyboardListener currently not used 
 #from scripts.tools.keyboard_listener import KeyboardListener
 
 # TODO: Custom gestures currently not used 
-from scripts.tools.customize_gesture_recorder import CustomizeGestureRecorder
 # from scripts.tools.gesture_recorder import GestureRecorder
 # from scripts.tools.heat_map import HeatMap
 
@@ -35,7 +38,8 @@ class MotionInputAPI:
     _gestures_editor = GestureEditor(get_primitives=False)
     _events_editor = EventEditor()
     _config_editor = Config().get_editor()
-    _customize_gesture_recorder = CustomizeGestureRecorder()
+    _customize_gesture_recorder = None  # created on the first recording
+    _record_progress = {"state": "idle", "frames": 0, "total": 0}  # of the last recording, read by the GUI
     # TODO: KeyboardListener
     #_keyboard_listener = KeyboardListener()
     #_keyboard_listener.start()
@@ -48,14 +52,12 @@ class MotionInputAPI:
     _calibrating = None
     _calibrating_params = None
     _active = False
+    _frame_sequence = 0  # frames processed since MI was launched, tagged on the log records
+    _frames = 0  # processed in the current second
+    _fps = 0  # frames processed in the last second
+    _fps_second = 0.0
     _stop_next_iteration = False  # as the view needs to be closed by the main thread and not the communicator thread we use this little hack (:
-    _modules = {
-        "hand": HandModule,
-        "speech": SpeechModule,
-        "body": BodyModule,
-        "head": HeadModule,
-        "eye": EyeModule
-    }
+    _modules = MODULES
     _welcome_msg = WelcomeMsg()
     # TODO: Custom gestures - Heatmap
     # _heatmap = HeatMap()
@@ -86,7 +88,12 @@ class MotionInputAPI:
            
             if cls._active:
                 raise RuntimeError("MI is already running")
-            
+
+            from scripts.core.model import Model
+            from scripts.mode_controller import ModeController
+            from scripts.tools.camera import Camera
+            from scripts.tools.view import View
+
             cls._camera = Camera()
             cls._model = Model()
             cls._view = View(hidden=cls._view_hidden)
@@ -127,6 +134,8 @@ class MotionInputAPI:
                 # TODO is frame_data used here?
                 # FPS
                 frame_data = cls._model.process_frame(image)
+                cls._mode_controller.end_frame()
+                cls._count_frame()
                 # TODO: Custom gestures
                 # cls._gesture_recorder.record_gesture(frame_data, cls._model)
 
@@ -161,6 +170,38 @@ class MotionInputAPI:
 
 
 
+    @classmethod
+    def _count_frame(cls) -> None:
+        cls._frame_sequence += 1
+        set_log_frame(cls._frame_sequence)
+        now = time.perf_counter()
+        if now >= cls._fps_second + 1:
+            cls._fps = cls._frames
+            cls._frames = 0
+            cls._fps_second = now
+        cls._frames += 1
+
+
+    @classmethod
+    def get_status(cls) -> dict:
+        """
+        State of MI pushed to the GUI, read without waiting for the main loop.
+        :return: if MI is running, the current mode, the processed frames per second, the metrics of the
+            input actuator (once used) and the progress of the gesture recording
+        :rtype: dict
+        """
+        from scripts.gesture_event_handlers.input_actuator import peek_input_actuator
+        mode_controller = cls._mode_controller
+        actuator = peek_input_actuator()
+        return {
+            "state": "Active" if cls._active else "Inactive",
+            "mode": mode_controller.get_current_mode() if mode_controller is not None else None,
+            "fps": cls._fps if cls._active else 0,
+            "input_actuator": actuator.get_metrics() if actuator is not None else None,
+            "record": cls.get_record_progress()
+        }
+
+
     @classmethod
     def is_active(cls) -> bool:
         """
@@ -178,6 +219,9 @@ class MotionInputAPI:
             cls._view.close()
         if cls._mode_controller is not None:
             cls._mode_controller.close()
+        # after the releases sent by closing the mode controller, so that no key or button stays held
+        from scripts.gesture_event_handlers.input_actuator import close_input_actuator
+        close_input_actuator()
         if cls._camera is not None:
             cls._camera.close()
 
@@ -294,16 +338,39 @@ class MotionInputAPI:
                 angle_change = False
             else:
                 angle_change = True
+            if cls._customize_gesture_recorder is None:
+                from scripts.tools.customize_gesture_recorder import CustomizeGestureRecorder
+                cls._customize_gesture_recorder = CustomizeGestureRecorder()
+            cls._record_progress = {"state": "recording", "frames": 0, "total": 0}
             res = cls._customize_gesture_recorder.record_gesture_from_file(file_path, "hand", hand, name, angle_change,
                                                                         phrase, attention_point, event,
                                                                         cls._gestures_editor, cls._mode_editor, 
-                                                                        cls._events_editor)
+                                                                        cls._events_editor,
+                                                                        progress_callback=cls._set_record_progress)
         except Exception as exc:
             log.critical(f"Record gesture failed: {exc}")
+            cls._record_progress = dict(cls._record_progress, state="failed", result=str(exc))
             raise
+        cls._record_progress = dict(cls._record_progress, state="done", result=res)
         return res
 
 
+    @classmethod
+    def _set_record_progress(cls, frames: int, total: int) -> None:
+        cls._record_progress = {"state": "recording", "frames": frames, "total": total}
+
+
+    @classmethod
+    def get_record_progress(cls) -> dict:
+        """
+        Progress of the current (or last) gesture recording.
+        :return: state ("idle"/"recording"/"done"/"failed"), frames of the video read, frames in the video and
+            once finished the result message
+        :rtype: dict
+        """
+        return dict(cls._record_progress)
+
+
     # TODO: Heatmap code
     # @classmethod
     # def create_heatmap(cls, parameter_dict):
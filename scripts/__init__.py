@@ -1,18 +1,6 @@
 import os
-import sys
 
-from .body_module import *  # TODO: make sure this needs to be imported?
-from .core import *
-from .event_mapper import EventMapper
-from .eye_module import *
-from .gesture_event_handlers import *
-from .gesture_events import *
-from .gesture_loader import GestureLoader
-from .hand_module import *
-from .head_module import *
-from .mode_controller import ModeController
-from .speech_module import *
-from .tools import *
+from .tools.lazy_import import lazy_attributes
 
 # use: from scripts import DATA_PATH, to get absolute path of data folder.
 # ALWAYS use DATA_PATH
@@ -24,4 +12,67 @@ DATA_PATH = os.path.abspath(
         ),
         "../data"
     )
-) 
+)
+
+# the exported classes are only imported when first accessed, as importing every module up front
+# would load all the ML frameworks (mediapipe, openvino, vosk, ...) even if the current mode does not use them
+_exports = {
+    # core
+    "Gesture": ".core",
+    "GestureEvent": ".core",
+    "GestureFactory": ".core",
+    "Primitive": ".core",
+    "Model": ".core",
+    "Module": ".core",
+    "LandmarkDetector": ".core",
+    "Position": ".core",
+    "PositionTracker": ".core",
+    "RawData": ".core",
+    # body
+    "ExtremityTriggerCalibration": ".body_module",
+    "EMASmoothing": ".body_module",
+    "PoseClassification": ".body_module",
+    "BodyGesture": ".body_module",
+    "BodyLandmarkDetector": ".body_module",
+    "BodyPosition": ".body_module",
+    "BodyModule": ".body_module",
+    # eye
+    "EyeGesture": ".eye_module",
+    "EyeLandmarkDetector": ".eye_module",
+    "EyePosition": ".eye_module",
+    "EyeModule": ".eye_module",
+    # hand
+    "DepthCalibration": ".hand_module",
+    "HandGesture": ".hand_module",
+    "HandLandmarkDetector": ".hand_module",
+    "HandPosition": ".hand_module",
+    "HandModule": ".hand_module",
+    # head
+    "HeadGesture": ".head_module",
+    "HeadLandmarkDetector": ".head_module",
+    "HeadPosition": ".head_module",
+    "HeadCalibrator": ".head_module",
+    "HeadModule": ".head_module",
+    # speech
+    "KITA": ".speech_module",
+    "SpeechGesture": ".speech_module",
+    "SpeechLandmarkDetector": ".speech_module",
+    "SpeechPosition": ".speech_module",
+    "SpeechModule": ".speech_module",
+    # events
+    "EventMapper": ".event_mapper",
+    "GestureEventHandlers": ".gesture_event_handlers",
+    "GestureEvents": ".gesture_events",
+    "GestureLoader": ".gesture_loader",
+    "ModeController": ".mode_controller",
+    # tools
+    "Camera": ".tools",
+    "Config": ".tools",
+    "ConfigEditor": ".tools",
+    "EventEditor": ".tools",
+    "GestureEditor": ".tools",
+    "ModeEditor": ".tools",
+    "View": ".tools"
+}
+__all__ = ["DATA_PATH"] + list(_exports)
+__getattr__ = lazy_attributes(__name__, _exports)
@@ -12,6 +12,9 @@ from .gesture import Gesture
 
 # initialized outside of the model
 class GestureEvent:
+    # if reset() brings the instance back to the state of a new one, so that it can be reused
+    _reusable = False
+
     def __init__(self, gesture_types: Set[str], event_trigger_types: Set[str], bodypart_types: Set[str]):
         self._gesture_types = gesture_types
         self._event_trigger_types = event_trigger_types
@@ -37,6 +40,21 @@ class GestureEvent:
     def get_state(self) -> bool:
         raise NotImplementedError()
 
+    def is_reusable(self) -> bool:
+        """
+        :return: if the instance can be kept to be added to the model again after being removed from it
+        :rtype: bool
+        """
+        return self._reusable
+
+    def reset(self) -> None:
+        """
+        Called when a reusable event is removed from the model to be kept for a later reuse, after force_deactivate.
+        Must drop all the state gathered while in the model, so that the instance behaves like a new one
+        when added to the model again. Events that implement it set _reusable to True.
+        """
+        pass
+
     def force_deactivate(self) -> None:
         """
         As some events need to finish some processing before being deactivated, they can implement this method.
@@ -2,7 +2,7 @@
 Author: Carmen Meinson
 '''
 import threading
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 import numpy as np
 
@@ -37,7 +37,14 @@ class Model:
         """
         return self._modules.keys()
 
-    def switch_events(self, events_to_remove: Set[str], events_to_add: Dict[str, GestureEvent]) -> None:
+    def get_module(self, module_name: str) -> Optional[Module]:
+        """
+        :return: the module instance, None if the module is not active in the model
+        :rtype: Optional[Module]
+        """
+        return self._modules.get(module_name)
+
+    def switch_events(self, events_to_remove: Set[str], events_to_add: Dict[str, GestureEvent]) -> Dict[str, GestureEvent]:
         """ 
         First removes the specified events from the model and adds new ones in afterwards.
         Removing an event may also lead to removing of some gestures that are no longer used by any events in the model.
@@ -47,9 +54,12 @@ class Model:
         :type events_to_remove: Set[str]
         :param events_to_add: names of the events to add mapped to the event instances
         :type events_to_add: Dict[str, GestureEvent]
+        :return: the removed events, names mapped to the event instances
+        :rtype: Dict[str, GestureEvent]
         """
+        removed_events = {}
         for event_name in events_to_remove:
-            self._remove_event(event_name)
+            removed_events[event_name] = self._remove_event(event_name)
 
         for event_name, event in events_to_add.items():
             event.set_up()
@@ -60,6 +70,7 @@ class Model:
             # if the gesture now has no events depending on it we also remove the gesture
             if len(self._gesture_to_events[gesture_name]) == 0:
                 self.remove_gesture(gesture_name)
+        return removed_events
 
     def _add_event(self, event_name: str, event: GestureEvent) -> None:
         """
@@ -84,13 +95,15 @@ class Model:
             event.notify_gesture_activated(gesture)
         self._update_event_state(event)
 
-    def _remove_event(self, event_name: str) -> None:
+    def _remove_event(self, event_name: str) -> GestureEvent:
         """
         Remove an event from the model. Events can be removed during the runtime of the model (aka between frames).
 
         :param event_name: name of the event to remove from the model
         :type event_name: str
         :raises RuntimeError: if the model does not have this event
+        :return: the removed event
+        :rtype: GestureEvent
         """
         if event_name not in self._events:
             raise RuntimeError(
@@ -107,6 +120,7 @@ class Model:
         # remove the mapping to the event from any of the gestures
         for gesture_name in event.get_all_used_gestures():
             self._gesture_to_events[gesture_name].remove(event)
+        return event
 
     def add_gesture(self, module_name: str, gesture_name: str, primitives: Set[Primitive]) -> None:
         """
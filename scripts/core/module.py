@@ -2,6 +2,7 @@
 Author: Carmen Meinson
 '''
 
+from threading import Lock
 from typing import Any, Optional, Set
 
 import numpy as np
@@ -38,6 +39,14 @@ class Module:
     _tracker_names = set()  # names of the trackers from the specific landmark detector e.g. {"Left", "Right"}
 
     _pre_initialized = False
+    _pre_initialization_lock = Lock()  # pre-initialization may be run from the module warm up thread
+    _can_be_prebuilt = True  # if instances can be built ahead of use on another thread
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # each module class is pre-initialized on its own, without waiting for the other modules
+        cls._pre_initialized = False
+        cls._pre_initialization_lock = Lock()
 
     def __init__(self) -> None:
         self.pre_initialize()
@@ -134,14 +143,24 @@ class Module:
         If is not called then all the setup is done when the Module is first initialized. 
         """        
         if cls._pre_initialized: return
-        cls._do_pre_initialization()
-        cls._pre_initialized = True
+        with cls._pre_initialization_lock:
+            if cls._pre_initialized: return
+            cls._do_pre_initialization()
+            cls._pre_initialized = True
 
     @classmethod
     def _do_pre_initialization(cls) -> None:
         # all the time consuming setup required for each module should be implemented here.
         pass
 
+    @classmethod
+    def can_be_prebuilt(cls) -> bool:
+        """
+        :return: if the module can be initialized ahead of use on a background thread. If not, only pre-initialization is done ahead.
+        :rtype: bool
+        """
+        return cls._can_be_prebuilt
+
     def _update_trackers_and_factories(self, raw_data: RawData) -> Set[Gesture]:
         # update the position based on raw data aka coordinates
         new_gestures = set()
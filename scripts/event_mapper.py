@@ -1,16 +1,63 @@
 '''
 Author: Carmen Meinson
 '''
-from typing import Set, Dict, Optional
+from collections import OrderedDict
+from typing import Callable, Set, Dict, Optional
 
-from scripts.core import Model
-from scripts.gesture_event_handlers import *
-from scripts.gesture_events import *
+from scripts.core import GestureEvent, Model
+from scripts.gesture_event_handlers import GestureEventHandlers
+from scripts.gesture_events import GestureEvents
+from scripts.tools import Config
 from scripts.tools.json_editors.event_editor import EventEditor
 #from scripts.tools.json_editors.hotkeys_editor import HotkeysEditor
 from .gesture_loader import GestureLoader
 
 
+class EventSpec:
+    """Everything needed to create the GestureEvent instance of an event,
+    resolved once from the event JSON (the trigger functions when the event is first used)"""
+
+    def __init__(self, event_class: type, event_data: Dict) -> None:
+        self.event_class = event_class
+        self.args = event_data["args"]
+        self.triggers = event_data["triggers"]
+        self.bodypart_names_to_type = event_data["bodypart_names_to_type"]
+        self.trigger_functions = None  # trigger name -> handler function
+
+
+class EventPool:
+    """Keeps the instances of the recently removed events, so that they are reused when the event is added again.
+    Only the events that declare themselves reusable are kept, after being reset."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._events = OrderedDict()  # event name -> instance, the least recently removed first
+
+    def put(self, events: Dict[str, GestureEvent]) -> None:
+        """
+        :param events: the events just removed from the model (names mapped to the instances)
+        :type events: Dict[str, GestureEvent]
+        """
+        for name, event in events.items():
+            if self._size <= 0 or not event.is_reusable():
+                continue
+            event.reset()
+            self._events[name] = event
+            self._events.move_to_end(name)
+            if len(self._events) > self._size:
+                self._events.popitem(last=False)
+
+    def take(self, name: str) -> Optional[GestureEvent]:
+        """
+        :return: the kept instance of the event, None if there is none
+        :rtype: Optional[GestureEvent]
+        """
+        return self._events.pop(name, None)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+
 class EventMapper:
     def __init__(self, event_handlers: GestureEventHandlers):
         self._events = EventEditor().get_all_data()
@@ -19,6 +66,10 @@ class EventMapper:
         self._event_handlers = event_handlers
         self._gesture_loader = GestureLoader()
 
+        self._specs = {}  # event name -> EventSpec
+        self._pool = EventPool(Config().get_data("general/event_pool_size"))
+        self._config_revision = Config().get_editor().get_revision()
+
 
     def switch_events_in_model(self, model: Model, 
                                 event_names_to_remove: Set[str], 
@@ -44,16 +95,18 @@ class EventMapper:
         events_to_add = {}
         gestures_to_add = set()
 
-        for name in event_names_to_add:
-            event_class = self._event_classes.get_event(self._events[name]["type"])
-            event = event_class(**(self._events[name]["args"]))
+        # the pooled events were created with the config of that time
+        config_revision = Config().get_editor().get_revision()
+        if config_revision != self._config_revision:
+            self._pool.clear()
+            self._config_revision = config_revision
 
-            functions = self._get_trigger_functions(self._events[name]["triggers"])
-            event.set_trigger_functions(functions)
-            event.set_bodypart_names(self._events[name]["bodypart_names_to_type"])
-            ###
+        for name in event_names_to_add:
+            event = self._pool.take(name)
+            if event is None:
+                event = self._create_event(name)
             events_to_add[name] = event
-            gestures_to_add = gestures_to_add | set(event.get_all_used_gestures())
+            gestures_to_add.update(event.get_all_used_gestures())
         
         # TODO: Complete Hotkeys Feature
         #if path:
@@ -70,7 +123,25 @@ class EventMapper:
         #    gestures_to_add = gestures_to_add | set(hotkeys_event.get_all_used_gestures())
 
         self._gesture_loader.add_gestures_to_model(model, gestures_to_add)
-        model.switch_events(event_names_to_remove, events_to_add)
+        removed_events = model.switch_events(event_names_to_remove, events_to_add)
+        self._pool.put(removed_events)
+
+
+    def _get_spec(self, name: str) -> EventSpec:
+        if name not in self._specs:
+            event_class = self._event_classes.get_event(self._events[name]["type"])
+            self._specs[name] = EventSpec(event_class, self._events[name])
+        return self._specs[name]
+
+
+    def _create_event(self, name: str) -> GestureEvent:
+        spec = self._get_spec(name)
+        if spec.trigger_functions is None:
+            spec.trigger_functions = self._get_trigger_functions(spec.triggers)
+        event = spec.event_class(**spec.args)
+        event.set_trigger_functions(spec.trigger_functions)
+        event.set_bodypart_names(spec.bodypart_names_to_type)
+        return event
 
 
     def _get_trigger_functions(self, trigger_to_name: Dict[str, str]) -> Dict[str, Callable]:
@@ -78,3 +149,37 @@ class EventMapper:
         for trigger, name in trigger_to_name.items():
             trigger_to_func[trigger] = self._event_handlers.get_handler_func(*name)
         return trigger_to_func
+
+
+    def get_mode_change_targets(self, event_names: Set[str]) -> Set[str]:
+        """
+        :param event_names: names of the events
+        :type event_names: Set[str]
+        :return: names of the modes the given events can directly change the mode to
+        :rtype: Set[str]
+        """
+        modes = set()
+        for name in event_names:
+            for handler_name, function_name in self._events[name]["triggers"].values():
+                if handler_name == "ModeChange":
+                    modes.add(function_name)
+        return modes
+
+    def warm_up_events(self, model: Model, event_names: Set[str]) -> None:
+        """Starts building the modules used by the given events in the background,
+        so that switching the events into the model later on does not block.
+
+        :param model: model the events will be switched into
+        :type model: Model
+        :param event_names: names of the events
+        :type event_names: Set[str]
+        """
+        bodypart_names = set()
+        for name in event_names:
+            # also imports the event classes ahead
+            bodypart_names.update(self._get_spec(name).bodypart_names_to_type.keys())
+        self._gesture_loader.warm_up_modules(model, bodypart_names)
+
+    def close(self) -> None:
+        self._pool.clear()
+        self._gesture_loader.close()
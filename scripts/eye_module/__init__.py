@@ -2,6 +2,10 @@ from .eye_gesture import EyeGesture
 from .eye_landmark_detector import EyeLandmarkDetector
 from .eye_position import EyePosition
 from scripts.core import Module
+from scripts.eye_module.gaze_main import GazeArgs
+from scripts.eye_module.pose3d.pose3d import pose_args
+from scripts.eye_module.utils.ie_module import OpenVINORuntime
+from scripts.tools.config import Config
 
 
 class EyeModule(Module):
@@ -9,3 +13,16 @@ class EyeModule(Module):
     _gesture_class = EyeGesture
     _landmark_detector_class = EyeLandmarkDetector
     _tracker_names = {"eye"}
+
+    @classmethod
+    def _do_pre_initialization(cls) -> None:
+        # load all the OpenVINO networks in parallel, so that the landmark detector only needs to pick them up
+        args = GazeArgs()
+        models = [(args.d_fd, args.mode_face_detection),
+                  (args.d_hp, args.model_head_position),
+                  (args.d_lm, args.model_landmark_regressor),
+                  (args.d_gm, args.model_gaze)]
+        OpenVINORuntime.load_networks(models)
+        # the 3D pose network is reshaped to the frame size on first use, hence only read here
+        if Config().get_data("modules/eye/nose3d/provider") != "face_box":
+            OpenVINORuntime.read_network(pose_args().model)
@@ -2,13 +2,13 @@
 Author: Alexandros Theofanous
 """
 
+import sys
 import time
 
 import cv2 as cv
 import numpy as np
 import winsound
 
-from scripts import *
 from scripts.gesture_event_handlers.edit_config import EditConfigFile
 from scripts.gesture_events.eye_tracking_event import EyeTrackingEvent
 from scripts.tools import Config
@@ -10,7 +10,7 @@ import numpy as np
 from scripts.core import RawData
 from scripts.eye_module.core.result_objs import FaceResult, LandMarkResult
 from scripts.eye_module.gaze_main import *
-from scripts.eye_module.pose3d.pose3d import onlyNose
+from scripts.eye_module.pose3d.nose_provider import get_nose_provider
 
 
 class EyeLandmarkDetector:
@@ -18,7 +18,7 @@ class EyeLandmarkDetector:
         self.my_arg = GazeArgs()
         self.my_process = ProcessOnFrame(self.my_arg)
         self.my_mouse_controller = MouseController(self.my_arg)
-        self.my_pose3d_obj = onlyNose()
+        self.my_nose_provider = get_nose_provider()
 
     def get_raw_data(self, raw_data: RawData, image: np.ndarray) -> None:
         """Adds the xyz coordinates of all the hand landmarks detected on the image into the RawData instance.
@@ -51,11 +51,13 @@ class EyeLandmarkDetector:
             self._add_gaze_landmark(raw_data, gaze_vector)
 
             # Add nose3d
-            nose_pos = self._process_pose3d(image)
+            nose_pos = self._process_pose3d(image, detections, landmarks)
             self._add_pose3d(raw_data, nose_pos)
 
-    def _process_pose3d(self, frame: np.ndarray) -> np.ndarray:
-        coor = self.my_pose3d_obj.nose3d(frame)
+    def _process_pose3d(self, frame: np.ndarray, roi: List[FaceResult],
+                        landmarks: List[LandMarkResult]) -> np.ndarray:
+        landmark = landmarks[0] if landmarks else None
+        coor = self.my_nose_provider.nose3d(frame, roi[0], landmark)
         return coor
 
     @staticmethod
@@ -259,7 +259,6 @@ class MouseController:
     BREAK_KEYS = {ord('q'), ord('Q'), 27}
 
     def __init__(self, args):
-        self.frame_processor = ProcessOnFrame(args)
         self.display = not args.no_show
         self.print_perf_stats = args.perf_stats
 
@@ -1,16 +1,14 @@
-import os
-
 import numpy as np
-from openvino.inference_engine import IECore
+
+from scripts.eye_module.utils.ie_module import OpenVINORuntime
 
 
 class InferenceEngineOpenVINO:
     def __init__(self, net_model_xml_path, device):
         self.device = device
 
-        self.ie = IECore()
-        net_model_bin_path = os.path.splitext(net_model_xml_path)[0] + '.bin'
-        self.net = self.ie.read_network(model=net_model_xml_path, weights=net_model_bin_path)
+        self.ie = OpenVINORuntime.get_core(device)
+        self.net = OpenVINORuntime.read_network(net_model_xml_path)
         required_input_key = {'data'}
         assert required_input_key == set(self.net.inputs.keys()), \
             'Demo supports only topologies with the following input key: {}'.format(', '.join(required_input_key))
@@ -20,13 +18,21 @@ class InferenceEngineOpenVINO:
             'Demo supports only topologies with the following output keys: {}'.format(', '.join(required_output_keys))
 
         self.exec_net = self.ie.load_network(network=self.net, num_requests=1, device_name=device)
+        # executable networks for each input (h, w) the network has been reshaped to, so that
+        # a change of the frame size does not recompile the network if the size has been seen before
+        input_layer = next(iter(self.net.inputs))
+        self._exec_nets = {tuple(self.net.inputs[input_layer].shape[2:]): self.exec_net}
 
     def infer(self, img):
         input_layer = next(iter(self.net.inputs))
         n, c, h, w = self.net.inputs[input_layer].shape
         if h != img.shape[0] or w != img.shape[1]:
-            self.net.reshape({input_layer: (n, c, img.shape[0], img.shape[1])})
-            self.exec_net = self.ie.load_network(network=self.net, num_requests=1, device_name=self.device)
+            input_size = (img.shape[0], img.shape[1])
+            self.net.reshape({input_layer: (n, c, *input_size)})
+            if input_size not in self._exec_nets:
+                self._exec_nets[input_size] = self.ie.load_network(network=self.net, num_requests=1,
+                                                                   device_name=self.device)
+            self.exec_net = self._exec_nets[input_size]
         img = np.transpose(img, (2, 0, 1))[None, ]
 
         inference_result = self.exec_net.infer(inputs={'data': img})
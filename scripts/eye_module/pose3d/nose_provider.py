@@ -0,0 +1,139 @@
+"""
+Providers of the 3D nose position used by the gaze mode.
+Running the full human-pose-estimation-3d network every frame only to read the nose
+is the most expensive part of the eye module, so the providers below allow to
+trade some accuracy of the nose position for processing time.
+
+All providers return the nose in the same convention as pose3d.nose3d():
+(-z, x, -y) in cm with respect to the camera, or an empty array if no nose was found.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from scripts.eye_module.core.result_objs import FaceResult, LandMarkResult
+from scripts.eye_module.pose3d.pose3d import onlyNose
+from scripts.tools.config import Config
+
+# focal length assumed by pose3d when it is unknown (relative to the frame width)
+FOCAL_LENGTH_FACTOR = 0.8
+# average width of the face detection box in cm (used for depth from the face box)
+DEFAULT_FACE_WIDTH_CM = 16.0
+
+
+def _nose_tip_pixel(roi: FaceResult, landmark: LandMarkResult) -> np.ndarray:
+    # landmarks are normalised to the face detection box
+    return landmark.nose_tip * roi.size + roi.position
+
+
+class NoseProvider:
+    """Interface for the 3D nose position providers"""
+
+    def nose3d(self, frame: np.ndarray, roi: Optional[FaceResult] = None,
+               landmark: Optional[LandMarkResult] = None) -> np.ndarray:
+        """Returns the 3D position of the nose on the frame.
+
+        :param frame: (flipped) camera frame
+        :type frame: np.ndarray
+        :param roi: face detection of the frame
+        :type roi: Optional[FaceResult]
+        :param landmark: facial landmarks (relative to the roi) of the frame
+        :type landmark: Optional[LandMarkResult]
+        :return: nose coordinates (-z, x, -y) or empty array if not found
+        :rtype: np.ndarray
+        """
+        raise NotImplementedError()
+
+
+class Pose3dNoseProvider(NoseProvider):
+    """Runs the 3D pose network on every frame (original behaviour)"""
+
+    def __init__(self) -> None:
+        self._pose3d = onlyNose()
+
+    def nose3d(self, frame: np.ndarray, roi: Optional[FaceResult] = None,
+               landmark: Optional[LandMarkResult] = None) -> np.ndarray:
+        return self._pose3d.nose3d(frame)
+
+
+class FaceBoxNoseProvider(NoseProvider):
+    """Estimates the nose depth from the size of the face detection box with a pinhole camera model.
+    The 2D nose tip from the facial landmarks is then back-projected to that depth.
+    Does not run any additional network."""
+
+    def __init__(self, face_width_cm: float = DEFAULT_FACE_WIDTH_CM) -> None:
+        self._face_width_cm = face_width_cm
+
+    def nose3d(self, frame: np.ndarray, roi: Optional[FaceResult] = None,
+               landmark: Optional[LandMarkResult] = None) -> np.ndarray:
+        if roi is None or landmark is None or roi.size[0] <= 0:
+            return np.array([])
+        fx = FOCAL_LENGTH_FACTOR * frame.shape[1]
+        depth = fx * self._face_width_cm / roi.size[0]
+        return _back_project(frame, _nose_tip_pixel(roi, landmark), depth, fx)
+
+
+class IntervalNoseProvider(NoseProvider):
+    """Runs the 3D pose network only every n-th frame. In between, the last network result is moved
+    along with the 2D nose tip from the facial landmarks and its depth is scaled by the change of
+    the face detection box width."""
+
+    def __init__(self, interval: int) -> None:
+        self._pose3d = onlyNose()
+        self._interval = max(1, interval)
+        self._frames_since_inference = 0
+
+        self._anchor_nose = None  # last nose from the network
+        self._anchor_offset = None  # difference of the network result and the back-projected 2D nose
+        self._anchor_face_width = None
+
+    def nose3d(self, frame: np.ndarray, roi: Optional[FaceResult] = None,
+               landmark: Optional[LandMarkResult] = None) -> np.ndarray:
+        if roi is None or landmark is None:
+            self._anchor_nose = None
+            return self._pose3d.nose3d(frame)
+
+        fx = FOCAL_LENGTH_FACTOR * frame.shape[1]
+        nose_pixel = _nose_tip_pixel(roi, landmark)
+
+        if self._anchor_nose is None or self._frames_since_inference >= self._interval:
+            self._frames_since_inference = 1
+            nose = self._pose3d.nose3d(frame)
+            if len(nose) == 0:
+                self._anchor_nose = None
+                return nose
+            self._anchor_nose = nose
+            self._anchor_face_width = roi.size[0]
+            self._anchor_offset = nose - _back_project(frame, nose_pixel, -nose[0], fx)
+            return nose
+
+        self._frames_since_inference += 1
+        depth = -self._anchor_nose[0]
+        if roi.size[0] > 0:
+            depth *= self._anchor_face_width / roi.size[0]
+        return _back_project(frame, nose_pixel, depth, fx) + self._anchor_offset
+
+
+def _back_project(frame: np.ndarray, pixel: np.ndarray, depth: float, fx: float) -> np.ndarray:
+    # camera centre is assumed to be in the middle of the frame (as in pose3d)
+    x = (pixel[0] - frame.shape[1] / 2) * depth / fx
+    y = (pixel[1] - frame.shape[0] / 2) * depth / fx
+    return np.array([-depth, x, -y], dtype=np.float32)
+
+
+def get_nose_provider() -> NoseProvider:
+    """Creates the nose provider selected in the config (modules/eye/nose3d).
+
+    :return: nose provider
+    :rtype: NoseProvider
+    """
+    settings = Config().get_data("modules/eye/nose3d")
+    provider = settings.get("provider", "pose3d")
+    if provider == "face_box":
+        return FaceBoxNoseProvider(settings.get("face_width_cm", DEFAULT_FACE_WIDTH_CM))
+    if provider == "interval":
+        return IntervalNoseProvider(settings.get("pose3d_interval", 1))
+    if provider == "pose3d":
+        return Pose3dNoseProvider()
+    raise RuntimeError("Unknown nose3d provider: " + provider)
@@ -1,18 +1,158 @@
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
 
 # from openvino.inference_engine import IEPlugin
-from openvino.inference_engine import IECore
+from openvino.inference_engine import IECore, IENetwork, ExecutableNetwork
+
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# compiled networks are stored here by OpenVINO (if the device plugin supports model caching)
+CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "..",
+                                          "data", "cache"))
+
+
+class OpenVINORuntime:
+    """Process-wide holder of the single IECore shared by all the OpenVINO networks.
+    Networks loaded through it are kept, so that the eye module can be re-created without
+    reading and compiling the IR files again.
+    """
+    _lock = Lock()
+    _core = None
+    _cache_enabled_devices = set()
+    _exec_nets = {}  # dict: (device, xml path) -> ExecutableNetwork
+    _networks = {}  # dict: xml path -> IENetwork
+    _loading = {}  # dict: key of _exec_nets or _networks -> Future of the load in progress
+    load_times = {}  # dict: xml file name -> load time in seconds
+
+    @classmethod
+    def get_core(cls, device: str = None) -> IECore:
+        """Returns the shared IECore. If a device is given the compiled-model cache is enabled for it.
+
+        :param device: device the core will be used for (e.g. "CPU")
+        :type device: str
+        :return: shared IECore
+        :rtype: IECore
+        """
+        with cls._lock:
+            if cls._core is None:
+                cls._core = IECore()
+            if device is not None and device not in cls._cache_enabled_devices:
+                os.makedirs(CACHE_PATH, exist_ok=True)
+                cls._core.set_config({"CACHE_DIR": CACHE_PATH}, device)
+                cls._cache_enabled_devices.add(device)
+            return cls._core
+
+    @classmethod
+    def read_network(cls, net_model_xml_path: str) -> IENetwork:
+        """Reads the IR of the network once and returns the same IENetwork on later calls.
+
+        :param net_model_xml_path: path to the .xml file of the network (.bin is expected next to it)
+        :type net_model_xml_path: str
+        :return: network
+        :rtype: IENetwork
+        """
+        path = os.path.abspath(net_model_xml_path)
+
+        def read() -> IENetwork:
+            start_time = time.perf_counter()
+            net_model_bin_path = os.path.splitext(path)[0] + '.bin'
+            network = cls.get_core().read_network(model=path, weights=net_model_bin_path)
+            cls._log_load_time(path, start_time)
+            return network
+
+        return cls._load_once(cls._networks, path, read)
+
+    @classmethod
+    def load_network(cls, device: str, net_model_xml_path: str) -> ExecutableNetwork:
+        """Loads (reads and compiles) the network onto the device once and returns the same
+        ExecutableNetwork on later calls.
+
+        :param device: device name (e.g. "CPU")
+        :type device: str
+        :param net_model_xml_path: path to the .xml file of the network (.bin is expected next to it)
+        :type net_model_xml_path: str
+        :return: executable network
+        :rtype: ExecutableNetwork
+        """
+        key = (device, os.path.abspath(net_model_xml_path))
+
+        def load() -> ExecutableNetwork:
+            start_time = time.perf_counter()
+            core = cls.get_core(device)
+            # loading straight from the file lets OpenVINO skip reading the IR when the compiled network is cached
+            exec_net = core.load_network(network=key[1], device_name=device)
+            cls._log_load_time(key[1], start_time)
+            return exec_net
+
+        return cls._load_once(cls._exec_nets, key, load)
+
+    @classmethod
+    def load_networks(cls, models: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], ExecutableNetwork]:
+        """Loads all the given networks in parallel.
+
+        :param models: (device, xml path) of each network to load
+        :type models: Iterable[Tuple[str, str]]
+        :return: (device, xml path) mapped to the loaded networks
+        :rtype: Dict[Tuple[str, str], ExecutableNetwork]
+        """
+        models = list(models)
+        if len(models) == 0:
+            return {}
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="OpenVINO load") as executor:
+            exec_nets = list(executor.map(lambda model: cls.load_network(*model), models))
+        log.info(f"Loaded {len(models)} OpenVINO networks in {time.perf_counter() - start_time:.2f}s")
+        return dict(zip(models, exec_nets))
+
+    @classmethod
+    def _load_once(cls, cache: Dict[Hashable, Any], key: Hashable, load: Callable[[], Any]) -> Any:
+        """Returns cache[key], calling load to fill it only once. Other threads asking for the same key meanwhile
+        wait for that load, while loads of different keys run in parallel (so the lock is not held during them).
+
+        :param cache: _exec_nets or _networks
+        :type cache: Dict[Hashable, Any]
+        :param key: key of the network in the cache
+        :type key: Hashable
+        :param load: loads the network
+        :type load: Callable[[], Any]
+        :return: the network
+        :rtype: Any
+        """
+        with cls._lock:
+            if key in cache:
+                return cache[key]
+            future = cls._loading.get(key)
+            loading_here = future is None
+            if loading_here:
+                future = cls._loading[key] = Future()
+        if not loading_here:
+            return future.result()
+        try:
+            value = load()
+        except BaseException as exc:
+            with cls._lock:
+                del cls._loading[key]
+            future.set_exception(exc)
+            raise
+        with cls._lock:
+            cache[key] = value
+            del cls._loading[key]
+        future.set_result(value)
+        return value
+
+    @classmethod
+    def _log_load_time(cls, path: str, start_time: float) -> None:
+        load_time = time.perf_counter() - start_time
+        cls.load_times[os.path.basename(path)] = load_time
+        log.info(f"{os.path.basename(path)} loaded in {load_time:.2f}s")
 
 
 def load_iecore(device, net_model_xml_path):
-    ie = IECore()
-
-    net_model_bin_path = os.path.splitext(net_model_xml_path)[0] + '.bin'
-    net = ie.read_network(model=net_model_xml_path, weights=net_model_bin_path)
-    ie = IECore()
-    exec_net = ie.load_network(network=net, device_name=device)
-
-    return exec_net
+    return OpenVINORuntime.load_network(device, net_model_xml_path)
 
 
 class Module(object):
@@ -5,36 +5,9 @@ Contributors: Andrzej Szablewski, Alexandros Theofanous, Anelia Gaydardzhieva
 
 from typing import Callable
 
-from scripts.gesture_event_handlers.exercise_display import ExerciseDisplay
-from scripts.gesture_event_handlers.extremity_circles import ExtremityCircles
-from scripts.gesture_event_handlers.extremity_walking import ExtremityWalkingActions
-from scripts.gesture_event_handlers.pseudovr_actions import PseudoVRActions
-from scripts.gesture_event_handlers.gamepad_actions import GamepadActions
-from scripts.gesture_event_handlers.monitor_tracker import MonitorTracker
-from .area_of_interest import AreaOfInterest
-from .correction_mode import CorrectionMode
-from .desktop_mouse import AOIMouse, DesktopMouse
-from .desktop_pen import DesktopPenInput
-from .desktop_touch import DesktopTouch
-from .edit_config import EditConfigFile
-from .exercise_actions import ExerciseActions
-from .extremity_actions import ExtremityActions
-from .in_air_keyboard import InAirKeyboard
-from .keyboard import Keyboard
-from .nose_box import NoseBox
-from .speaker_identification import SpeakerIdentification
-from .transcription import Transcriber
-
-try:
-    from .gaming_joystick import GamingJoystick
-except:
-    print("ViGEmBus is not installed on machine") # required only if joypad mode is enabled
-
-
-# this should store every available handler
-from scripts.gesture_events.customized_gesture_event import CustomizedGestureEvent
-
 
+# the handler classes are imported in the _check_..._initialized methods, so that only the handlers
+# (and their dependencies, e.g. vgamepad or vosk) used by the current mode get imported
 class GestureEventHandlers:
     def __init__(self, mode_change_method: Callable, view):
         self._view = view
@@ -96,6 +69,12 @@ class GestureEventHandlers:
 
         return self._handlers[handler_name](function_name)
 
+    def end_frame(self) -> None:
+        """Called after all the events of a frame have been triggered.
+        Sends the input that is batched per frame (the gamepad report)."""
+        if self._gaming_joystick is not None:
+            self._gaming_joystick.flush()
+
     def _get_mode_change_func(self, mode: str):
         return lambda: self._mode_change_method(mode)
 
@@ -105,6 +84,7 @@ class GestureEventHandlers:
 # -------------------------------------------------------------------------------------------
 # CustomizedGestureEvent
     def _get_customize_gesture_notification_func(self, name):
+        from scripts.gesture_events.customized_gesture_event import CustomizedGestureEvent
         funcs = {
             "notify_audio_flag": CustomizedGestureEvent.notify_audio_flag
         }
@@ -135,6 +115,7 @@ class GestureEventHandlers:
     def _check_mouse_initialized(self):
         if self._mouse is None:
             self._check_monitor_tracker_initialized()
+            from .desktop_mouse import DesktopMouse
             self._mouse = DesktopMouse(self._monitor_tracker)
 # -------------------------------------------------------------------------------------------
 # AOI Mouse
@@ -159,6 +140,7 @@ class GestureEventHandlers:
     def _check_aoi_mouse_initialized(self):
         if self._aoi_mouse is None:
             self._check_aoi_initialized()
+            from .desktop_mouse import AOIMouse
             self._aoi_mouse = AOIMouse(self._aoi)
 
 # -------------------------------------------------------------------------------------------
@@ -174,6 +156,7 @@ class GestureEventHandlers:
 
     def _check_monitor_tracker_initialized(self):
         if self._monitor_tracker is None:
+            from .monitor_tracker import MonitorTracker
             self._monitor_tracker = MonitorTracker()
 
 # -------------------------------------------------------------------------------------------
@@ -197,6 +180,7 @@ class GestureEventHandlers:
     def _check_touch_initialized(self):
         if self._touch is None:
             self._check_aoi_initialized()
+            from .desktop_touch import DesktopTouch
             self._touch = DesktopTouch(self._aoi)
 
 # -------------------------------------------------------------------------------------------
@@ -219,6 +203,7 @@ class GestureEventHandlers:
     def _check_pen_initalized(self):
         if self._pen is None:
             self._check_aoi_initialized()
+            from .desktop_pen import DesktopPenInput
             self._pen = DesktopPenInput(self._aoi)
 # -------------------------------------------------------------------------------------------
 # Keyboard
@@ -285,6 +270,7 @@ class GestureEventHandlers:
 
     def _check_keyboard_initialized(self):
         if self._keyboard is None:
+            from .keyboard import Keyboard
             self._keyboard = Keyboard()
 
 
@@ -306,6 +292,7 @@ class GestureEventHandlers:
         if self._in_air_keyboard is None:
             self._check_keyboard_initialized()
             self._check_transcription_initialized()
+            from .in_air_keyboard import InAirKeyboard
             self._in_air_keyboard = InAirKeyboard(self._view, self._keyboard, self._transcriber)
 
 
@@ -328,6 +315,7 @@ class GestureEventHandlers:
     def _check_extremity_actions_initialized(self):
         self._check_extremity_circles_initialized()
         if self._extremity_actions is None:
+            from .extremity_actions import ExtremityActions
             self._extremity_actions = ExtremityActions(self._extremity_circles)
 # -------------------------------------------------------------------------------------------
 # Exercise Actions
@@ -346,6 +334,7 @@ class GestureEventHandlers:
     def _check_exercise_actions_initialized(self):
         self._check_exercise_display_initialized()
         if self._exercise_actions is None:
+            from .exercise_actions import ExerciseActions
             self._exercise_actions = ExerciseActions(self._exercise_display)
 # -------------------------------------------------------------------------------------------
 # Extremity Walking Actions
@@ -367,6 +356,7 @@ class GestureEventHandlers:
         self._check_exercise_display_initialized()
         self._check_extremity_circles_initialized()
         if self._extremity_walking_actions is None:
+            from .extremity_walking import ExtremityWalkingActions
             self._extremity_walking_actions = ExtremityWalkingActions(self._exercise_display, self._extremity_circles)
 # -------------------------------------------------------------------------------------------
 # Gamepad Actions
@@ -388,6 +378,7 @@ class GestureEventHandlers:
         self._check_exercise_display_initialized()
         self._check_extremity_circles_initialized()
         if self._gamepad_actions is None:
+            from .gamepad_actions import GamepadActions
             self._gamepad_actions = GamepadActions(self._exercise_display, self._extremity_circles)
 # -------------------------------------------------------------------------------------------
 # PseudoVR Actions
@@ -409,14 +400,17 @@ class GestureEventHandlers:
         self._check_exercise_display_initialized()
         self._check_extremity_circles_initialized()
         if self._pseudovr_actions is None:
+            from .pseudovr_actions import PseudoVRActions
             self._pseudovr_actions = PseudoVRActions(self._exercise_display, self._extremity_circles)
 
     def _check_exercise_display_initialized(self):
         if self._exercise_display is None:
+            from .exercise_display import ExerciseDisplay
             self._exercise_display = ExerciseDisplay(self._view)
 
     def _check_extremity_circles_initialized(self):
         if self._extremity_circles is None:
+            from .extremity_circles import ExtremityCircles
             self._extremity_circles = ExtremityCircles(self._view)
 
 # -------------------------------------------------------------------------------------------
@@ -436,7 +430,12 @@ class GestureEventHandlers:
 
     def _check_gaming_joystick_initialised(self):
         if self._gaming_joystick is None:
-            self._gaming_joystick = GamingJoystick()
+            from .gaming_joystick import GamingJoystick
+            try:
+                self._gaming_joystick = GamingJoystick()
+            except Exception:
+                print("ViGEmBus is not installed on machine")  # required only if joypad mode is enabled
+                raise
 
 
 # ######################################## FACE MODULE ######################################
@@ -466,6 +465,7 @@ class GestureEventHandlers:
 
     def _check_change_config_initialized(self):
         if self._edit_config is None:
+            from .edit_config import EditConfigFile
             self._edit_config = EditConfigFile()
 # -------------------------------------------------------------------------------------------
 # NoseBox
@@ -484,6 +484,7 @@ class GestureEventHandlers:
     def _check_nose_box_initialized(self):
         if self._nose_box is None:
             self._check_monitor_tracker_initialized()
+            from .nose_box import NoseBox
             self._nose_box = NoseBox(self._view, self._monitor_tracker)
 
 
@@ -501,6 +502,7 @@ class GestureEventHandlers:
     def _check_aoi_initialized(self):
         if self._aoi is None:
             self._check_monitor_tracker_initialized()
+            from .area_of_interest import AreaOfInterest
             self._aoi = AreaOfInterest(self._view, self._monitor_tracker)
 
 
@@ -524,6 +526,7 @@ class GestureEventHandlers:
     def _check_transcription_initialized(self):
         """ Check Transcription """
         if self._transcriber is None:
+            from .transcription import Transcriber
             self._transcriber = Transcriber(self._view)    
 # -------------------------------------------------------------------------------------------
 # Correction mode           
@@ -542,6 +545,7 @@ class GestureEventHandlers:
     def _check_correction_mode_initialized(self):
         """ Check Correction mode """
         if self._correction_mode is None:
+            from .correction_mode import CorrectionMode
             self._correction_mode = CorrectionMode(self._view)
 
 # -------------------------------------------------------------------------------------------
@@ -564,4 +568,5 @@ class GestureEventHandlers:
     def _check_speaker_identification_initialized(self):
         """ Check Speaker Identification """
         if self._speaker_identification is None:
+            from .speaker_identification import SpeakerIdentification
             self._speaker_identification = SpeakerIdentification(self._view)
@@ -6,7 +6,7 @@ from pynput.mouse import Controller
 
 from scripts.tools import Config
 from .area_of_interest import AreaOfInterest
-from .desktop_mouse import Smoother
+from .filters import create_filter
 from .pen_input import Pen
 
 
@@ -20,19 +20,18 @@ class DesktopPenInput:
 
         self._erase = Erase
 
-        self._x_smoother = Smoother(config.get_data("handlers/mouse/smoothing"))
-        self._y_smoother = Smoother(config.get_data("handlers/mouse/smoothing"))
+        self._filter = create_filter(config.get_data("handlers/mouse"))
         
         self._aoi = aoi
 
         pyautogui.FAILSAFE = False
 
     def move_cursor(self, cam_x:float, cam_y:float):
-        """Translate the camera coordinates into the AOI coordinates. Smooth the movement of the mouse by averaging out the coordinates of the last few frames (as configured). Move the mouse accordingly."""
+        """Translate the camera coordinates into the AOI coordinates. Smooth the movement of the mouse with the configured filter. Move the mouse accordingly."""
         # translate palm center coords to screen coordinates
         x, y = self._aoi.convert_xy(cam_x, cam_y)
         # update cursor
-        self._cursor.position = (self._x_smoother.smooth(x), self._y_smoother.smooth(y))
+        self._cursor.position = self._filter.filter((x, y))
 
 
     #NOTE: tap function not currently used for inking
@@ -14,7 +14,7 @@ import pydirectinput
 from pynput.mouse import Controller
 
 from scripts.gesture_event_handlers.area_of_interest import AreaOfInterest
-from scripts.gesture_event_handlers.desktop_mouse import Smoother
+from scripts.gesture_event_handlers.filters import create_filter
 from scripts.tools import Config
 
 
@@ -29,15 +29,12 @@ class DesktopTouch:
 
         self._mouse = Controller()
         self._coords = None
-        smoothing_frames = config.get_data("handlers/touch/smoothing")
-        self._mouse_x_smoother = Smoother(smoothing_frames)
-        self._mouse_y_smoother = Smoother(smoothing_frames)
-        self._off_hand_x_smoother = Smoother(smoothing_frames)
-        self._off_hand_y_smoother = Smoother(smoothing_frames)
+        self._mouse_filter = create_filter(config.get_data("handlers/touch"))
+        self._off_hand_filter = create_filter(config.get_data("handlers/touch"))
         pyautogui.FAILSAFE = False
 
     def move_cursor(self, cam_x:float, cam_y:float):
-        """Translate the camera coordinates into the AOI coordinates. Smooth the movement of the mouse by averaging out the coordinates of the last few frames (as configured). Move the mouse accordingly."""
+        """Translate the camera coordinates into the AOI coordinates. Smooth the movement of the mouse with the configured filter. Move the mouse accordingly."""
         # translate palm center coords to screen coordinates
         x, y = self._aoi.convert_xy(cam_x, cam_y)
         # update cursor
@@ -48,10 +45,10 @@ class DesktopTouch:
 
 
     def _smooth_mouse(self, x: float, y: float) -> Tuple[float, float]:
-        return self._mouse_x_smoother.smooth(x), self._mouse_y_smoother.smooth(y)
+        return self._mouse_filter.filter((x, y))
 
     def _smooth_off_hand(self, x: float, y: float) -> Tuple[float, float]:
-        return self._off_hand_x_smoother.smooth(x), self._off_hand_y_smoother.smooth(y)
+        return self._off_hand_filter.filter((x, y))
     
     def singletap(self):
         '''Single tap at specified coordinates and immediately release. Currently not being used.'''
@@ -0,0 +1,208 @@
+'''
+Filters used to smooth the cursor (and other) coordinates of the event handlers.
+All filters work on n-dimensional points (e.g. x, y of the cursor) at once and keep their state in fixed numpy arrays.
+The filter of each handler is selected in the config, e.g. handlers/mouse/filter.
+'''
+import math
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class PointFilter:
+    """Interface for the filters"""
+
+    def __init__(self, dims: int) -> None:
+        self._dims = dims
+
+    def filter(self, point: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        """Adds a new measurement and returns the filtered point.
+
+        :param point: coordinates of the new point
+        :type point: Sequence[float]
+        :param timestamp: time of the measurement in seconds, defaults to now
+        :type timestamp: Optional[float]
+        :return: filtered coordinates
+        :rtype: Tuple[float, ...]
+        """
+        raise NotImplementedError()
+
+    def reset(self) -> None:
+        """Forgets all the previous points"""
+        raise NotImplementedError()
+
+
+class MovingAverageFilter(PointFilter):
+    """Average of the last n points, kept as a running sum over a ring buffer"""
+
+    def __init__(self, dims: int, frames: int = 3) -> None:
+        super().__init__(dims)
+        self._buffer = np.zeros((max(1, frames), dims))
+        self._sum = np.zeros(dims)
+        self._out = np.zeros(dims)
+        self.reset()
+
+    def filter(self, point: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        oldest = self._buffer[self._index]
+        self._sum -= oldest
+        oldest[:] = point
+        self._sum += oldest
+        self._index = (self._index + 1) % len(self._buffer)
+        self._count = min(self._count + 1, len(self._buffer))
+        np.divide(self._sum, self._count, out=self._out)
+        return tuple(self._out)
+
+    def reset(self) -> None:
+        self._buffer[:] = 0
+        self._sum[:] = 0
+        self._index = 0
+        self._count = 0
+
+
+class ExponentialFilter(PointFilter):
+    """Exponential moving average, alpha is the weight of the new point"""
+
+    def __init__(self, dims: int, alpha: float = 0.5) -> None:
+        super().__init__(dims)
+        self._alpha = alpha
+        self._value = np.zeros(dims)
+        self._initialised = False
+
+    def filter(self, point: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        if not self._initialised:
+            self._value[:] = point
+            self._initialised = True
+        else:
+            self._value *= 1 - self._alpha
+            self._value += self._alpha * np.asarray(point, dtype=float)
+        return tuple(self._value)
+
+    def reset(self) -> None:
+        self._initialised = False
+
+
+def _smoothing_factor(dt: float, cutoff: np.ndarray) -> np.ndarray:
+    tau = 1 / (2 * math.pi * cutoff)
+    return 1 / (1 + tau / dt)
+
+
+class OneEuroFilter(PointFilter):
+    """One euro filter (Casiez et al. 2012), the same as eye_module/pose3d/modules/one_euro_filter.py but for all the
+    coordinates at once and with the real time between the points. Smooths a lot when the point moves slowly (jitter)
+    and little when it moves fast (lag)."""
+
+    def __init__(self, dims: int, min_cutoff: float = 1.0, beta: float = 0.007, d_cutoff: float = 1.0,
+                 freq: float = 30) -> None:
+        super().__init__(dims)
+        self._min_cutoff = min_cutoff
+        self._beta = beta
+        self._d_cutoff = np.full(dims, d_cutoff)
+        self._default_dt = 1 / freq  # used for the first point and if the timestamps are equal
+        self._x = np.zeros(dims)
+        self._dx = np.zeros(dims)
+        self._last_time = None
+
+    def filter(self, point: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        point = np.asarray(point, dtype=float)
+        if self._last_time is None:
+            self._x[:] = point
+            self._dx[:] = 0
+            self._last_time = timestamp
+            return tuple(self._x)
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            dt = self._default_dt
+        self._last_time = timestamp
+
+        dx = (point - self._x) / dt
+        self._dx += _smoothing_factor(dt, self._d_cutoff) * (dx - self._dx)
+        cutoff = self._min_cutoff + self._beta * np.abs(self._dx)
+        self._x += _smoothing_factor(dt, cutoff) * (point - self._x)
+        return tuple(self._x)
+
+    def reset(self) -> None:
+        self._last_time = None
+
+
+class KalmanFilter(PointFilter):
+    """Constant velocity Kalman filter, each coordinate filtered independently (vectorised over the coordinates).
+    process_noise is the variance of the acceleration and measurement_noise the variance of the measured point."""
+
+    def __init__(self, dims: int, process_noise: float = 5000.0, measurement_noise: float = 50.0,
+                 freq: float = 30) -> None:
+        super().__init__(dims)
+        self._q = process_noise
+        self._r = measurement_noise
+        self._default_dt = 1 / freq
+        self._x = np.zeros(dims)  # position
+        self._v = np.zeros(dims)  # velocity
+        # covariance matrix [[p_xx, p_xv], [p_xv, p_vv]] of each coordinate
+        self._p_xx = np.zeros(dims)
+        self._p_xv = np.zeros(dims)
+        self._p_vv = np.zeros(dims)
+        self._last_time = None
+
+    def filter(self, point: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        point = np.asarray(point, dtype=float)
+        if self._last_time is None:
+            self._x[:] = point
+            self._v[:] = 0
+            self._p_xx[:] = self._r
+            self._p_xv[:] = 0
+            self._p_vv[:] = self._r / self._default_dt ** 2
+            self._last_time = timestamp
+            return tuple(self._x)
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            dt = self._default_dt
+        self._last_time = timestamp
+
+        # predict
+        self._x += self._v * dt
+        p_xx = self._p_xx + 2 * dt * self._p_xv + dt ** 2 * self._p_vv + self._q * dt ** 4 / 4
+        p_xv = self._p_xv + dt * self._p_vv + self._q * dt ** 3 / 2
+        p_vv = self._p_vv + self._q * dt ** 2
+        # update
+        k_x = p_xx / (p_xx + self._r)
+        k_v = p_xv / (p_xx + self._r)
+        residual = point - self._x
+        self._x += k_x * residual
+        self._v += k_v * residual
+        self._p_xx[:] = (1 - k_x) * p_xx
+        self._p_xv[:] = (1 - k_x) * p_xv
+        self._p_vv[:] = p_vv - k_v * p_xv
+        return tuple(self._x)
+
+    def reset(self) -> None:
+        self._last_time = None
+
+
+FILTERS = {
+    "moving_average": MovingAverageFilter,
+    "exponential": ExponentialFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanFilter
+}
+
+
+def create_filter(handler_settings: Dict[str, Any], dims: int = 2) -> PointFilter:
+    """Creates the filter set in the config of the handler (e.g. handlers/mouse).
+    If the handler has no "filter" set, a moving average over the handler "smoothing" frames is used.
+
+    :param handler_settings: config of the handler
+    :type handler_settings: Dict[str, Any]
+    :param dims: number of coordinates of the filtered points
+    :type dims: int
+    :return: filter
+    :rtype: PointFilter
+    """
+    settings = dict(handler_settings.get("filter", {"type": "moving_average"}))
+    filter_type = settings.pop("type")
+    if filter_type not in FILTERS:
+        raise RuntimeError("Unknown filter type: " + filter_type)
+    if filter_type == "moving_average" and "frames" not in settings:
+        settings["frames"] = handler_settings.get("smoothing", 1)
+    return FILTERS[filter_type](dims, **settings)
@@ -1,80 +1,129 @@
 '''
 Author: Yan Lai
 '''
+from typing import Optional, Tuple
 
-import vgamepad as vg
+# names used in events.json mapped to the names of the vgamepad XUSB_BUTTON values
+BUTTONS = {
+    "up": "XUSB_GAMEPAD_DPAD_UP",
+    "down": "XUSB_GAMEPAD_DPAD_DOWN",
+    "left": "XUSB_GAMEPAD_DPAD_LEFT",
+    "right": "XUSB_GAMEPAD_DPAD_RIGHT",
+    "s_left": "XUSB_GAMEPAD_LEFT_SHOULDER",
+    "s_right": "XUSB_GAMEPAD_RIGHT_SHOULDER",
+    "a": "XUSB_GAMEPAD_A",
+    "b": "XUSB_GAMEPAD_B",
+    "x": "XUSB_GAMEPAD_X",
+    "y": "XUSB_GAMEPAD_Y",
+    "start": "XUSB_GAMEPAD_START",
+    "back": "XUSB_GAMEPAD_BACK"
+}
+
+
+class GamepadState:
+    """State of all the buttons, sticks and triggers of the gamepad.
+    Tracks if it has changed since the last report was sent."""
 
-class GamingJoystick:
-    """trigger the function call with the Vgamepad function"""
     def __init__(self) -> None:
+        self.buttons = set()  # names of the pressed buttons
+        self.left_joystick = (0, 0)  # int values between -32768 and 32767
+        self.right_joystick = (0, 0)
+        self.left_trigger = 0  # int values between 0 and 255
+        self.right_trigger = 0
+        self.dirty = False
+
+    def set_button(self, button_name: str, pressed: bool) -> None:
+        if (button_name in self.buttons) == pressed:
+            return
+        if pressed:
+            self.buttons.add(button_name)
+        else:
+            self.buttons.discard(button_name)
+        self.dirty = True
+
+    def set(self, name: str, value) -> None:
+        """Sets the value of a stick or trigger e.g. set("left_joystick", (0, 32767))"""
+        if getattr(self, name) != value:
+            setattr(self, name, value)
+            self.dirty = True
+
+    def snapshot(self) -> Tuple[frozenset, Tuple[int, int], Tuple[int, int], int, int]:
+        return (frozenset(self.buttons), self.left_joystick, self.right_joystick,
+                self.left_trigger, self.right_trigger)
+
+
+class VX360Backend:
+    """Sends the state as a virtual Xbox 360 gamepad report (requires ViGEmBus)"""
+
+    def __init__(self) -> None:
+        import vgamepad as vg
+        self._vg = vg
         self.gamepad = vg.VX360Gamepad()
+        self._pressed = set()  # buttons pressed in the last report
 
-    def press_action(self, button_name: str):
-        if button_name == "up":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-        elif button_name == "down":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-        elif button_name == "left":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-        elif button_name == "right":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-        elif button_name == "s_left":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER)
-        elif button_name == "s_right":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER)
-        elif button_name == "a":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-        elif button_name == "b":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-        elif button_name == "x":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-        elif button_name == "y":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-        elif button_name == "start":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-        elif button_name == "back":
-            self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-        
+    def send(self, state: GamepadState) -> None:
+        for button_name in self._pressed - state.buttons:
+            self.gamepad.release_button(button=getattr(self._vg.XUSB_BUTTON, BUTTONS[button_name]))
+        for button_name in state.buttons - self._pressed:
+            self.gamepad.press_button(button=getattr(self._vg.XUSB_BUTTON, BUTTONS[button_name]))
+        self._pressed = set(state.buttons)
+        self.gamepad.left_joystick(*state.left_joystick)
+        self.gamepad.right_joystick(*state.right_joystick)
+        self.gamepad.left_trigger(state.left_trigger)
+        self.gamepad.right_trigger(state.right_trigger)
         self.gamepad.update()
 
+
+class RecordingBackend:
+    """Only records the reports, e.g. to count the reports sent in tests and benchmarks"""
+
+    def __init__(self) -> None:
+        self.reports = []  # list of GamepadState snapshots
+
+    def send(self, state: GamepadState) -> None:
+        self.reports.append(state.snapshot())
+
+
+class GamingJoystick:
+    """trigger the function call with the Vgamepad function.
+    The events only change the gamepad state, which is sent as a single report at the end of the frame (flush)."""
+    def __init__(self, backend: Optional[object] = None) -> None:
+        self._backend = backend if backend is not None else VX360Backend()
+        self._state = GamepadState()
+        self._pressed_since_flush = set()
+
+    def press_action(self, button_name: str):
+        if button_name in BUTTONS and button_name not in self._state.buttons:
+            self._state.set_button(button_name, True)
+            self._pressed_since_flush.add(button_name)
+
     def release_action(self, button_name: str):
-        if button_name == "up":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-        elif button_name == "down":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-        elif button_name == "left":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-        elif button_name == "right":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-        elif button_name == "s_left":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER)
-        elif button_name == "s_right":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER)
-        elif button_name == "a":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-        elif button_name == "b":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-        elif button_name == "x":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-        elif button_name == "y":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-        elif button_name == "start":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-        elif button_name == "back":
-            self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-        
-        self.gamepad.update()
+        if button_name in BUTTONS:
+            if button_name in self._pressed_since_flush:
+                self.flush()  # a press and release within one frame still needs to reach the game
+            self._state.set_button(button_name, False)
 
     def joystick_left_move(self, x_value: int, y_value: int):  # int values between -32768 and 32767
-        self.gamepad.left_joystick(x_value, y_value)
-        self.gamepad.update()
+        self._state.set("left_joystick", (x_value, y_value))
 
     def joystick_right_move(self, x_value :int, y_value: int):  # int values between -32768 and 32767
-        self.gamepad.right_joystick(x_value, y_value)
-        self.gamepad.update()
+        self._state.set("right_joystick", (x_value, y_value))
 
     def joystick_left_trigger(self, value: int): # int values between 0 and 255
-        self.gamepad.left_trigger(value)
+        self._state.set("left_trigger", value)
 
     def joystick_right_trigger(self, value: int): # int values between 0 and 255
-        self.gamepad.right_trigger(value)
+        self._state.set("right_trigger", value)
+
+    def flush(self) -> bool:
+        """Sends the gamepad report if the state has changed since the last one. Called once per frame.
+
+        :return: if a report was sent
+        :rtype: bool
+        """
+        if not self._state.dirty:
+            return False
+        self._backend.send(self._state)
+        self._state.dirty = False
+        self._pressed_since_flush.clear()
+        return True
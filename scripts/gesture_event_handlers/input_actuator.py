@@ -0,0 +1,400 @@
+'''
+Central actuator for the OS input (key presses, clicks and cursor moves).
+All the input is executed by a single long-lived thread from a queue of timestamped commands, so that:
+- the order of the presses and releases is kept (instead of a new thread per key press)
+- cursor moves are coalesced, only the latest position is written each time the worker runs
+- macros (e.g. hold a key for 2s) are scheduled as timelines and do not block the frame thread
+'''
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# Standard
+import heapq
+import itertools
+import time
+from threading import Condition, Lock, Thread
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Local
+from scripts.tools.config import Config
+
+# priorities of the commands due at the same time (lower is executed first)
+PRIORITY_INPUT = 0
+PRIORITY_MACRO = 1
+# the action releasing what each pressing action holds down
+RELEASES = {"key_down": "key_up", "mouse_down": "mouse_up"}
+
+
+class InputBackend:
+    """Interface for the backends that perform the OS input"""
+
+    def key_down(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def key_up(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def mouse_down(self, button: str) -> None:
+        raise NotImplementedError()
+
+    def mouse_up(self, button: str) -> None:
+        raise NotImplementedError()
+
+    def move_cursor(self, x: int, y: int) -> None:
+        raise NotImplementedError()
+
+    def move_cursor_relative(self, dx: int, dy: int) -> None:
+        raise NotImplementedError()
+
+
+class DirectInputBackend(InputBackend):
+    """Keys and mouse buttons through pydirectinput (also works in DirectX games),
+    the cursor through pynput and relative moves as raw SendInput mouse events.
+    The pause pydirectinput makes after every call (PAUSE) is skipped, the actuator does its own timing."""
+
+    def __init__(self) -> None:
+        # Windows only libraries, so only imported when the backend is used
+        import ctypes
+        import pydirectinput
+        import pynput._util.win32
+        from pynput.mouse import Controller
+
+        self._ctypes = ctypes
+        self._win32 = pynput._util.win32
+        self._send_input = ctypes.windll.user32.SendInput
+        self._pydirectinput = pydirectinput
+        self._mouse = Controller()
+
+    def key_down(self, key: str) -> None:
+        self._pydirectinput.keyDown(key, _pause=False)
+
+    def key_up(self, key: str) -> None:
+        self._pydirectinput.keyUp(key, _pause=False)
+
+    def mouse_down(self, button: str) -> None:
+        self._pydirectinput.mouseDown(button=button, _pause=False)
+
+    def mouse_up(self, button: str) -> None:
+        self._pydirectinput.mouseUp(button=button, _pause=False)
+
+    def move_cursor(self, x: int, y: int) -> None:
+        self._mouse.position = (x, y)
+
+    def move_cursor_relative(self, dx: int, dy: int) -> None:
+        # raw relative mouse movement, as games ignore the absolute cursor position
+        extra = self._ctypes.c_ulong(0)
+        ii_ = self._win32.INPUT_union()
+        ii_.mi = self._win32.MOUSEINPUT(dx, dy, 0, 0x0001, 0,
+                                        self._ctypes.cast(self._ctypes.pointer(extra), self._ctypes.c_void_p))
+        event = self._win32.INPUT(self._ctypes.c_ulong(0), ii_)
+        self._send_input(1, self._ctypes.pointer(event), self._ctypes.sizeof(event))
+
+
+class NoOpBackend(InputBackend):
+    """Performs no input. Keeps the log of the actions instead, so the actuator can be tested on any OS."""
+
+    def __init__(self) -> None:
+        self.actions = []  # list of (action name, args)
+
+    def key_down(self, key: str) -> None:
+        self.actions.append(("key_down", (key,)))
+
+    def key_up(self, key: str) -> None:
+        self.actions.append(("key_up", (key,)))
+
+    def mouse_down(self, button: str) -> None:
+        self.actions.append(("mouse_down", (button,)))
+
+    def mouse_up(self, button: str) -> None:
+        self.actions.append(("mouse_up", (button,)))
+
+    def move_cursor(self, x: int, y: int) -> None:
+        self.actions.append(("move_cursor", (x, y)))
+
+    def move_cursor_relative(self, dx: int, dy: int) -> None:
+        self.actions.append(("move_cursor_relative", (dx, dy)))
+
+
+BACKENDS = {
+    "directinput": DirectInputBackend,
+    "noop": NoOpBackend
+}
+
+
+class InputActuator:
+    def __init__(self, backend: InputBackend, press_duration: float = 0.1) -> None:
+        """
+        :param backend: backend that performs the actual input
+        :type backend: InputBackend
+        :param press_duration: seconds a key or button is held down (and then left up) by a press or click,
+            as games can miss shorter presses (pydirectinput paused 0.1s after each action)
+        :type press_duration: float
+        """
+        self._backend = backend
+        self._press_duration = press_duration
+        self._held = {}  # (release action, args) -> None, the keys and buttons down, in the order pressed
+        self._condition = Condition()
+        self._queue = []  # heap of (due time, priority, sequence number, action name, args)
+        self._sequence = itertools.count()  # keeps the submission order of commands due at the same time
+        self._cursor = None  # latest absolute cursor position that has not been written yet
+        self._cursor_relative = None  # sum of the relative cursor moves that have not been written yet
+        self._cursor_time = None  # time of the oldest cursor move that has not been written yet
+        self._running = True
+        self._busy = False  # worker is executing commands outside of the lock
+
+        self._metrics_lock = Lock()
+        self._metrics = self._empty_metrics()
+
+        self._thread = Thread(target=self._run, name="Input actuator", daemon=True)
+        self._thread.start()
+
+    # ---------------------------------------------------------------------------------------
+    # Keys and buttons
+    def key_down(self, key: str, delay: float = 0) -> None:
+        self._submit([(delay, "key_down", (key,))])
+
+    def key_up(self, key: str, delay: float = 0) -> None:
+        self._submit([(delay, "key_up", (key,))])
+
+    def key_press(self, key: str, presses: int = 1, interval: float = 0, delay: float = 0) -> None:
+        """Presses and releases the key, the same as pydirectinput.press but without blocking.
+
+        :param key: name of the key
+        :type key: str
+        :param presses: number of times to press the key
+        :type presses: int
+        :param interval: seconds between the presses
+        :type interval: float
+        :param delay: seconds after which to press the key
+        :type delay: float
+        """
+        self._submit(self._press_steps("key_down", (key,), presses, interval, delay))
+
+    def mouse_down(self, button: str = "left", delay: float = 0) -> None:
+        self._submit([(delay, "mouse_down", (button,))])
+
+    def mouse_up(self, button: str = "left", delay: float = 0) -> None:
+        self._submit([(delay, "mouse_up", (button,))])
+
+    def click(self, button: str = "left", clicks: int = 1, interval: float = 0, delay: float = 0) -> None:
+        """Presses and releases the mouse button, the same as key_press.
+
+        :param button: "left", "right" or "middle"
+        :type button: str
+        :param clicks: number of clicks, 2 for a double click
+        :type clicks: int
+        :param interval: seconds between the clicks
+        :type interval: float
+        :param delay: seconds after which to click
+        :type delay: float
+        """
+        self._submit(self._press_steps("mouse_down", (button,), clicks, interval, delay))
+
+    def run_macro(self, steps: Iterable[Tuple[float, str, Tuple]]) -> None:
+        """Schedules a timeline of input actions and returns immediately.
+        e.g. [(0, "key_down", ("q",)), (0.5, "key_up", ("q",))] holds q for half a second.
+
+        :param steps: (seconds from now, action name, args), action names are the methods of the InputBackend
+        :type steps: Iterable[Tuple[float, str, Tuple]]
+        """
+        self._submit(steps, PRIORITY_MACRO)
+
+    # ---------------------------------------------------------------------------------------
+    # Cursor
+    def move_cursor(self, x: float, y: float) -> None:
+        """Moves the cursor to the screen position. If the worker has not written the previous position yet, it is replaced."""
+        with self._condition:
+            if self._cursor is not None:
+                self._count("cursor_coalesced")
+            else:
+                self._cursor_time = self._cursor_time or time.perf_counter()
+            self._cursor = (int(x), int(y))
+            self._condition.notify()
+
+    def move_cursor_relative(self, dx: float, dy: float) -> None:
+        """Moves the cursor relative to the current position. Moves not written yet are summed up."""
+        with self._condition:
+            if self._cursor_relative is not None:
+                self._count("cursor_coalesced")
+                dx += self._cursor_relative[0]
+                dy += self._cursor_relative[1]
+            else:
+                self._cursor_time = self._cursor_time or time.perf_counter()
+            self._cursor_relative = (dx, dy)
+            self._condition.notify()
+
+    # ---------------------------------------------------------------------------------------
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        :return: number of executed and coalesced commands, current and max queue depth and
+            the average and max latency (s) between the time a command was due and the time it was executed
+        :rtype: Dict[str, Any]
+        """
+        with self._condition:
+            queue_depth = len(self._queue)
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        executed = metrics.pop("latency_count")
+        metrics["queue_depth"] = queue_depth
+        metrics["avg_latency"] = metrics.pop("latency_sum") / executed if executed else 0.0
+        return metrics
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all the submitted commands (including the scheduled ones) have been executed.
+
+        :return: if the actuator is idle (False if timed out)
+        :rtype: bool
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        with self._condition:
+            while self._queue or self._cursor is not None or self._cursor_relative is not None or self._busy:
+                remaining = None if end is None else end - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Stops the worker. Commands that are not yet due are dropped, but the keys and buttons
+        still held down are released (e.g. the pending release of a press)."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        for action, args in list(self._held):
+            self._perform(action, args, time.perf_counter())
+        log.info(f"Input actuator stopped: {self.get_metrics()}")
+
+    # ---------------------------------------------------------------------------------------
+    def _press_steps(self, action: str, args: Tuple, presses: int, interval: float, delay: float):
+        # like pydirectinput.press: held down for the press duration, then up for as long before the next press
+        period = interval + 2 * self._press_duration
+        steps = []
+        for i in range(presses):
+            steps.append((delay + i * period, action, args))
+            steps.append((delay + i * period + self._press_duration, RELEASES[action], args))
+        return steps
+
+    def _submit(self, steps: Iterable[Tuple[float, str, Tuple]], priority: int = PRIORITY_INPUT) -> None:
+        now = time.perf_counter()
+        with self._condition:
+            self._queue_pending_cursor()
+            for delay, action, args in steps:
+                heapq.heappush(self._queue, (now + delay, priority, next(self._sequence), action, args))
+            depth = len(self._queue)
+            self._condition.notify()
+        with self._metrics_lock:
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], depth)
+
+    def _queue_pending_cursor(self) -> None:
+        # a command submitted after a cursor move must be executed after it (e.g. move then click),
+        # so the pending move is queued as a regular command and no longer coalesced with the later moves
+        if self._cursor is not None:
+            heapq.heappush(self._queue, (self._cursor_time, PRIORITY_INPUT, next(self._sequence), "move_cursor", self._cursor))
+        if self._cursor_relative is not None:
+            dx, dy = self._cursor_relative
+            heapq.heappush(self._queue, (self._cursor_time, PRIORITY_INPUT, next(self._sequence),
+                                         "move_cursor_relative", (int(dx), int(dy))))
+        self._cursor = self._cursor_relative = self._cursor_time = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                commands, cursor, cursor_relative, cursor_time = self._wait_for_work()
+                if commands is None:
+                    return
+                self._busy = True
+            try:
+                self._execute(commands, cursor, cursor_relative, cursor_time)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _wait_for_work(self):
+        # called with the condition held, returns the due commands and the pending cursor move (or None when stopped)
+        while self._running:
+            now = time.perf_counter()
+            commands = []
+            while self._queue and self._queue[0][0] <= now:
+                commands.append(heapq.heappop(self._queue))
+            cursor, cursor_relative, cursor_time = self._cursor, self._cursor_relative, self._cursor_time
+            if commands or cursor is not None or cursor_relative is not None:
+                self._cursor = self._cursor_relative = self._cursor_time = None
+                return commands, cursor, cursor_relative, cursor_time
+            self._condition.notify_all()  # wake up wait_until_idle
+            timeout = self._queue[0][0] - now if self._queue else None
+            self._condition.wait(timeout)
+        return None, None, None, None
+
+    def _execute(self, commands, cursor, cursor_relative, cursor_time) -> None:
+        for due, _, _, action, args in commands:
+            self._perform(action, args, due)
+        if cursor is not None:
+            self._perform("move_cursor", cursor, cursor_time)
+        if cursor_relative is not None:
+            self._perform("move_cursor_relative", (int(cursor_relative[0]), int(cursor_relative[1])), cursor_time)
+
+    def _perform(self, action: str, args: Tuple, due: float) -> None:
+        try:
+            getattr(self._backend, action)(*args)
+        except Exception as e:
+            log.error(f"Input action {action}{args} failed: {e}")
+        if action in RELEASES:
+            self._held[(RELEASES[action], args)] = None
+        else:
+            self._held.pop((action, args), None)
+        latency = time.perf_counter() - due
+        with self._metrics_lock:
+            self._metrics["executed"] += 1
+            self._metrics["latency_count"] += 1
+            self._metrics["latency_sum"] += latency
+            self._metrics["max_latency"] = max(self._metrics["max_latency"], latency)
+
+    def _count(self, name: str) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += 1
+
+    @staticmethod
+    def _empty_metrics() -> Dict[str, Any]:
+        return {"executed": 0, "cursor_coalesced": 0, "max_queue_depth": 0,
+                "latency_count": 0, "latency_sum": 0.0, "max_latency": 0.0}
+
+
+_actuator = None
+_actuator_lock = Lock()
+
+
+def get_input_actuator() -> InputActuator:
+    """Returns the actuator shared by all the event handlers, with the backend set in the config (handlers/actuator/backend).
+
+    :return: input actuator
+    :rtype: InputActuator
+    """
+    global _actuator
+    with _actuator_lock:
+        if _actuator is None:
+            config = Config()
+            backend = config.get_data("handlers/actuator/backend")
+            if backend not in BACKENDS:
+                raise RuntimeError("Unknown input actuator backend: " + backend)
+            _actuator = InputActuator(BACKENDS[backend](), config.get_data("handlers/actuator/press_duration"))
+        return _actuator
+
+
+def close_input_actuator() -> None:
+    """Closes the shared actuator (if created), releasing what it still holds down. The next
+    get_input_actuator creates a new one."""
+    global _actuator
+    with _actuator_lock:
+        actuator, _actuator = _actuator, None
+    if actuator is not None:
+        actuator.close()
+
+
+def peek_input_actuator() -> Optional[InputActuator]:
+    """
+    :return: the shared actuator if an event handler already created it, without creating it
+    :rtype: Optional[InputActuator]
+    """
+    return _actuator
@@ -15,19 +15,16 @@ log = get_logger(__name__)
 # Standard
 import os
 import subprocess
-import threading
-from typing import Callable, Tuple
-import time
 
 # Third Party
 from pynput.keyboard import Controller, Key
 import pyautogui
-import pydirectinput
 import pyperclip
 from text2digits import text2digits
 
 # Local
 from scripts.gesture_event_handlers.correction_mode import CorrectionMode
+from scripts.gesture_event_handlers.input_actuator import get_input_actuator
 from scripts.tools.json_editors.mode_editor import ModeEditor
 from scripts.tools.launch_utils import launch_settings, launch_help
 
@@ -35,8 +32,10 @@ from scripts.tools.launch_utils import launch_settings, launch_help
 class Keyboard:
 
     def __init__(self) -> None:
-        self.thread_name = "Keyboard: Not defined"
         self.kb = Controller()
+        # pydirectinput actions are performed in order by the shared input actuator thread,
+        # macros are scheduled on it so they do not block the frame processing
+        self._actuator = get_input_actuator()
         self.correction_mode = CorrectionMode()
         self.mode_editor = ModeEditor()
         # TODO: Complete logic for custom email typewrite
@@ -76,38 +75,28 @@ class Keyboard:
     # Pydirectinput methods are an alternative to pyautogui
     # In some applications pyautogui might not trigger any keys 
     # especially in games
-    @staticmethod
-    def up_arrow_press() -> None:
-        pydirectinput.press("up")  
-
-    @staticmethod
-    def down_arrow_press() -> None:
-        pydirectinput.press("down")
+    def up_arrow_press(self) -> None:
+        self._actuator.key_press("up")  
 
-    @staticmethod
-    def right_arrow_press() -> None:
-        pydirectinput.press("right")
+    def down_arrow_press(self) -> None:
+        self._actuator.key_press("down")
 
-    @staticmethod
-    def left_arrow_press() -> None:
-        pydirectinput.press("left")
+    def right_arrow_press(self) -> None:
+        self._actuator.key_press("right")
 
+    def left_arrow_press(self) -> None:
+        self._actuator.key_press("left")
 
-    # Threads - used in Exercise and Gaming
-    def _run_thread(self, method: Callable, args: Tuple) -> None:
-        threading.Thread(target=method, args=args, name = self.thread_name).start()
 
+    # Used in Exercise and Gaming
     def key_press(self, key) -> None:
-        self.thread_name = "Keyboard: key_press"
-        self._run_thread(pydirectinput.press, (key,))
+        self._actuator.key_press(key)
 
     def key_down(self, key) -> None:
-        self.thread_name = "Keyboard: key_down"
-        self._run_thread(pydirectinput.keyDown, (key,))
+        self._actuator.key_down(key)
 
     def key_up(self, key) -> None:
-        self.thread_name = "Keyboard: key_up"
-        self._run_thread(pydirectinput.keyUp, (key,))
+        self._actuator.key_up(key)
 
     # kb is Controller() 
     def delete_press(self) -> None:
@@ -288,142 +277,116 @@ class Keyboard:
         pyautogui.hotkey('ctrl', 'shift', 'tab')
 
     # IBM game
-    @staticmethod
-    def ibm_game_e():
-        pydirectinput.press("e")
+    def ibm_game_e(self):
+        self._actuator.key_press("e")
 
-    @staticmethod
-    def ibm_game_q():
-        pydirectinput.press("q")
+    def ibm_game_q(self):
+        self._actuator.key_press("q")
 
     # Spider-Man 
-    @staticmethod
-    def spiderman_shoot():
-        pydirectinput.press("e", 5, 0.05)
+    def spiderman_shoot(self):
+        self._actuator.key_press("e", 5, 0.05)
 
-    @staticmethod
-    def spiderman_throw():
-        pydirectinput.keyDown("q")
-        time.sleep(0.5)
-        pydirectinput.keyUp("q")
+    def spiderman_throw(self):
+        self._actuator.run_macro([
+            (0, "key_down", ("q",)),
+            (0.5, "key_up", ("q",))
+        ])
 
-    @staticmethod
-    def spiderman_step():
-        pydirectinput.press("ctrl", 2, 0.5)
+    def spiderman_step(self):
+        self._actuator.key_press("ctrl", 2, 0.5)
     
-    @staticmethod
-    def spiderman_strike():
-        pydirectinput.press("f")
-
-    @staticmethod
-    def spiderman_run():
-        pydirectinput.keyDown("shift")
-        pydirectinput.keyDown("w")
-
-    @staticmethod
-    def spiderman_walk():
-        pydirectinput.keyUp("shift")
-        pydirectinput.keyDown("w")
-
-    @staticmethod
-    def spiderman_hit():
-        pydirectinput.mouseDown(duration=0.1)
-        pydirectinput.mouseUp()
-
-    @staticmethod
-    def spiderman_stand():
-        pydirectinput.keyUp("w")
-
-    @staticmethod
-    def spiderman_swing():
-        pydirectinput.press("space", 1, 0.15)
-        pydirectinput.keyDown("shift")
-        time.sleep(2)
-        pydirectinput.keyUp("shift")
-        pydirectinput.press("space")
-
-    @staticmethod
-    def spiderman_jump():
-        pydirectinput.press("space", 2, 0.5)
-
-    @staticmethod
-    def spiderman_health():
-        pydirectinput.press("1")
-
-    @staticmethod
-    def spiderman_finish():
-        pydirectinput.press("2")
-
-    @staticmethod
-    def game_press_e():
-        pydirectinput.press("e")
-
-    @staticmethod
-    def game_press_q():
-        pydirectinput.press("q")
-    @staticmethod
-    def spiderman_step():
-        pydirectinput.press("ctrl", 2, 0.5)
+    def spiderman_strike(self):
+        self._actuator.key_press("f")
+
+    def spiderman_run(self):
+        self._actuator.key_down("shift")
+        self._actuator.key_down("w")
+
+    def spiderman_walk(self):
+        self._actuator.key_up("shift")
+        self._actuator.key_down("w")
+
+    def spiderman_hit(self):
+        self._actuator.run_macro([
+            (0, "mouse_down", ("left",)),
+            (0.1, "mouse_up", ("left",))
+        ])
+
+    def spiderman_stand(self):
+        self._actuator.key_up("w")
+
+    def spiderman_swing(self):
+        self._actuator.run_macro([
+            (0, "key_down", ("space",)),
+            (0, "key_up", ("space",)),
+            (0.15, "key_down", ("shift",)),
+            (2.15, "key_up", ("shift",)),
+            (2.15, "key_down", ("space",)),
+            (2.15, "key_up", ("space",))
+        ])
+
+    def spiderman_jump(self):
+        self._actuator.key_press("space", 2, 0.5)
+
+    def spiderman_health(self):
+        self._actuator.key_press("1")
+
+    def spiderman_finish(self):
+        self._actuator.key_press("2")
+
+    def game_press_e(self):
+        self._actuator.key_press("e")
+
+    def game_press_q(self):
+        self._actuator.key_press("q")
+    def spiderman_step(self):
+        self._actuator.key_press("ctrl", 2, 0.5)
     
-    @staticmethod
-    def game_press_f():
-        pydirectinput.press("f")
+    def game_press_f(self):
+        self._actuator.key_press("f")
 
-    @staticmethod
-    def game_run():
-        pydirectinput.keyDown("ctrl")
+    def game_run(self):
+        self._actuator.key_down("ctrl")
 
-    @staticmethod
-    def game_walk():
-        pydirectinput.keyUp("ctrl")
+    def game_walk(self):
+        self._actuator.key_up("ctrl")
 
-    @staticmethod
-    def game_sneak():
-        pydirectinput.keyDown("shift")
+    def game_sneak(self):
+        self._actuator.key_down("shift")
 
-    @staticmethod
-    def game_sneakUp():
-        pydirectinput.keyUp("shift")
+    def game_sneakUp(self):
+        self._actuator.key_up("shift")
 
-    @staticmethod
-    def game_jump():
-        pydirectinput.press("space")
+    def game_jump(self):
+        self._actuator.key_press("space")
 
-    @staticmethod
-    def game_one():
-        pydirectinput.press("1")
+    def game_one(self):
+        self._actuator.key_press("1")
 
-    @staticmethod
-    def game_two():
-        pydirectinput.press("2")
+    def game_two(self):
+        self._actuator.key_press("2")
 
-    @staticmethod
-    def game_three():
-        pydirectinput.press("3")
+    def game_three(self):
+        self._actuator.key_press("3")
 
-    @staticmethod
-    def game_four():
-        pydirectinput.press("4")
+    def game_four(self):
+        self._actuator.key_press("4")
 
-    @staticmethod
-    def game_five():
-        pydirectinput.press("5")
+    def game_five(self):
+        self._actuator.key_press("5")
 
-    @staticmethod
-    def game_six():
-        pydirectinput.press("6")
+    def game_six(self):
+        self._actuator.key_press("6")
 
-    @staticmethod
-    def game_seven():
-        pydirectinput.press("7")
+    def game_seven(self):
+        self._actuator.key_press("7")
 
-    @staticmethod
-    def game_eight():
-        pydirectinput.press("8")
+    def game_eight(self):
+        self._actuator.key_press("8")
 
-    @staticmethod
-    def game_nine():
-        pydirectinput.press("9")
+    def game_nine(self):
+        self._actuator.key_press("9")
         
 
     ##################### Core Functionality Methods ######################
@@ -1,22 +1,22 @@
 '''
 Author: Jason Ho
 '''
-# Standard
-from typing import Callable, Tuple
-import threading
-
-# Third Party
-import pydirectinput
+# Local
+from scripts.gesture_event_handlers.input_actuator import get_input_actuator
 
 
 class Keyboard:
+    def __init__(self) -> None:
+        # the actions are performed in order by the shared input actuator thread
+        self._actuator = get_input_actuator()
+
     def key_press(self, key: str) -> None:
         """Performs a keypress as a DirectX action.
         
         :param key: name of key to press
         :type key: str
         """
-        self._run_thread(pydirectinput.press, (key,))
+        self._actuator.key_press(key)
         
     def key_down(self, key: str) -> None:
         """Performs a keydown as a DirectX action.
@@ -24,7 +24,7 @@ class Keyboard:
         :param key: name of key for keydown
         :type key: str
         """
-        self._run_thread(pydirectinput.keyDown, (key,))
+        self._actuator.key_down(key)
         
     def key_up(self, key: str) -> None:
         """Performs a keyup as a DirectX action.
@@ -32,24 +32,18 @@ class Keyboard:
         :param key: name of key for keyuo
         :type key: str
         """
-        self._run_thread(pydirectinput.keyUp, (key,))
-
-    def _run_thread(self, method: Callable, args: Tuple) -> None:
-        threading.Thread(target=method, args=args, name="Pydirect_direct_actions").start()
+        self._actuator.key_up(key)
 
 class Clicker:
+    def __init__(self) -> None:
+        self._actuator = get_input_actuator()
+
     def left_click(self) -> None:
         """Performs a left click as a DirectX action.
         """
-        threading.Thread(target=self._click, name="Pydirect_direct_actions: left_click", args=()).start()
+        self._actuator.click("left")
     
     def right_click(self) -> None:
         """Performs a left click as a DirectX action.
         """
-        threading.Thread(target=self._click, name="Pydirect_direct_actions: right_click", args=("right",)).start()
-
-    def _click(self, click="left") -> None:
-        if click == "left":
-            pydirectinput.click()
-        else:
-            pydirectinput.click(button="right")
\ No newline at end of file
+        self._actuator.click("right")
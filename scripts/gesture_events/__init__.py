@@ -1,114 +1,63 @@
 """
 Author: Carmen Meinson
 """
-from scripts.gesture_events.extremity_walking_event import (
-    ExtremityWalkingEvent,
-)
-from scripts.gesture_events.eye_mode_2 import EyeMode2Event
-from scripts.gesture_events.pseudovr_event import PseudoVRMode1Event, PseudoVRMode2Event, PseudoVRMode3Event
-from scripts.gesture_events.gamepad_event import GamepadMode1Event, GamepadMode2Event, GamepadMode3Event
-from .boundaries_nose_box_event import BoundariesNoseBoxEvent
-from .click_press_event import (
-    ClickPressEvent,
-    SingleHandExclusiveClickPressEvent
-)
-# hand
-from .hand_active_event import HandActiveEvent
-from .hand_depth_click_event import HandDepthClickEvent
-from .palm_height_change_event import PalmHeightChangeEvent
-from .customized_gesture_event import CustomizedGestureEvent
-from .gestures_active_event import GesturesActiveEvent
-from .scroll_event import ScrollEvent
-from .touch_press_event import TouchPressEvent
-from .zoom_event import ZoomEvent
-from .pen_drag_event import PenDragEvent
-from.hand_drive_event import HandDriveRotateEvent, HandDriveForwardBackwardEvent, HandDriveUpDownEvent
-from .mr_swipe_event import MRSwipeEvent
-from .samurai_swipe_event import SamuraiSwipeEvent
-from .spiderman_thwip import SpidermanThwipEvent
-# body
-from .exercise_event import ExerciseEvent
-from .extremity_trigger_event import ExtremityTriggerEvent
-from .gun_move_event import GunMoveEvent
-from .idle_state_change_event import IdleStateChangeEvent
-from .joystick_event import JoystickButtonPressEvent, JoystickWristEvent
-from .keyboard_active_event import KeyboardActiveEvent
-from .keyboard_click_event import KeyboardClickEvent
-# head
-from .head_gesture_trigger_event import (
-    OpenMouthEvent,
-    RaiseEyeBrowEvent,
-    SmilingEvent,
-    FishFaceEvent,
-    TurnLeftEvent,
-    TurnRightEvent,
-    TiltLeftEvent,
-    TiltRightEvent
-)
-from .move_nose_box_event import MoveNoseBoxEvent
-from .nose_direction_tracking_event import NoseDirectionTrackingEvent
-from .nose_direction_tracking_event_nose_box import \
-    NoseDirectionTrackingEventNoseBox
-from .nose_scroll_event import NoseScrollEvent
-from .nose_tracking_event import NoseTrackingEvent
-from .nose_zoom_event import NoseZoomEvent
-from .eye_tracking_event import EyeTrackingEvent
-# speech
-from .speech_event import SpeechEvent
+from scripts.tools.lazy_import import LazyRegistry
 
 # this should store every available handler
-events = {
-    "ClickPressEvent": ClickPressEvent,
-    "SingleHandExclusiveClickPressEvent": SingleHandExclusiveClickPressEvent,
-    "TouchPressEvent": TouchPressEvent,
-    "KeyboardActiveEvent": KeyboardActiveEvent,
-    "KeyboardClickEvent": KeyboardClickEvent,
-    "PalmHeightChangeEvent": PalmHeightChangeEvent,
-    "IdleStateChangeEvent": IdleStateChangeEvent,
-    "HandActiveEvent": HandActiveEvent,
-    "HandDepthClickEvent": HandDepthClickEvent,
-    "ScrollEvent": ScrollEvent,
-    "ExtremityTriggerEvent": ExtremityTriggerEvent,
-    "ZoomEvent": ZoomEvent,
-    "ExerciseEvent": ExerciseEvent,
-    "ExtremityWalkingEvent": ExtremityWalkingEvent,
-    "GamepadMode1Event": GamepadMode1Event,
-    "GamepadMode2Event": GamepadMode2Event,
-    "GamepadMode3Event": GamepadMode3Event,
-    "PseudoVRMode1Event": PseudoVRMode1Event,
-    "PseudoVRMode2Event": PseudoVRMode2Event,
-    "PseudoVRMode3Event": PseudoVRMode3Event,
-    "SpeechEvent": SpeechEvent,
-    "SmilingEvent": SmilingEvent,
-    "FishFaceEvent": FishFaceEvent,
-    "TurnLeftEvent": TurnLeftEvent,
-    "TurnRightEvent": TurnRightEvent,
-    "TiltLeftEvent": TiltLeftEvent,
-    "TiltRightEvent": TiltRightEvent,
-    "NoseTrackingEvent": NoseTrackingEvent,
-    "NoseDirectionTrackingEvent": NoseDirectionTrackingEvent,
-    "OpenMouthEvent": OpenMouthEvent,
-    "RaiseEyeBrowEvent": RaiseEyeBrowEvent,
-    "GesturesActiveEvent": GesturesActiveEvent,
-    "PenDragEvent": PenDragEvent,
-    "EyeTrackingEvent": EyeTrackingEvent,
-    "EyeMode2Event": EyeMode2Event,
-    "NoseDirectionTrackingEventNoseBox": NoseDirectionTrackingEventNoseBox,
-    "MoveNoseBoxEvent": MoveNoseBoxEvent,
-    "BoundariesNoseBoxEvent": BoundariesNoseBoxEvent,
-    "NoseScrollEvent": NoseScrollEvent,
-    "NoseZoomEvent": NoseZoomEvent,
-    "JoystickButtonPressEvent": JoystickButtonPressEvent,
-    "JoystickWristEvent": JoystickWristEvent,
-    "CustomizedGestureEvent": CustomizedGestureEvent,
-    "GunMoveEvent": GunMoveEvent,
-    "HandDriveRotateEvent": HandDriveRotateEvent,
-    "HandDriveForwardBackwardEvent": HandDriveForwardBackwardEvent,
-    "HandDriveUpDownEvent": HandDriveUpDownEvent,
-    "MRSwipeEvent": MRSwipeEvent,
-    "SamuraiSwipeEvent": SamuraiSwipeEvent,
-    "SpidermanThwipEvent": SpidermanThwipEvent
-}
+# the event classes are only imported when they are first used, as importing all of them
+# would also import the dependencies of every module (mediapipe, openvino, ...)
+events = LazyRegistry({
+    "ClickPressEvent": "scripts.gesture_events.click_press_event:ClickPressEvent",
+    "SingleHandExclusiveClickPressEvent": "scripts.gesture_events.click_press_event:SingleHandExclusiveClickPressEvent",
+    "TouchPressEvent": "scripts.gesture_events.touch_press_event:TouchPressEvent",
+    "KeyboardActiveEvent": "scripts.gesture_events.keyboard_active_event:KeyboardActiveEvent",
+    "KeyboardClickEvent": "scripts.gesture_events.keyboard_click_event:KeyboardClickEvent",
+    "PalmHeightChangeEvent": "scripts.gesture_events.palm_height_change_event:PalmHeightChangeEvent",
+    "IdleStateChangeEvent": "scripts.gesture_events.idle_state_change_event:IdleStateChangeEvent",
+    "HandActiveEvent": "scripts.gesture_events.hand_active_event:HandActiveEvent",
+    "HandDepthClickEvent": "scripts.gesture_events.hand_depth_click_event:HandDepthClickEvent",
+    "ScrollEvent": "scripts.gesture_events.scroll_event:ScrollEvent",
+    "ExtremityTriggerEvent": "scripts.gesture_events.extremity_trigger_event:ExtremityTriggerEvent",
+    "ZoomEvent": "scripts.gesture_events.zoom_event:ZoomEvent",
+    "ExerciseEvent": "scripts.gesture_events.exercise_event:ExerciseEvent",
+    "ExtremityWalkingEvent": "scripts.gesture_events.extremity_walking_event:ExtremityWalkingEvent",
+    "GamepadMode1Event": "scripts.gesture_events.gamepad_event:GamepadMode1Event",
+    "GamepadMode2Event": "scripts.gesture_events.gamepad_event:GamepadMode2Event",
+    "GamepadMode3Event": "scripts.gesture_events.gamepad_event:GamepadMode3Event",
+    "PseudoVRMode1Event": "scripts.gesture_events.pseudovr_event:PseudoVRMode1Event",
+    "PseudoVRMode2Event": "scripts.gesture_events.pseudovr_event:PseudoVRMode2Event",
+    "PseudoVRMode3Event": "scripts.gesture_events.pseudovr_event:PseudoVRMode3Event",
+    "SpeechEvent": "scripts.gesture_events.speech_event:SpeechEvent",
+    "SmilingEvent": "scripts.gesture_events.head_gesture_trigger_event:SmilingEvent",
+    "FishFaceEvent": "scripts.gesture_events.head_gesture_trigger_event:FishFaceEvent",
+    "TurnLeftEvent": "scripts.gesture_events.head_gesture_trigger_event:TurnLeftEvent",
+    "TurnRightEvent": "scripts.gesture_events.head_gesture_trigger_event:TurnRightEvent",
+    "TiltLeftEvent": "scripts.gesture_events.head_gesture_trigger_event:TiltLeftEvent",
+    "TiltRightEvent": "scripts.gesture_events.head_gesture_trigger_event:TiltRightEvent",
+    "NoseTrackingEvent": "scripts.gesture_events.nose_tracking_event:NoseTrackingEvent",
+    "NoseDirectionTrackingEvent": "scripts.gesture_events.nose_direction_tracking_event:NoseDirectionTrackingEvent",
+    "OpenMouthEvent": "scripts.gesture_events.head_gesture_trigger_event:OpenMouthEvent",
+    "RaiseEyeBrowEvent": "scripts.gesture_events.head_gesture_trigger_event:RaiseEyeBrowEvent",
+    "GesturesActiveEvent": "scripts.gesture_events.gestures_active_event:GesturesActiveEvent",
+    "PenDragEvent": "scripts.gesture_events.pen_drag_event:PenDragEvent",
+    "EyeTrackingEvent": "scripts.gesture_events.eye_tracking_event:EyeTrackingEvent",
+    "EyeMode2Event": "scripts.gesture_events.eye_mode_2:EyeMode2Event",
+    "NoseDirectionTrackingEventNoseBox": "scripts.gesture_events.nose_direction_tracking_event_nose_box:NoseDirectionTrackingEventNoseBox",
+    "MoveNoseBoxEvent": "scripts.gesture_events.move_nose_box_event:MoveNoseBoxEvent",
+    "BoundariesNoseBoxEvent": "scripts.gesture_events.boundaries_nose_box_event:BoundariesNoseBoxEvent",
+    "NoseScrollEvent": "scripts.gesture_events.nose_scroll_event:NoseScrollEvent",
+    "NoseZoomEvent": "scripts.gesture_events.nose_zoom_event:NoseZoomEvent",
+    "JoystickButtonPressEvent": "scripts.gesture_events.joystick_event:JoystickButtonPressEvent",
+    "JoystickWristEvent": "scripts.gesture_events.joystick_event:JoystickWristEvent",
+    "CustomizedGestureEvent": "scripts.gesture_events.customized_gesture_event:CustomizedGestureEvent",
+    "GunMoveEvent": "scripts.gesture_events.gun_move_event:GunMoveEvent",
+    "HandDriveRotateEvent": "scripts.gesture_events.hand_drive_event:HandDriveRotateEvent",
+    "HandDriveForwardBackwardEvent": "scripts.gesture_events.hand_drive_event:HandDriveForwardBackwardEvent",
+    "HandDriveUpDownEvent": "scripts.gesture_events.hand_drive_event:HandDriveUpDownEvent",
+    "MRSwipeEvent": "scripts.gesture_events.mr_swipe_event:MRSwipeEvent",
+    "SamuraiSwipeEvent": "scripts.gesture_events.samurai_swipe_event:SamuraiSwipeEvent",
+    "SpidermanThwipEvent": "scripts.gesture_events.spiderman_thwip:SpidermanThwipEvent"
+})
 
 
 class GestureEvents:
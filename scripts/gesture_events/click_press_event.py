@@ -20,6 +20,7 @@ class ClickPressEvent(SimpleGestureEvent):
     """
     _event_trigger_types = {"click", "press", "release"}
     _bodypart_types = {"hand"}
+    _reusable = True
 
     def __init__(self, gesture_type: str, additional_bodypart_types=set()):
         bodypart_types = additional_bodypart_types | ClickPressEvent._bodypart_types
@@ -53,6 +54,10 @@ class ClickPressEvent(SimpleGestureEvent):
         if self._click_held:
             if self._event_triggers["release"] is not None:  self._event_triggers["release"]()
 
+    def reset(self) -> None:
+        super().reset()
+        self._click_held = False  # released by force_deactivate
+
     def _check_state(self) -> None:
         self._state = (self._gestures["hand"][self._gesture_type] is not None) or self._click_held
 
@@ -0,0 +1,228 @@
+'''
+Streaming matching of the live hand movement against the recorded traces of the customized gestures.
+The angle features of each frame are kept in fixed numpy ring buffers, so that checking a window costs
+the same no matter how long it is. All the custom gestures using the same body part share one engine,
+which computes the features once per frame and matches all of their traces in one go.
+'''
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+KEY_FRAMES = 16  # key frames sampled from a window, the first one is the origin of the other 15
+STATIC_THRESHOLD = 25.0  # max summed key frame change (per axis) of a window in which the hand counts as still
+SIMILARITY_THRESHOLD = 0.6  # min cosine similarity of the traces, generated by testing
+
+
+class FeatureWindow:
+    """Ring buffer of the per frame features (angle to the top left corner, angle to the top right corner and
+    distance to the camera) of one body part. Also keeps the running sum of the absolute changes between
+    consecutive frames of the window."""
+
+    def __init__(self, size: int, dims: int = 3) -> None:
+        self._size = size
+        self._features = np.zeros((size, dims))
+        self._changes = np.zeros((size, dims))  # |feature - previous feature|, 0 for the oldest frame
+        self._path = np.zeros(dims)  # sum of the changes in the window
+        self._start = 0
+        self._count = 0
+
+    def append(self, feature: Sequence[float]) -> None:
+        if self._count == self._size:
+            self.pop_oldest()
+        index = (self._start + self._count) % self._size
+        self._features[index] = feature
+        if self._count > 0:
+            np.abs(self._features[index] - self._features[index - 1], out=self._changes[index])
+            self._path += self._changes[index]
+        else:
+            self._changes[index] = 0
+        self._count += 1
+
+    def pop_oldest(self) -> None:
+        if self._count == 0:
+            return
+        self._start = (self._start + 1) % self._size
+        self._count -= 1
+        if self._count > 0:  # the change of the new oldest frame was relative to the removed one
+            self._path -= self._changes[self._start]
+            self._changes[self._start] = 0
+        else:
+            self._path[:] = 0
+
+    def clear(self) -> None:
+        self._start = 0
+        self._count = 0
+        self._path[:] = 0
+
+    def is_full(self) -> bool:
+        return self._count == self._size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_path_length(self) -> np.ndarray:
+        """
+        :return: summed absolute change between the consecutive frames of the window per feature
+        :rtype: np.ndarray
+        """
+        return self._path
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """
+        :param indices: indices of the frames counted from the oldest one (of any shape)
+        :type indices: np.ndarray
+        :return: features of the frames (*indices.shape, dims)
+        :rtype: np.ndarray
+        """
+        return self._features[(self._start + indices) % self._size]
+
+
+def key_frame_samples(window_size: int) -> np.ndarray:
+    """Indices of the key frames in a window"""
+    return np.linspace(0, window_size - 1, num=KEY_FRAMES, dtype=int)
+
+
+def trace_distances(diff_features: np.ndarray, traces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean distance between the live and the recorded diff features and cosine similarity of their x angles.
+    The last two axes are the key frames and the features, all the others are broadcast.
+
+    :param diff_features: live diff features (..., KEY_FRAMES - 1, 3)
+    :type diff_features: np.ndarray
+    :param traces: recorded diff features (..., KEY_FRAMES - 1, 3)
+    :type traces: np.ndarray
+    :return: distance and similarity (...)
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    distance = np.linalg.norm(diff_features - traces, axis=-1).mean(axis=-1)
+
+    live_x = diff_features[..., 0]
+    trace_x = traces[..., 0]
+    norms = np.linalg.norm(live_x, axis=-1) * np.linalg.norm(trace_x, axis=-1)
+    dots = (live_x * trace_x).sum(axis=-1)
+    similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+    return distance, similarity
+
+
+def is_match(distances: Sequence[float], similarities: Sequence[float], threshold: float) -> bool:
+    """A gesture is recognised if the mean distance of its body parts to their traces is below the threshold
+    and the x angle traces of all body parts go in the same direction (cosine similarity of at least
+    SIMILARITY_THRESHOLD)."""
+    return bool(np.mean(distances) / 2 < threshold and np.min(similarities) >= SIMILARITY_THRESHOLD)
+
+
+def get_angle_feature(position, attention_point: str, camera_w_h_ratio: float) -> Tuple[float, float, float]:
+    """Transforms the location of the attention point to the angles in relation to the top left and right corners
+    of the frame, together with the (scaled) distance of the hand to the camera.
+
+    :param position: position of the hand
+    :type position: Position
+    :param attention_point: name of the landmark to follow
+    :type attention_point: str
+    :param camera_w_h_ratio: width / height of the camera frame
+    :type camera_w_h_ratio: float
+    :return: the angles and the distance
+    :rtype: Tuple[float, float, float]
+    """
+    wrist = position.get_landmark("wrist")
+    middle_base = position.get_landmark("middle_base")
+    distance_to_camera = 1 - math.sqrt(sum((wrist[i] - middle_base[i]) ** 2 for i in range(3)))
+    x, y = float(position.get_landmark(attention_point)[0]), float(position.get_landmark(attention_point)[1])
+    return (math.degrees(math.atan(camera_w_h_ratio * (x / y))),
+            math.degrees(math.atan(camera_w_h_ratio * ((1.0 - x) / y))),
+            distance_to_camera * 45.0)
+
+
+class CustomizedGestureEngine:
+    """Matches the live movement of one body part against the traces of all the custom gestures using it.
+    The events subscribe their trace and window size and then read their match result each frame. The
+    features are computed once per frame, however many events push the same position."""
+    _engines = {}
+
+    @classmethod
+    def get_engine(cls, bodypart_name: str, attention_point: str, camera_w_h_ratio: float) -> "CustomizedGestureEngine":
+        key = (bodypart_name, attention_point, camera_w_h_ratio)
+        if key not in cls._engines:
+            cls._engines[key] = cls(attention_point, camera_w_h_ratio)
+        return cls._engines[key]
+
+    def __init__(self, attention_point: str, camera_w_h_ratio: float) -> None:
+        self._attention_point = attention_point
+        self._camera_w_h_ratio = camera_w_h_ratio
+        self._subscribers = {}  # gesture name -> (trace (KEY_FRAMES - 1, 3), window size)
+        self._window = FeatureWindow(1)
+        self._last_position = None
+        self._results = None  # gesture name -> (distance, similarity, still) of the current frame
+        # stacked subscribers, rebuilt when they change
+        self._names = []
+        self._traces = None  # (gestures, KEY_FRAMES - 1, 3)
+        self._window_sizes = None  # (gestures,)
+        self._offsets = None  # (gestures, KEY_FRAMES) key frame indices relative to the end of the window
+
+    def subscribe(self, gesture_name: str, trace: Sequence[Sequence[float]], window_size: int) -> None:
+        self._subscribers[gesture_name] = (np.asarray(trace, dtype=float), window_size)
+        self._stack()
+
+    def unsubscribe(self, gesture_name: str) -> None:
+        if self._subscribers.pop(gesture_name, None) is not None:
+            self._stack()
+
+    def push(self, position) -> None:
+        """Adds the features of the position to the window, once per frame.
+
+        :param position: current position of the body part
+        :type position: Position
+        """
+        if position is self._last_position:
+            return
+        self._last_position = position
+        self._window.append(get_angle_feature(position, self._attention_point, self._camera_w_h_ratio))
+        self._results = None
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._results = None
+
+    def get_match(self, gesture_name: str) -> Optional[Tuple[float, float, bool]]:
+        """
+        :param gesture_name: name of the subscribed gesture
+        :type gesture_name: str
+        :return: distance to the trace, cosine similarity of the x angles and if the hand kept still.
+            None if there are not enough frames for the window of the gesture yet.
+        :rtype: Optional[Tuple[float, float, bool]]
+        """
+        if self._results is None:
+            self._results = self._match()
+        return self._results.get(gesture_name)
+
+    def _stack(self) -> None:
+        self._names = list(self._subscribers.keys())
+        if not self._names:
+            self._traces = None
+            return
+        self._traces = np.array([self._subscribers[name][0] for name in self._names])
+        self._window_sizes = np.array([self._subscribers[name][1] for name in self._names])
+        self._offsets = np.array([key_frame_samples(size) - size for size in self._window_sizes])
+        max_size = int(self._window_sizes.max())
+        if max_size != self._window.get_size():
+            self._window = FeatureWindow(max_size)  # the frames are dropped, as done after a recognised gesture
+        self._results = None
+
+    def _match(self) -> Dict[str, Tuple[float, float, bool]]:
+        frames = len(self._window)
+        if self._traces is None or frames == 0:
+            return {}
+        ready = self._window_sizes <= frames
+        indices = np.maximum(self._offsets + frames, 0)
+        key_frames = self._window.take(indices)  # (gestures, KEY_FRAMES, 3)
+        diff_features = key_frames[:, 1:] - key_frames[:, :1]
+        distance, similarity = trace_distances(diff_features, self._traces)
+        if (KEY_FRAMES - 1) * self._window.get_path_length().max() <= STATIC_THRESHOLD:
+            still = np.ones(len(self._names), dtype=bool)  # no part of the window moves enough
+        else:
+            still = (np.abs(diff_features).sum(axis=1) <= STATIC_THRESHOLD).all(axis=-1)
+        return {name: (float(distance[i]), float(similarity[i]), bool(still[i]))
+                for i, name in enumerate(self._names) if ready[i]}
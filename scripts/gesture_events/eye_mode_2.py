@@ -4,7 +4,6 @@ Author: Alexandros Theofanous
 
 import cv2 as cv
 
-from scripts import *
 from scripts.eye_module.eye_calibration import HeadCalibrator
 from scripts.gesture_event_handlers.edit_config import EditConfigFile
 from .eye_tracking_event import EyeTrackingEvent
@@ -16,6 +16,7 @@ class GesturesActiveEvent(SimpleGestureEvent):
         retrieved from the desired_gesture_states 
     """
     _event_trigger_types = {"active"}
+    _reusable = True
 
     def __init__(self, desired_gesture_states: Dict[str, Dict[str, bool]], frames_nr=1):
         """
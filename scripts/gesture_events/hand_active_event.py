@@ -18,6 +18,7 @@ class HandActiveEvent(SimpleGestureEvent):
     _event_trigger_types = {"move"}
     _gesture_types = {"facing_camera"}
     _bodypart_types = {"hand"}
+    _reusable = True
 
     def __init__(self):
         self._gestures = {"hand": {"facing_camera": None}}
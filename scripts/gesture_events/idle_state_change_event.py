@@ -19,6 +19,7 @@ class IdleStateChangeEvent(SimpleGestureEvent):
     _event_trigger_types = {"idle", "active"}
     _gesture_types = {"facing_camera"}
     _bodypart_types = {"hand"}
+    _reusable = True
 
     def __init__(self, currently_idle=False):
         self._gestures = {"hand": {"facing_camera": None}}
@@ -45,6 +46,10 @@ class IdleStateChangeEvent(SimpleGestureEvent):
             self._frame_count = 0
             # self._currently_idle = not self._currently_idle not needed cause for each #currently state we have a separate model aka separate event instance
 
+    def reset(self) -> None:
+        super().reset()
+        self._frame_count = 0
+
     def _check_state(self) -> None:
         # Conditions for idleness: if any of these are met, the state is idle. If not, the state is active.
         # Condition 1: The hand is turned around so the palm is facing inward i.e. not outwards towards the camera.
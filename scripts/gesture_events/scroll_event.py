@@ -21,6 +21,7 @@ class ScrollEvent(SimpleGestureEvent):
     _event_trigger_types = {"scroll"}
     _gesture_types = {"scroll"}  # TODO: in the v2 there was also the requirement of the thumb being close to the pinky. do we add it back?
     _bodypart_types = {"hand"}
+    _reusable = True
 
     def __init__(self):
         self._gestures = {"hand": {"scroll": None}}
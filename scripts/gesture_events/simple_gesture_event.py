@@ -56,6 +56,13 @@ class SimpleGestureEvent(GestureEvent):
                 self._gestures[bodypart_type][gesture.get_name()] = None
                 self._check_state()
 
+    def reset(self):
+        # forget the gestures, they may deactivate while the event is out of the model
+        for bodypart_gestures in self._gestures.values():
+            for gesture_name in bodypart_gestures:
+                bodypart_gestures[gesture_name] = None
+        self._state = False
+
     def update(self):
         # checks the event firing condition and if true calls the _event_trigger
         raise NotImplementedError()
@@ -21,6 +21,7 @@ class TouchPressEvent(SimpleGestureEvent):
     '''
     _event_trigger_types = {"click", "press", "release"}
     _bodypart_types = {"dom_hand", "off_hand"}
+    _reusable = True
 
 
     def __init__(self, gesture_type: str):
@@ -48,6 +49,10 @@ class TouchPressEvent(SimpleGestureEvent):
                     landmark = hand_position.get_landmark("index_tip")
                     self._event_triggers["press"]((landmark[0], landmark[1]))
 
+    def reset(self) -> None:
+        super().reset()
+        self._click_held = {hand: False for hand in self._bodypart_types}  # released by force_deactivate
+
     def force_deactivate(self) -> None:
         if self._click_held: 
             if self._event_triggers["release"] is not None:  self._event_triggers["release"]()
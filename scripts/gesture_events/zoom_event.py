@@ -19,6 +19,7 @@ class ZoomEvent(SimpleGestureEvent):
     _event_trigger_types = {"zoom"}
     _gesture_types = {"index_pinch"}
     _bodypart_types = {"dom_hand", "off_hand"}
+    _reusable = True
 
     def __init__(self):
         self._gestures = {"dom_hand": {"index_pinch": None},
@@ -41,6 +42,10 @@ class ZoomEvent(SimpleGestureEvent):
 
         self._last_hands_dist = hands_dist
 
+    def reset(self) -> None:
+        super().reset()
+        self._last_hands_dist = None
+
     def _check_state(self):
         self._state = self._gestures["dom_hand"]["index_pinch"] is not None and self._gestures["off_hand"][
             "index_pinch"] is not None
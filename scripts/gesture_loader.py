@@ -1,18 +1,31 @@
 '''
 Author: Carmen Meinson
 '''
-from scripts.eye_module import EyeModule
 from scripts.core.model import Model
+from scripts.core.module import Module
 from typing import Set
 
-from scripts.hand_module import HandModule
-from scripts.body_module import BodyModule
-
-from scripts.speech_module import SpeechModule
-from scripts.head_module import HeadModule
-
+from scripts.module_warm_up import ModuleWarmUp
 from scripts.tools.json_editors.gesture_editor import GestureEditor
 from scripts.tools.config import Config
+from scripts.tools.lazy_import import LazyRegistry
+
+# names of the modules mapped to the module classes. Each module (and so its ML framework) is only imported when it is first used.
+MODULES = LazyRegistry({
+    "hand": "scripts.hand_module:HandModule",
+    "speech": "scripts.speech_module:SpeechModule",
+    "body": "scripts.body_module:BodyModule",
+    "head": "scripts.head_module:HeadModule",
+    "eye": "scripts.eye_module:EyeModule"
+})
+# names of the trackers (body parts) of each module, kept here so the module classes do not need to be imported to look them up
+MODULE_TRACKER_NAMES = {
+    "hand": {"Left", "Right"},
+    "speech": {"speech"},
+    "body": {"body"},
+    "head": {"head"},
+    "eye": {"eye"}
+}
 
 # # we may need to split into no_equipment and equipment, because apparently the ML classification may overlap and mistake equipment and no equipment events e.g. squatting and rowing
 # # alternatively the GUI can just ensure that the user just can't select both modes, so only exercises of one mode are loaded
@@ -21,14 +34,16 @@ class GestureLoader:
     def __init__(self):
         gesture_editor = GestureEditor()
         self._gestures = gesture_editor.get_all_data()
+        # name of the gesture -> name of the module it belongs to (the first one, if several define it)
+        self._gesture_to_module = {}
+        for module_name, gestures in self._gestures.items():
+            for gesture_name in gestures:
+                self._gesture_to_module.setdefault(gesture_name, module_name)
 
-        self._modules = {
-            "hand": HandModule,
-            "speech": SpeechModule,
-            "body": BodyModule,
-            "head": HeadModule,
-            "eye": EyeModule
-        }
+        self._modules = MODULES
+        self._module_warm_up = None
+        if Config().get_data("general/warm_up_modules"):
+            self._module_warm_up = ModuleWarmUp(self._modules)
 
     def add_gestures_to_model(self, model: Model, gesture_names: Set[str]) -> None:
         """Based on the given gesture names, add the desired gestures to the model as well as the moules used by said gestures
@@ -39,16 +54,44 @@ class GestureLoader:
         :type gesture_names: Set[str]
         """
         for gesture_name in gesture_names:
-            for module_name in self._gestures:
-                if gesture_name in self._gestures[module_name]:
-                    if module_name not in model.get_module_names():
+            module_name = self._gesture_to_module.get(gesture_name)
+            if module_name is None:
+                continue
+            if module_name not in model.get_module_names():
+
+                module_instance = self._get_module_instance(module_name)
+                run_calibration = Config().get_data("modules/%s/run_calibration"%module_name)
+
+                if run_calibration:
+                    module_instance.calibrate()
+
+                model.add_module(module_name, module_instance)
+            model.add_gesture(module_name, gesture_name, self._gestures[module_name][gesture_name])
 
-                        module_instance = self._modules[module_name]()
-                        run_calibration = Config().get_data("modules/%s/run_calibration"%module_name)
 
-                        if run_calibration:
-                            module_instance.calibrate()
 
-                        model.add_module(module_name, module_instance)
-                    model.add_gesture(module_name, gesture_name, self._gestures[module_name][gesture_name])
-        
+    def warm_up_modules(self, model: Model, bodypart_names: Set[str]) -> None:
+        """Starts building (on a background thread) the modules that track the given body parts and are not yet in the model,
+        so that adding them to the model later on does not block.
+
+        :param model: model the modules will be added to
+        :type model: Model
+        :param bodypart_names: names of the body parts (trackers) e.g. {"Left", "head"}
+        :type bodypart_names: Set[str]
+        """
+        if self._module_warm_up is None:
+            return
+        module_names = {name for name, tracker_names in MODULE_TRACKER_NAMES.items()
+                        if tracker_names & bodypart_names and name not in model.get_module_names()}
+        self._module_warm_up.warm_up(module_names)
+
+    def close(self) -> None:
+        if self._module_warm_up is not None:
+            self._module_warm_up.close()
+
+    def _get_module_instance(self, module_name: str) -> Module:
+        if self._module_warm_up is not None:
+            module_instance = self._module_warm_up.take(module_name)
+            if module_instance is not None:
+                return module_instance
+        return self._modules[module_name]()
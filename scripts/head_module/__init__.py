@@ -3,6 +3,7 @@ from typing import Any, Optional
 from scripts.core import Module
 
 from .head_gesture import HeadGesture
+from .head_gesture_classifier import FacialGestureClassifier
 from .head_landmark_detector import HeadLandmarkDetector
 from .head_position import HeadPosition
 
@@ -15,6 +16,10 @@ class HeadModule(Module):
 
     _tracker_names = {"head"}
 
+    @classmethod
+    def _do_pre_initialization(cls) -> None:
+        FacialGestureClassifier.model  # loads the classifier model
+
     @classmethod
     def calibrate(cls,  params: Optional[Any] = None) -> None:
 
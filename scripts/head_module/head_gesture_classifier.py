@@ -1,17 +1,9 @@
 import pickle
+from threading import Lock
 
 from .head_transformation import HeadPlaneProjection
 import numpy as np
 
-"""
-The following sklearn imports are definitely needed for successful compilation!
-When the facial classifier model is unpickled, it requires the sklearn library to run.
-"""
-
-from sklearn import svm, metrics
-import sklearn.metrics._pairwise_distances_reduction._datasets_pair
-import sklearn.metrics._pairwise_distances_reduction._middle_term_computer
-
 MODEL_PATH = "./data/ml_models/head/facial-gesture-classifier.bin"
 
 GESTURE_CLASSES = ["resting", "open_mouth", "raise_eyebrows", "smiling", "fish_face"]
@@ -38,10 +30,32 @@ class _FacialGestureClassifier:
 
     def __init__(self):
 
-        self.model = pickle.load(open(MODEL_PATH, "rb"))
+        self._model = None  # loaded on the first classification, so importing the head module does not import sklearn
+        self._model_lock = Lock()
 
         self.landmark_frame = None
 
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @staticmethod
+    def _load_model():
+        """
+        The following sklearn imports are definitely needed for successful compilation!
+        When the facial classifier model is unpickled, it requires the sklearn library to run.
+        """
+        from sklearn import svm, metrics
+        import sklearn.metrics._pairwise_distances_reduction._datasets_pair
+        import sklearn.metrics._pairwise_distances_reduction._middle_term_computer
+
+        with open(MODEL_PATH, "rb") as model_file:
+            return pickle.load(model_file)
+
     def get_metrics(self, projected_frame):
 
         use_z = True
@@ -2,7 +2,7 @@
 Author: Carmen Meinson
 Contributors: Andrzej Szablewski, Anelia Gaydardzhieva
 """
-from typing import Optional
+from typing import Optional, Set
 from scripts.core.model import Model
 from scripts.event_mapper import EventMapper
 from scripts.gesture_event_handlers import GestureEventHandlers
@@ -35,6 +35,7 @@ class ModeController:
         self._iteration_order = mode_config["iteration_order"]
         self._current_mode = mode_config["current_mode"]
         self._mappings = mode_config["mode_labels"]
+        self._open_vocabulary_modes = set(mode_config.get("open_vocabulary_modes", []))
         self._next_mode = mode_config["current_mode"]
         #self.current_hotkeys_user = ""
 
@@ -50,6 +51,8 @@ class ModeController:
             self._view.update_display_element("active_mode_name", {"name": mode_name})
 
         self._event_mapper.switch_events_in_model(model, set(), self._modes[self._current_mode])
+        self._update_speech_grammar()
+        self._warm_up_next_modes()
 
     #    ### TODO: Complete the Hotkeys Process ### (and move out of this file!!!please:))
     #    self.current_username = ""
@@ -253,12 +256,36 @@ class ModeController:
 
 
 
+    def get_current_mode(self) -> str:
+        return self._current_mode
+
+
     def get_mode_name(self, name: str):
         if name in self._mappings:
             return self._mappings[name]
         return name
 
 
+    def _get_next_modes(self) -> Set[str]:
+        """Predicts the modes that can be switched to from the current mode.
+        (the next mode in the iteration order and the modes that the events of the current mode change to)
+        """
+        next_modes = self._event_mapper.get_mode_change_targets(self._modes[self._current_mode])
+        if self._current_mode in self._iteration_order:
+            next_mode = self._iteration_order[self._current_mode]
+            if JOYPAD_ENABLED_FLAG == False and next_mode == "joystick":
+                next_mode = self._iteration_order[next_mode]
+            next_modes.add(next_mode)
+        return {mode for mode in next_modes if mode in self._modes and mode != self._current_mode}
+
+
+    def _warm_up_next_modes(self) -> None:
+        events = set()
+        for mode in self._get_next_modes():
+            events.update(self._modes[mode])
+        self._event_mapper.warm_up_events(self._model, events)
+
+
     def set_next_mode(self, mode: Optional[str] = None) -> None:
         """set the interaction mode that the model will be set to from the next frame. 
         (next time the change_mode_if_needed() is called)
@@ -287,6 +314,8 @@ class ModeController:
         events_to_add = new_events - current_events
         self._event_mapper.switch_events_in_model(self._model, events_to_remove, events_to_add)
         self._current_mode = self._next_mode
+        self._update_speech_grammar()
+        self._warm_up_next_modes()
         if "idle" not in self._current_mode:
             self._mode_editor.update("current_mode", self._current_mode)
             self._mode_editor.save()
@@ -295,10 +324,24 @@ class ModeController:
             self._view.update_display_element("active_mode_name", {"name": self.get_mode_name(self._current_mode)})
 
 
+    def _update_speech_grammar(self) -> None:
+        """Restricts the speech recognition to the speech commands of the current mode,
+        unless the mode is set to use the open vocabulary in the mode_controller JSON"""
+        speech_module = self._model.get_module("speech")
+        if speech_module is not None:
+            speech_module.set_command_grammar(self._current_mode not in self._open_vocabulary_modes)
+
+
+    def end_frame(self) -> None:
+        """Lets the event handlers send the input batched over the frame"""
+        self._event_handlers.end_frame()
+
     def close(self) -> None:
         """
         Close MI
         """
         events_to_remove = self._modes[self._current_mode]
         self._event_mapper.switch_events_in_model(self._model, events_to_remove, {})
+        self._event_handlers.end_frame()  # send the releases of the removed events
+        self._event_mapper.close()
 
@@ -0,0 +1,81 @@
+'''
+Builds the modules that the next modes will need on a background thread,
+so that a mode switch only swaps in already built modules instead of
+constructing the landmark detectors (and loading their ML models) on the frame thread.
+'''
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Optional, Set, Type
+
+from scripts.core.module import Module
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+
+class ModuleWarmUp:
+    def __init__(self, modules: Dict[str, Type[Module]]) -> None:
+        """
+        :param modules: names of the modules mapped to the module classes
+        :type modules: Dict[str, Type[Module]]
+        """
+        self._modules = modules
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Module warm-up")
+        self._lock = Lock()
+        self._built = {}  # dict: module name -> Module instance that has not been taken yet
+        self._pending = {}  # dict: module name -> Future of the module being built
+
+    def warm_up(self, module_names: Set[str]) -> None:
+        """Queues building of the given modules on the worker thread.
+        Modules that are already built or being built are skipped.
+
+        :param module_names: names of the modules to build
+        :type module_names: Set[str]
+        """
+        with self._lock:
+            for name in module_names:
+                if name in self._built or name in self._pending:
+                    continue
+                self._pending[name] = self._executor.submit(self._build, name)
+
+    def take(self, module_name: str) -> Optional[Module]:
+        """Returns the pre-built instance of the module, if there is one.
+        If the module is being built, waits for it as that is still faster than starting over.
+        If its build has not started yet (it is queued behind other modules), the build is cancelled
+        and None is returned, so that the module is built right away by the caller.
+
+        :param module_name: name of the module
+        :type module_name: str
+        :return: the built module or None if the module has not been warmed up
+        :rtype: Optional[Module]
+        """
+        with self._lock:
+            future = self._pending.get(module_name)
+            if future is not None and future.cancel():
+                del self._pending[module_name]
+                return None
+        if future is not None:
+            future.result()
+        with self._lock:
+            return self._built.pop(module_name, None)
+
+    def close(self) -> None:
+        """Stops the worker thread and drops all the modules that were not taken"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._built.clear()
+            self._pending.clear()
+
+    def _build(self, module_name: str) -> None:
+        module_class = self._modules[module_name]
+        module = None
+        try:
+            if module_class.can_be_prebuilt():
+                module = module_class()
+            else:
+                module_class.pre_initialize()
+        except Exception as error:
+            log.error(f"Warm up of the {module_name} module failed: {error}")
+        with self._lock:
+            self._pending.pop(module_name, None)
+            if module is not None:
+                self._built[module_name] = module
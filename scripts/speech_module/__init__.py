@@ -1,6 +1,11 @@
 '''
 Authors: Samuel Emilolorun
 '''
+from typing import Set
+
+import numpy as np
+
+from scripts.core import Gesture, Primitive, RawData
 from scripts.core.module import Module
 from scripts.speech_module.kita import KITA
 from scripts.speech_module.speech_gesture import SpeechGesture
@@ -14,6 +19,40 @@ class SpeechModule(Module):
     _landmark_detector_class = SpeechLandmarkDetector
 
     _tracker_names = {"speech"}
+    _can_be_prebuilt = False  # the landmark detector starts recording audio on initialization
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._used_phrases_changed = True
+
+    def update_and_get_activated_gestures(self, frame_data: RawData, image: np.ndarray) -> Set[Gesture]:
+        """Same as for the other modules, but driven by KITA instead of the video frames: the position is only
+        recalculated when KITA has a new phrase (or the used phrases changed). Otherwise none of the primitives
+        can have changed, so nothing is done."""
+        if not self._active:
+            return set()
+        if not self._used_phrases_changed and not self._landmark_detector.has_new_phrase():
+            return set()
+        self._used_phrases_changed = False
+        return super().update_and_get_activated_gestures(frame_data, image)
+
+    def add_gesture(self, gesture_name: str, primitives: Set[Primitive]) -> None:
+        super().add_gesture(gesture_name, primitives)
+        self._used_phrases_changed = True
+
+    def remove_gesture(self, gesture_name: str) -> None:
+        super().remove_gesture(gesture_name)
+        self._used_phrases_changed = True
+
+    def set_command_grammar(self, enabled: bool) -> None:
+        """Restricts KITA to recognising the phrases used by the speech gestures of the module (or lifts the restriction)
+
+        :param enabled: if only the used phrases should be recognised
+        :type enabled: bool
+        """
+        kita = SpeechModule._landmark_detector_class.kita
+        if kita is not None:
+            kita.set_command_phrases(self.get_currently_used_primitives() if enabled else None)
 
     def reset(self) -> None:
         """Resets all position trackers"""
@@ -0,0 +1,142 @@
+'''
+Audio front end of KITA.
+A bounded buffer of the microphone blocks between the sounddevice callback and the recogniser,
+an energy based voice activity gate and the recognition latency metrics.
+'''
+from collections import deque
+from threading import Condition, Lock
+from time import perf_counter
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+
+class AudioBlock(NamedTuple):
+    data: bytes
+    time: float  # perf_counter when the block was received
+    duration: float  # seconds of audio in the block
+    speech: bool  # if the voice activity gate is open for the block
+
+
+class EnergyVAD:
+    """
+    Marks a block as speech if the RMS of its int16 samples is above the threshold.
+    The gate stays open for hangover seconds after the last loud block, so that
+    the recogniser still hears the silence it needs to end the utterance.
+    A threshold of 0 lets everything through.
+    """
+
+    def __init__(self, threshold: float = 300, hangover: float = 1.0) -> None:
+        self._threshold = threshold
+        self._hangover = hangover
+        self._open_for = 0.0
+        self.last_speech_time = None  # time of the last loud block, i.e. the end of the speech once it goes quiet
+
+    def is_speech(self, data: bytes, duration: float, time: Optional[float] = None) -> bool:
+        if self._threshold <= 0:
+            return True
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples)) if samples.size else 0.0
+        if rms >= self._threshold:
+            self._open_for = self._hangover
+            self.last_speech_time = perf_counter() if time is None else time
+            return True
+        if self._open_for > 0:
+            self._open_for -= duration
+            return True
+        return False
+
+
+class AudioBuffer:
+    """
+    Bounded FIFO of audio blocks. When it is full the "drop_oldest" policy drops the oldest block,
+    "drop_silence" drops the oldest silent block first and the oldest block only if all are speech.
+    """
+    POLICIES = ("drop_oldest", "drop_silence")
+
+    def __init__(self, max_blocks: int = 50, policy: str = "drop_oldest") -> None:
+        if policy not in self.POLICIES:
+            raise RuntimeError("Unknown audio buffer policy: " + policy)
+        self._max_blocks = max(1, max_blocks)
+        self._policy = policy
+        self._blocks = deque()
+        self._condition = Condition()
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, block: AudioBlock) -> None:
+        with self._condition:
+            if len(self._blocks) >= self._max_blocks:
+                self._drop()
+            self._blocks.append(block)
+            self.max_depth = max(self.max_depth, len(self._blocks))
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[AudioBlock]:
+        """Returns the oldest block, waiting for one at most timeout seconds. None if there was none."""
+        with self._condition:
+            if not self._blocks:
+                self._condition.wait(timeout)
+                if not self._blocks:
+                    return None
+            return self._blocks.popleft()
+
+    def clear(self) -> None:
+        with self._condition:
+            self._blocks.clear()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        if self._policy == "drop_silence":
+            for i, block in enumerate(self._blocks):
+                if not block.speech:
+                    del self._blocks[i]
+                    return
+        self._blocks.popleft()
+
+
+class RecognitionMetrics:
+    """
+    Real time factor of the recogniser (processing time / audio duration of the recognised blocks)
+    and the latency between the end of the speech and the final phrase.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.recognised_blocks = 0
+        self.skipped_blocks = 0  # silent blocks not passed to the recogniser
+        self._audio_time = 0.0
+        self._processing_time = 0.0
+        self._phrases = 0
+        self._latency_sum = 0.0
+        self._max_latency = 0.0
+
+    def record_block(self, block: AudioBlock, processing_time: float) -> None:
+        with self._lock:
+            self.recognised_blocks += 1
+            self._audio_time += block.duration
+            self._processing_time += processing_time
+
+    def record_skipped(self) -> None:
+        with self._lock:
+            self.skipped_blocks += 1
+
+    def record_phrase(self, latency: float) -> None:
+        with self._lock:
+            self._phrases += 1
+            self._latency_sum += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def get(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "recognised_blocks": self.recognised_blocks,
+                "skipped_blocks": self.skipped_blocks,
+                "real_time_factor": self._processing_time / self._audio_time if self._audio_time else 0.0,
+                "phrases": self._phrases,
+                "avg_phrase_latency": self._latency_sum / self._phrases if self._phrases else 0.0,
+                "max_phrase_latency": self._max_latency
+            }
@@ -5,15 +5,15 @@ Vosk Speech Recognition Model
 v3.1: Speaker Identification Model addition
 '''
 # Logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set, Tuple
 from scripts.tools.logger import get_logger
 log = get_logger(__name__)
 # Standard 
 import json
 import os
 import sys
-import queue
-from threading import Thread, Event, RLock
+from threading import Thread, Event, Lock, RLock
+from time import perf_counter
 # Third party 
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer, SpkModel, SetLogLevel
@@ -22,7 +22,9 @@ import pyautogui
 # Local 
 from scripts.tools import Config
 from scripts.tools.utils import Utils as u
+from scripts.speech_module.audio_frontend import AudioBlock, AudioBuffer, EnergyVAD, RecognitionMetrics
 from scripts.speech_module.kita_speaker_process import SPKProcess
+from scripts.speech_module.speaker_verifier import SpeakerVerifier
 #from scripts.speech_module.kita_custom_hotkeys_process import HotkeysProcess
 
 
@@ -69,22 +71,40 @@ class KITA(Thread):
                 cls.speech_enabled = Config().get_data("modules/speech/enabled")
                 # KITA
                 cls.pause_flag = Event()
-                cls.q = queue.Queue()
                 cls.editor = cls.config.get_editor()
+                # Audio front end (bounded buffer of audio blocks, voice activity gate, metrics)
+                audio_settings = cls.config.get_data("modules/speech/audio")
+                cls.block_duration = audio_settings["block_duration"]
+                cls.audio = AudioBuffer(int(audio_settings["buffer_duration"] / cls.block_duration), audio_settings["drop_policy"])
+                cls.vad = EnergyVAD(audio_settings["vad_threshold"], audio_settings["vad_hangover"])
+                cls.metrics = RecognitionMetrics()
+                cls._last_partial = None # last PartialResult() string and its parsed dict, partials repeat a lot
+                cls._last_partial_dict = {"partial": ""}
                 # Audio
                 device_info = sd.query_devices(kind='input') # All available devices
                 cls.samplerate = int(device_info['default_samplerate']) # Selected device info
                 # Vosk 
-                model = Model(VOSK_PATH) # Speech recognition model
-                cls.recogniser = KaldiRecognizer(model, cls.samplerate) # Recogniser (Kaldi does the actual speech-to-text conversion)
+                cls.vosk_model = Model(VOSK_PATH) # Speech recognition model
+                cls.full_recogniser = KaldiRecognizer(cls.vosk_model, cls.samplerate) # Recogniser (Kaldi does the actual speech-to-text conversion)
+                cls.recogniser = cls.full_recogniser # recogniser in use, the full one or the command one
+                # Command recogniser - restricted to the phrases of the speech commands of the current mode
+                cls.command_grammar_enabled = cls.config.get_data("modules/speech/command_grammar")
+                cls.command_recogniser = None
+                cls._command_phrases = None # phrases for the next command recogniser
+                cls._command_phrases_changed = False
                 # Speech commands
-                cls.current_phrase = "" # Current transcribed text 
+                cls._current_phrase = "" # Current transcribed text (current_phrase)
+                cls.phrase_seq = 0 # increases whenever the current phrase changes
+                cls._phrase_lock = Lock()
                 cls.keyboard = None # Keyboard (for Transcription)
                 ### SPK (Speaker Identification) - Model ###
                 cls.spk = SPKProcess() # spk management class
+                cls.verifier = SpeakerVerifier(cls.spk) # runs the SPKID Process off the KITA thread
+                cls.stream_starts = 0 # audio stream (re)openings
+                cls.spk_model = None
                 if cls.spk.is_spk_enabled():
-                    spk_model = SpkModel(SPEAKER_MODEL_PATH) 
-                    cls.recogniser.SetSpkModel(spk_model) # attaches itself to the recogniser; generates spk vector to Result['text'] - cannot be done once KITA is running
+                    cls.spk_model = SpkModel(SPEAKER_MODEL_PATH) 
+                    cls.recogniser.SetSpkModel(cls.spk_model) # attaches itself to the recogniser; generates spk vector to Result['text'] - cannot be done once KITA is running
             return cls._instance
 
 
@@ -113,7 +133,15 @@ class KITA(Thread):
         """
         Speaker Recognition, Speech Commands, Transcription, Speaker Identification, Custom Hotkeys
         """
+        # Phrases held until their speaker was verified (Speaker Identification)
+        verified_phrases = self.verifier.pop_verified()
+        if verified_phrases:
+            for verified_data in verified_phrases:
+                self.use_phrase(verified_data)
+            return # the next audio block is recognised on the next iteration
         json_data = self._get_current_phrase_dict() 
+        if json_data is None: # no audio
+            return
         ## Special case
         # Allows 'stop speaker identify' speech command even if MI is locked to a different speaker
         # The speech command method handles the rest
@@ -129,9 +157,10 @@ class KITA(Thread):
                     return
         # Speaker Identification Process
         if self.spk.is_spk_enabled() and self.spk.is_spk_on() and "spk" in json_data:
-            self._stop_audio_recording() # Pause audio buffer and KITA
-            self.spk.speaker_identification_action(json_data) # SPKID Process
-            self._start_audio_recording()# Unpause audio buffer and KITA
+            # SPKID Process runs on the verifier thread while the audio keeps being recognised,
+            # the phrase is used once its speaker is verified
+            self.verifier.submit(json_data)
+            return
         # Speech Commands and Transcription
         self.regular_action(json_data)
 
@@ -147,7 +176,14 @@ class KITA(Thread):
         if self.spk.is_spk_enabled() and self.spk.is_spk_on() and not self.spk.is_spk_verified():
             # Verification ( == True if authorised speaker or Spk process is OFF => verified by default)
                 return
+        self.use_phrase(json_data)
+
 
+
+    def use_phrase(self, json_data : Dict[str, Any]) -> None:
+        """
+        Sets up self.current_phrase of an authorised speaker and types it if Transcription is ON.
+        """
         # Autorised Speech commands on partial
         if 'partial' in json_data:
             self.current_phrase = json_data['partial']
@@ -185,7 +221,7 @@ class KITA(Thread):
         Used for audio buffer management - start speaker recognition audio stream.
         """
         try: 
-            self.ris =  sd.RawInputStream(samplerate=self.samplerate, blocksize=8000,
+            self.ris =  sd.RawInputStream(samplerate=self.samplerate, blocksize=int(self.samplerate * self.block_duration),
                                         device=None, dtype='int16', 
                                         channels=1, callback=self._callback)
         except Exception as e:
@@ -194,6 +230,7 @@ class KITA(Thread):
         else:
             #self.recogniser.Reset()
             self.ris.start()
+            self.stream_starts += 1
             sys.stdout.flush()
 
 
@@ -222,7 +259,10 @@ class KITA(Thread):
         if status:
             print(status, file=sys.stderr)
             sys.stdout.flush()
-        self.q.put(bytes(indata))
+        data = bytes(indata)
+        now = perf_counter()
+        duration = frames / self.samplerate
+        self.audio.put(AudioBlock(data, now, duration, self.vad.is_speech(data, duration, now)))
 
 
 
@@ -232,17 +272,118 @@ class KITA(Thread):
         It checks if the complete Result() is ready to return. Meanwhile it keeps returning the 
         PartialResult(). Partials are used for speedy Speech commands execution. 
         Complete results are used during Transcription, Correction and Speaker Identification.
+        Silent blocks are not recognised at all, they give the same empty partial the recogniser would.
+        Returns None if no audio came in for a while.
         """
-        json_data = {}
-        audio = self.q.get() # queue to get the transcribed audio data from user microphone
+        block = self.audio.get(timeout=0.5) # buffer with the audio data from user microphone
+        if block is None:
+            return None
+        self._select_recogniser()
+        if not block.speech:
+            self.metrics.record_skipped()
+            return {"partial": ""}
+        start = perf_counter()
         # Speaker vector (ID/Voice print) is only generated on 'text' Result()
-        if self.recogniser.AcceptWaveform(audio): # process the audio data; convert speech-to-text
+        if self.recogniser.AcceptWaveform(block.data): # process the audio data; convert speech-to-text
             json_data = json.loads(self.recogniser.Result()) # Vosk returns a json object by default
+            if json_data.get("text") and self.vad.last_speech_time is not None:
+                self.metrics.record_phrase(perf_counter() - self.vad.last_speech_time)
         else:
-            json_data = json.loads(self.recogniser.PartialResult())
+            partial = self.recogniser.PartialResult()
+            if partial != self._last_partial:
+                self._last_partial = partial
+                self._last_partial_dict = json.loads(partial)
+            json_data = self._last_partial_dict
+        self.metrics.record_block(block, perf_counter() - start)
         return json_data
 
 
+    def set_command_phrases(self, phrases: Optional[Set[str]]) -> None:
+        """
+        Sets the phrases of the speech commands of the current mode. While there is no
+        Transcription (or Correction) or Speaker Identification, only these phrases are recognised.
+        None (or no phrases) lets the full vocabulary be recognised. The recogniser itself is 
+        rebuilt on the KITA thread before the next audio block.
+        """
+        with lock:
+            if not self.command_grammar_enabled:
+                return
+            self._command_phrases = frozenset(phrases) if phrases else None
+            self._command_phrases_changed = True
+
+
+    def _select_recogniser(self) -> None:
+        """
+        Rebuilds the command recogniser if the phrases changed, then picks the recogniser
+        for the next audio block. The full one is needed for Transcription (Correction mode only 
+        runs with it) and the Speaker Identification process.
+        """
+        with lock:
+            if self._command_phrases_changed:
+                self._command_phrases_changed = False
+                self.command_recogniser = self._build_command_recogniser(self._command_phrases)
+        if self.command_recogniser is not None and self.keyboard is None and not self.spk.is_spk_on():
+            recogniser = self.command_recogniser
+        else:
+            recogniser = self.full_recogniser
+        if recogniser is not self.recogniser:
+            recogniser.Reset()
+            self.recogniser = recogniser
+            self._last_partial = None
+
+
+    def _build_command_recogniser(self, phrases: Optional[frozenset]) -> Optional[KaldiRecognizer]:
+        if phrases is None:
+            return None
+        grammar = json.dumps(sorted(phrases) + ["[unk]"]) # [unk] catches everything else that is said
+        recogniser = KaldiRecognizer(self.vosk_model, self.samplerate, grammar)
+        if self.spk_model is not None:
+            recogniser.SetSpkModel(self.spk_model) # speaker lock verification needs the spk vectors
+        log.info(f"<KITA> Command recogniser built for {len(phrases)} phrases")
+        return recogniser
+
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Audio buffer depth, dropped and skipped (silent) blocks, recogniser real time factor,
+        latency from the end of the speech to the final phrase, audio stream reopenings
+        and the Speaker Identification pending phrases and verification latency (in seconds).
+        """
+        metrics = self.metrics.get()
+        metrics["queue_depth"] = len(self.audio)
+        metrics["max_queue_depth"] = self.audio.max_depth
+        metrics["dropped_blocks"] = self.audio.dropped
+        metrics["stream_reopens"] = max(0, self.stream_starts - 1)
+        metrics.update(self.verifier.get_metrics())
+        return metrics
+
+
+    @property
+    def current_phrase(self) -> str:
+        """
+        Current transcribed text, read by speech_landmark_detector for Speech commands
+        """
+        return self._current_phrase
+
+
+    @current_phrase.setter
+    def current_phrase(self, phrase : str) -> None:
+        with self._phrase_lock:
+            if phrase != self._current_phrase:
+                self._current_phrase = phrase
+                self.phrase_seq += 1
+
+
+    def get_phrase(self) -> Tuple[int, str]:
+        """
+        Returns the sequence number of the current phrase together with the phrase.
+        The number only changes when the recogniser output changes the phrase, so 
+        the speech commands do not need to be checked again while it stays the same.
+        """
+        with self._phrase_lock:
+            return self.phrase_seq, self._current_phrase
+
+
     def set_transcription(self, keyboard_instance : None) -> None:
         """ 
         Ran via Transcription.py which passess a Keyboard class instance 
@@ -10,18 +10,16 @@ import string
 from scripts.tools.logger import get_logger
 log = get_logger(__name__)
 
-# Standard 
-import numpy as np
-
 # Third party
 import pyautogui
 from threading import RLock
-from typing import Any, Dict, List
+from typing import Any, Dict
 #from pydantic import BaseModel
 
 # Local
 from scripts.tools import Config
 from scripts.tools.json_editors.speakers_editor import SPKEditor
+from scripts.speech_module.speaker_index import SpeakerIndex
 
 # Global Lock
 lock = RLock()
@@ -31,6 +29,7 @@ class SPKProcess:
 
     def __init__(self):
         self.editor = SPKEditor()
+        self.index = SpeakerIndex(self.editor)
         self.config = Config()
         self.config_editor = self.config.get_editor()
         # Management variables (default values)
@@ -262,27 +261,24 @@ class SPKProcess:
         self.spk_current_id = ""
         self.spk_current_name = ""
         self.spk_current_username = ""
-        # Get latest DB data (otherwise newly added users are not recognised)
-        spk_data = self.get_speakers_data()
-        # DB match?
-        for spk_id, spk in spk_data.items():
-            spk_vector = spk["vector"]
-            average_distance = self.spk_cosine_distance(spk_vector)
-            # Yes (DB match)
-            if average_distance < self.spk_threshold:
-                is_spk_known = True
-                spk_matched = {
-                        spk_id : {
-                        "name": spk["name"],
-                        "username": spk["username"],
-                        "vector": spk_vector
-                            }
+        # Closest speaker in DB (the index is rebuilt when new users are added)
+        match = self.index.match(self.spk_current_vector, self.spk_threshold)
+        # Yes (DB match)
+        if match is not None:
+            is_spk_known = True
+            spk_id = match[0]
+            spk = self.get_speakers_data()[spk_id]
+            self.spk_current = {
+                    spk_id : {
+                    "name": spk["name"],
+                    "username": spk["username"],
+                    "vector": spk["vector"]
                         }
-                self.spk_current.update(spk_matched)
-                self.spk_current_id = spk_id
-                self.spk_current_name = spk["name"]
-                self.spk_current_username = spk["username"]
-                self.spk_current_vector = spk_vector
+                    }
+            self.spk_current_id = spk_id
+            self.spk_current_name = spk["name"]
+            self.spk_current_username = spk["username"]
+            self.spk_current_vector = spk["vector"]
         return is_spk_known
 
 
@@ -300,8 +296,8 @@ class SPKProcess:
             "username": self.spk_current_username,
             "vector": self.spk_current_vector
             }}
-        spk_data.update(new_spk)
-        self.editor.update_json(spk_data) # update JSON
+        # a new dict, the data read is shared with the other editors of the file until saved
+        self.editor.update_json({**spk_data, **new_spk}) # update JSON
 
 
 
@@ -366,19 +362,6 @@ class SPKProcess:
 
 
 
-    def spk_cosine_distance(self, db_vector : List[float]) -> float:
-        """
-        Calculates and returns the average distance between 
-        a vector from the DB and the newly generated vector.
-        """
-        #nx = np.array(eval(x))
-        nx = np.array(self.spk_current_vector)
-        ny = np.array(db_vector)
-        average_distance = 1 - np.dot(nx, ny) / np.linalg.norm(nx) / np.linalg.norm(ny)
-        return average_distance
-
-
-
     def spk_adjust_threshold(self, temp_current_phrase : str) -> None:
         """
         Set Speaker Acceptance Threshold based on the number of words in the current phrase.
@@ -0,0 +1,80 @@
+'''
+In-memory index of the x-vectors of the enrolled speakers.
+Used by SPKProcess to match the speaker of each utterance against
+all enrolled speakers with a single matrix-vector product.
+'''
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# Standard
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Local
+from scripts.tools.json_editors.speakers_editor import SPKEditor
+
+
+class SpeakerIndex:
+    """ Normalised (S, D) float32 matrix of the speaker vectors, rebuilt only when the speakers file is written """
+
+    def __init__(self, editor: SPKEditor):
+        self._editor = editor
+        self._version = None  # version of the editor the index was built from
+        self._ids = []  # speaker ID of each row of the matrix
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def match(self, vector: List[float], threshold: float) -> Optional[Tuple[str, float]]:
+        """
+        Returns the ID of the closest enrolled speaker and the cosine distance to it,
+        if the distance is below the threshold.
+        """
+        best = self.top_k(vector, 1)
+        if not best or best[0][1] >= threshold:
+            return None
+        return best[0]
+
+    def top_k(self, vector: List[float], k: int) -> List[Tuple[str, float]]:
+        """
+        Returns the IDs of the k closest enrolled speakers
+        and their cosine distances, closest first.
+        """
+        self._refresh_if_needed()
+        distances = self._distances(vector)
+        if distances is None:
+            return []
+        k = min(k, len(distances))
+        closest = np.argpartition(distances, k - 1)[:k]
+        closest = closest[np.argsort(distances[closest])]
+        return [(self._ids[i], float(distances[i])) for i in closest]
+
+    def _distances(self, vector: List[float]) -> Optional[np.ndarray]:
+        if len(self._ids) == 0:
+            return None
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self._matrix.shape[1],):
+            log.warning(f"Speaker vector of size {query.size} does not match the enrolled vectors of size {self._matrix.shape[1]}")
+            return None
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        return 1 - self._matrix @ (query / norm)
+
+    def _refresh_if_needed(self) -> None:
+        if self._version != self._editor.version:
+            self._build(self._editor.get_all_data())
+            self._version = self._editor.version
+
+    def _build(self, spk_data: Dict[str, Any]) -> None:
+        ids, vectors = [], []
+        for spk_id, spk in spk_data.items():
+            if vectors and len(spk["vector"]) != len(vectors[0]):
+                log.warning(f"Speaker {spk_id} skipped: vector size {len(spk['vector'])} differs from {len(vectors[0])}")
+                continue
+            ids.append(spk_id)
+            vectors.append(spk["vector"])
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1  # zero vectors stay zero and so never match
+        self._ids = ids
+        self._matrix = matrix / norms
@@ -0,0 +1,105 @@
+'''
+Runs the Speaker Identification of the final phrases on its own thread,
+so that KITA keeps recording and recognising in the meantime.
+The phrases wait in a short pending buffer until their speaker is verified.
+'''
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# Standard
+from collections import deque
+from threading import Condition, Thread
+from time import perf_counter
+from typing import Any, Dict, List
+
+
+class SpeakerVerifier:
+    """ Speaker verification worker """
+
+    def __init__(self, spk, max_pending: int = 5, pending_timeout: float = 3.0):
+        self._spk = spk # SPKProcess
+        self._max_pending = max_pending
+        self._pending_timeout = pending_timeout # seconds a phrase waits for its verification before being dropped
+        self._condition = Condition()
+        self._pending = deque() # [submit time, json_data, verified (None until resolved)] in the order of the phrases
+        self._work = deque() # pending entries not verified yet
+        self._thread = None
+        # Metrics
+        self.dropped = 0
+        self._verified_count = 0
+        self._latency_sum = 0.0
+        self._max_latency = 0.0
+
+
+
+    def submit(self, json_data: Dict[str, Any]) -> None:
+        """
+        Holds the final phrase (with its 'spk' vector) until the speaker is verified.
+        """
+        with self._condition:
+            if len(self._pending) >= self._max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            entry = [perf_counter(), json_data, None]
+            self._pending.append(entry)
+            self._work.append(entry)
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True, name="Thread KITA SPK")
+                self._thread.start()
+
+
+
+    def pop_verified(self) -> List[Dict[str, Any]]:
+        """
+        Returns the phrases of the verified speakers whose turn has come, in order.
+        Phrases of unverified speakers and phrases that waited too long are dropped.
+        """
+        verified = []
+        now = perf_counter()
+        with self._condition:
+            while self._pending:
+                submitted, json_data, is_verified = self._pending[0]
+                if is_verified is None:
+                    if now - submitted <= self._pending_timeout:
+                        break # keeps the order: later phrases wait for this one
+                    self.dropped += 1
+                elif is_verified:
+                    verified.append(json_data)
+                self._pending.popleft()
+        return verified
+
+
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "pending_phrases": len(self._pending),
+                "dropped_phrases": self.dropped,
+                "verifications": self._verified_count,
+                "avg_verification_latency": self._latency_sum / self._verified_count if self._verified_count else 0.0,
+                "max_verification_latency": self._max_latency
+            }
+
+
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._work:
+                    self._condition.wait()
+                entry = self._work.popleft()
+                if not any(pending is entry for pending in self._pending):
+                    continue # dropped while waiting (e.g. during a popup), its vector is stale
+            try:
+                self._spk.speaker_identification_action(entry[1]) # SPKID Process (may ask the user with popups)
+                is_verified = self._spk.is_spk_verified()
+            except Exception as e:
+                log.error(f"<KITA> Speaker verification failed: {e}")
+                is_verified = False
+            latency = perf_counter() - entry[0]
+            with self._condition:
+                entry[2] = is_verified
+                self._verified_count += 1
+                self._latency_sum += latency
+                self._max_latency = max(self._max_latency, latency)
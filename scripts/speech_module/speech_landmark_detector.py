@@ -14,6 +14,7 @@ class SpeechLandmarkDetector(LandmarkDetector):
 
     def __init__(self) -> None:
         self._active = Config().get_data("modules/speech/enabled")  # read enabled value
+        self._phrase_seq = None  # sequence number of the phrase last added to the RawData
         print("Speech Active: ", self._active)
         try:
             SpeechLandmarkDetector.kita = KITA()
@@ -33,9 +34,19 @@ class SpeechLandmarkDetector(LandmarkDetector):
         """
 
         if not self._active:
+            self._phrase_seq = 0
             raw_data.add_landmark(bodypart_name="speech", landmark_name="", coordinates=None)
             return
 
-        current_phrase = SpeechLandmarkDetector.kita.current_phrase
+        self._phrase_seq, current_phrase = SpeechLandmarkDetector.kita.get_phrase()
         
         raw_data.add_landmark(bodypart_name="speech", landmark_name=current_phrase, coordinates=None)
+
+    def has_new_phrase(self) -> bool:
+        """
+        :return: if KITA has a different phrase than the one added to the RawData by the last get_raw_data call
+        :rtype: bool
+        """
+        if not self._active:
+            return self._phrase_seq is None
+        return SpeechLandmarkDetector.kita.phrase_seq != self._phrase_seq
@@ -1,8 +1,14 @@
-from .camera import Camera
-from .config import Config
-from .json_editors.config_editor import ConfigEditor
-from .json_editors.event_editor import EventEditor
-from .json_editors.gesture_editor import GestureEditor
-from .json_editors.mode_editor import ModeEditor
-from .view import View
+from .lazy_import import lazy_attributes
 
+# the tools are only imported when first accessed, so that e.g. "from scripts.tools import Config"
+# does not import OpenCV for the View and the Camera
+__all__ = ["Camera", "Config", "ConfigEditor", "EventEditor", "GestureEditor", "ModeEditor", "View"]
+__getattr__ = lazy_attributes(__name__, {
+    "Camera": ".camera",
+    "Config": ".config",
+    "ConfigEditor": ".json_editors.config_editor",
+    "EventEditor": ".json_editors.event_editor",
+    "GestureEditor": ".json_editors.gesture_editor",
+    "ModeEditor": ".json_editors.mode_editor",
+    "View": ".view"
+})
@@ -1,11 +1,15 @@
 import json
 import math
 import os
+from queue import Queue, Full
+from threading import Event, Thread
+from typing import Callable, Iterator, Optional
 
 import cv2
 import numpy as np
 
 from scripts import RawData, HandPosition, HandLandmarkDetector, BodyLandmarkDetector
+from scripts.tools import Config
 
 
 class CustomizeGestureRecorder:
@@ -45,7 +49,10 @@ class CustomizeGestureRecorder:
         self.bodypart_name = None
         self.camera_w_h_ratio = 0
         self.fps = 0
+        # per body part the primitives of each frame: 1 (True), 0 (False) or -1 (not calculated)
         self.hand_position_features = dict()
+        self.primitive_names = dict()  # per body part the names of the primitives in the arrays above
+        self._frames_read = 0  # frames of the video read by the decoder thread
 
     def set_recorder(self, gesture_type, bodypart_name, gesture_editor, mode_editor, event_editor):
         self.gesture_editor = gesture_editor
@@ -60,11 +67,11 @@ class CustomizeGestureRecorder:
 
         if bodypart_name == 'Both':
             self.body_part_name_list = ['Left', 'Right']
-            self.hand_position_features['Left'] = []
-            self.hand_position_features['Right'] = []
         else:
             self.body_part_name_list = [bodypart_name]
-            self.hand_position_features[bodypart_name] = []
+        self.gesture_sequence = []
+        self.hand_position_features = {name: [] for name in self.body_part_name_list}
+        self.primitive_names = dict()
 
     def get_static_gesture(self, angle_change_flag):
         """ Get static gesture (configuration of the fingers) from the gesture sequence.
@@ -72,29 +79,75 @@ class CustomizeGestureRecorder:
         """
         static_gesture = dict()
         for name in self.body_part_name_list:
-            gesture_features = self.hand_position_features[name]
-            benchmark_gesture = gesture_features[0]
-            primitive_names = list(benchmark_gesture.get_primitives_names())
+            gesture_features = np.array(self.hand_position_features[name])  # (frames, primitives)
+            # the primitives that kept the state of the first frame through the whole sequence
+            kept = (gesture_features == gesture_features[0]).all(axis=0)
             benchmark_dict = dict()
-            for primitive_name in primitive_names:
-                benchmark_dict[primitive_name] = bool(benchmark_gesture.get_primitive(primitive_name))
-            if angle_change_flag:
-                primitive_names.remove('palm_facing_camera')
-                if benchmark_dict.get('palm_facing_camera', None) is not None:
-                    benchmark_dict.pop('palm_facing_camera')
-            for i in range(1, len(gesture_features)):
-                for primitive_name in primitive_names:
-                    if benchmark_gesture.get_primitive(primitive_name) != \
-                            gesture_features[i].get_primitive(primitive_name) \
-                            and benchmark_dict.get(primitive_name, None) is not None:
-                        benchmark_dict.pop(primitive_name)
+            for i, primitive_name in enumerate(self.primitive_names[name]):
+                if angle_change_flag and primitive_name == 'palm_facing_camera':
+                    continue
+                if kept[i]:
+                    benchmark_dict[primitive_name] = bool(gesture_features[0][i] == 1)
             static_gesture[name] = benchmark_dict
         # print(static_gesture)
         return static_gesture
 
+    def _get_primitive_array(self, name, hand_position):
+        """the primitives of the position as a compact array, in the order of the first position of the body part"""
+        if name not in self.primitive_names:
+            self.primitive_names[name] = list(hand_position.get_primitives_names())
+        primitives = [hand_position.get_primitive(primitive_name) for primitive_name in self.primitive_names[name]]
+        return np.array([-1 if primitive is None else int(primitive) for primitive in primitives], dtype=np.int8)
+
+    def _read_frames(self, video_capture, stride: int, decode_ahead: int) -> Iterator[np.ndarray]:
+        """Yields every stride-th frame of the video, flipped. The frames are decoded on another thread, at most
+        decode_ahead frames ahead of the detection. The skipped frames are only grabbed, not decoded.
+        self._frames_read counts all the frames of the video read so far.
+        """
+        frames = Queue(maxsize=max(1, decode_ahead))
+        stop = Event()
+        self._frames_read = 0
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    return
+                except Full:
+                    pass
+
+        def decode():
+            try:
+                while not stop.is_set():
+                    if self._frames_read % stride == 0:
+                        ret, frame = video_capture.read()
+                        if not ret:
+                            break
+                        self._frames_read += 1
+                        put(cv2.flip(frame, 1))
+                    else:
+                        if not video_capture.grab():
+                            break
+                        self._frames_read += 1
+            finally:
+                put(None)
+
+        decoder = Thread(target=decode, daemon=True, name="Thread gesture recorder decoder")
+        decoder.start()
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            stop.set()
+            decoder.join()
+
     def record_gesture_from_file(self, file_path, gesture_type, bodypart_name, gesture_tag, angle_change_flag,
                                  phrase, attention_point, mouse_and_key_event,
-                                 gesture_editor, mode_editor, event_editor):
+                                 gesture_editor, mode_editor, event_editor,
+                                 progress_callback: Optional[Callable[[int, int], None]] = None):
         """process a vid file into gesture
         :param file_path:
         :param gesture_type: hand or body
@@ -107,51 +160,57 @@ class CustomizeGestureRecorder:
         :param gesture_editor: gesture editor from motioninput.api
         :param mode_editor: mode editor from motioninput.api
         :param event_editor: event editor from motioninput.api
+        :param progress_callback: called with the number of frames read and the number of frames in the video
         """
-        # from local MP4 to trace data
+        config = Config()
+        stride = max(1, config.get_data("customize_gestures/frame_stride"))
+        decode_ahead = config.get_data("customize_gestures/decode_ahead")
+        # from local MP4 to trace data, frame by frame
         videoCapture = cv2.VideoCapture(file_path)
         fps = videoCapture.get(cv2.CAP_PROP_FPS)
         self.fps = int(fps)
         self.camera_w_h_ratio = float(
             videoCapture.get(cv2.CAP_PROP_FRAME_WIDTH) / videoCapture.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        ret, frame = videoCapture.read()
-        frame_sequence = []
-        while ret:
-            image = cv2.flip(frame, 1)
-            # image = frame
-            frame_sequence.append(image)
-            ret, frame = videoCapture.read()
-        videoCapture.release()
+        total_frames = int(videoCapture.get(cv2.CAP_PROP_FRAME_COUNT))
         self.set_recorder(gesture_type, bodypart_name, gesture_editor, mode_editor, event_editor)
         hand_loss_count = 0
-        frame_count = len(frame_sequence)
+        processed_count = 0
         last_landmarks = dict()
-        for frame in frame_sequence:
-            frame_data = RawData()
-            self.landmark_detector.get_raw_data(frame_data, frame)
-            gesture_landmark_record = dict()
-            loss_flag = False
-            for name in self.body_part_name_list:
-                detected_body_part = frame_data.get_data(name)
-                if detected_body_part is None:
-                    hand_loss_count += 1
-                    # if Mediapipe get no hand data
-                    temp_last_landmarks = last_landmarks.get(name, None)
-                    if temp_last_landmarks is None:
-                        loss_flag = True
-                        break
-                    else:
-                        detected_body_part = temp_last_landmarks
-                gesture_landmark_record[name] = dict()
-                for k in detected_body_part.keys():
-                    coordinates = detected_body_part[k]
-                    gesture_landmark_record[name][k] = coordinates
-                hand_position = HandPosition(detected_body_part)
-                self.hand_position_features[name].append(hand_position)
-                last_landmarks[name] = detected_body_part
-            if not loss_flag:
-                self.gesture_sequence.append(gesture_landmark_record)
-        loss_rate = float(hand_loss_count / frame_count)
+        try:
+            for frame in self._read_frames(videoCapture, stride, decode_ahead):
+                processed_count += 1
+                frame_data = RawData()
+                self.landmark_detector.get_raw_data(frame_data, frame)
+                gesture_landmark_record = dict()
+                loss_flag = False
+                for name in self.body_part_name_list:
+                    detected_body_part = frame_data.get_data(name)
+                    if detected_body_part is None:
+                        hand_loss_count += 1
+                        # if Mediapipe get no hand data
+                        temp_last_landmarks = last_landmarks.get(name, None)
+                        if temp_last_landmarks is None:
+                            loss_flag = True
+                            break
+                        else:
+                            detected_body_part = temp_last_landmarks
+                    gesture_landmark_record[name] = detected_body_part
+                    if detected_body_part is not last_landmarks.get(name, None):
+                        primitives = self._get_primitive_array(name, HandPosition(detected_body_part))
+                    else:  # same landmarks as the last frame
+                        primitives = self.hand_position_features[name][-1]
+                    self.hand_position_features[name].append(primitives)
+                    last_landmarks[name] = detected_body_part
+                if not loss_flag:
+                    self.gesture_sequence.append(gesture_landmark_record)
+                if progress_callback is not None:
+                    progress_callback(self._frames_read, max(total_frames, self._frames_read))
+        finally:
+            videoCapture.release()
+        frame_count = self._frames_read
+        if processed_count == 0:
+            raise Exception("RECORD ERROR: The recorded video could not be read!")
+        loss_rate = float(hand_loss_count / processed_count)
         if loss_rate > 0.5:
             raise Exception("RECORD ERROR: You have to record the gesture again as MediaPipe cannot detect your hand!")
         static_gesture = self.get_static_gesture(angle_change_flag)
@@ -360,13 +419,12 @@ class CustomizeGestureRecorder:
             self.mode_editor.update("modes/{}".format(self.mode_name), save_json)
         self.mode_editor.save()
 
-        events = self.event_editor.get_all_data()
         event_dict = self.create_customized_gesture_event(gesture_tag, frame_count, phrase, attention_point,
                                                           mouse_and_key_event)
         event_json = json.dumps(event_dict)
         self.event_editor.add("", event_json)
-        events[gesture_tag] = event_dict
-        if events.get(speech_event_name, None) is None:
+        # read after the add, the data returned is shared with the other editors so it is not changed here
+        if self.event_editor.get_all_data().get(speech_event_name, None) is None:
             speech_event = self.create_speech_gesture_event(phrase, speech_event_name)
             speech_event_json = json.dumps(speech_event)
             self.event_editor.add("", speech_event_json)
@@ -376,6 +434,8 @@ class CustomizeGestureRecorder:
             gesture_json_file_path = self.customize_gesture_dir + '\\' + gesture_tag + '.json'
             with open(gesture_json_file_path, 'w') as gesture_json_file:
                 gesture_json_file.write(json.dumps(key_frames_feature))
+            from scripts.gesture_events.customized_gesture_event import CustomizedGestureEvent
+            CustomizedGestureEvent.forget_trace(gesture_tag)
         if output_str == "":
             return "Customize Gesture created"
         else:
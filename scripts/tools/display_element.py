@@ -9,8 +9,10 @@ import cv2
 import numpy as np
 from numpy import sin, cos, pi
 
+from scripts.tools import text_cache
 from scripts.tools.config import Config
 from scripts.tools.json_editors.mode_editor import ModeEditor
+from scripts.tools.overlay_layer import OverlayLayer, create_sprite
 
 
 class DisplayElement:
@@ -26,6 +28,7 @@ class DisplayElement:
                              "gray": (86, 86, 86),
                              "lightGray": (114, 114, 114)
                              }
+        self._layer = None
 
     def update(self, **kwargs) -> None:
         """
@@ -46,6 +49,34 @@ class DisplayElement:
         """
         raise NotImplementedError()
 
+    def draw_layer(self, layer: OverlayLayer) -> None:
+        """
+        Draws the element into its (already cleared) overlay layer.
+        Only needed by the elements that display themselves with composite_layer.
+        """
+        raise NotImplementedError()
+
+    def composite_layer(self, image: np.ndarray) -> None:
+        """
+        Blends the overlay layer of the element onto the image. The layer is redrawn
+        with draw_layer only if it was marked dirty since the last frame.
+        """
+        height, width = image.shape[:2]
+        if self._layer is None or self._layer.get_size() != (height, width):
+            self._layer = OverlayLayer(height, width)
+        if self._layer.dirty:
+            self._layer.clear()
+            self.draw_layer(self._layer)
+            self._layer.dirty = False
+        self._layer.composite(image)
+
+    def mark_dirty(self) -> None:
+        """
+        Marks the overlay layer to be redrawn before the next composite_layer.
+        """
+        if self._layer is not None:
+            self._layer.dirty = True
+
 # -------------------------------------------------------------------------------------
 
 class ExerciseDisplayElement(DisplayElement):
@@ -60,8 +91,8 @@ class ExerciseDisplayElement(DisplayElement):
         """
         if len(self._exercise_repeats_dict) > 0:
             for index, (exercise, repeats) in enumerate(self._exercise_repeats_dict.items()):
-                image = cv2.putText(image, f"{exercise}: {str(repeats)}", (10, 30 * (index + 1) + 25), self._font, 0.8,
-                                    self._colour_dict["blue"], 2, 0)
+                text_cache.draw_text(image, f"{exercise}: {str(repeats)}", (10, 30 * (index + 1) + 25), self._font, 0.8,
+                                     self._colour_dict["blue"], 2, 0)
 
     def update(self, exericses_repeats_dict: Dict[str, int]) -> None:
         """
@@ -89,7 +120,6 @@ class ExtremityCirclesElement(DisplayElement):
         """
         config = Config()
         radius = int(config.get_data("modules/body/extremity_circle_radius"))
-        mode = ModeEditor().get_data("current_mode")
         extremity_path = "body_gestures/extremity_triggers/"
             
         if len(self._extremity_circles_dict) > 0:
@@ -100,9 +130,9 @@ class ExtremityCirclesElement(DisplayElement):
                 else:
                     rgb = self._colour_dict["red"]
                 image = cv2.circle(image, (x, y), radius, rgb, -1)
-                text_size, _ = cv2.getTextSize(key, self._font, 0.8, 2)
-                image = cv2.putText(image, key, (x - text_size[0] // 2 + 5, y + text_size[1] // 2), self._font,
-                                    0.6, self._colour_dict["black"], 2, 0)
+                text_size, _ = text_cache.get_text_size(key, self._font, 0.8, 2)
+                text_cache.draw_text(image, key, (x - text_size[0] // 2 + 5, y + text_size[1] // 2), self._font,
+                                     0.6, self._colour_dict["black"], 2, 0)
 
 
     def update(self, extremity_circles_dict: Dict[str, Tuple]) -> None:
@@ -167,8 +197,8 @@ class InAirKeyboardElement(DisplayElement):
     def __init__(self) -> None:
         super().__init__()
         self.buttons = {}
-        self.hovered_keys = {}
-        self.clicked_keys = {}
+        self.hovered_keys = set()
+        self.clicked_keys = set()
         self.font = cv2.FONT_HERSHEY_SIMPLEX  
         self.font_weight = 2
         self.font_colour = self._colour_dict["white"]
@@ -176,35 +206,72 @@ class InAirKeyboardElement(DisplayElement):
         self.key_bg_on_hover = self._colour_dict["white"]
         self.key_bg_on_click = self._colour_dict["green"]
         self.alpha = Config().get_data("events/keyboard/default_transparency")
+        self._sprites = {}  # button -> (x, y, {"normal": sprite, "hovered": sprite, "clicked": sprite})
         
 
     def update(self, buttons: dict, hovered_keys: set, clicked_keys: set):
-        self.buttons = buttons
-        self.hovered_keys = hovered_keys
-        self.clicked_keys = clicked_keys
+        if buttons is not self.buttons:  # the keyboard creates a new dict whenever the layout changes
+            self.buttons = buttons
+            self._sprites = {button: self.render_sprites(button) for button in buttons.values()}
+            self.mark_dirty()
+        if hovered_keys != self.hovered_keys or clicked_keys != self.clicked_keys:
+            self.hovered_keys = hovered_keys
+            self.clicked_keys = clicked_keys
+            self.mark_dirty()
     
     
     # update_display with transparency effects   
     def update_display(self, image) -> None:
         """
-        Takes a cv2 image and draws all the keyboard buttons, with different colours being used 
-        for keys which have been hovered over or clicked.
+        Takes a cv2 image and blends the keyboard layer onto it. The layer is only redrawn
+        when the buttons or the hovered or clicked keys have changed.
         """
-        overlay = image.copy()
-        self.draw_buttons(overlay)
-        cv2.addWeighted(overlay, self.alpha, image, 1 - self.alpha, 0, image)
+        self.composite_layer(image)
 
 
-    def draw_buttons(self, overlay):
-        for button in self.buttons.values():
-            x, y = button.get_position()
-            w, h = button.get_size()
+    def draw_layer(self, layer: OverlayLayer) -> None:
+        """
+        Draws the pre-rendered sprite of every button, with different sprites being used
+        for keys which have been hovered over or clicked.
+        """
+        for button, (x, y, sprites) in self._sprites.items():
             if button in self.hovered_keys:
-                self.draw_button(overlay, x, y, w, h, button.font_size, self.key_bg_on_hover, button.text, self.font_colour_on_hover)        
-                if button in self.clicked_keys:
-                    self.draw_button(overlay, x, y, w, h, button.font_size, self.key_bg_on_click, button.text, self.font_colour) 
+                state = "clicked" if button in self.clicked_keys else "hovered"
             else:
-                self.draw_button(overlay, x, y, w, h, button.font_size, button.bg_colour, button.text, self.font_colour)
+                state = "normal"
+            layer.blit(sprites[state], x, y)
+
+
+    def render_sprites(self, button) -> tuple:
+        """
+        Renders the button once for each of its states as BGRA sprites with the keyboard transparency.
+
+        :return: (x, y, sprites) where x, y is the top left corner of the sprites in the frame
+        :rtype: tuple[int, int, dict]
+        """
+        x, y = button.get_position()
+        w, h = button.get_size()
+        (text_w, text_h), baseline = cv2.getTextSize(button.text, self.font, button.font_size, self.font_weight)
+        margin = self.font_weight + 1
+        # the sprite covers the key and the text, which can be wider than the key
+        left = min(0, int(w*0.1) - margin)
+        top = min(0, int(h*0.6) - text_h - margin)
+        right = max(w + 1, int(w*0.1) + text_w + margin)
+        bottom = max(h + 1, int(h*0.6) + baseline + margin)
+
+        states = {
+            "normal": (button.bg_colour, self.font_colour),
+            "hovered": (self.key_bg_on_hover, self.font_colour_on_hover),
+            "clicked": (self.key_bg_on_click, self.font_colour)
+        }
+        sprites = {}
+        for state, (bg_colour, text_colour) in states.items():
+            colour = np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+            mask = np.zeros((bottom - top, right - left), dtype=np.uint8)
+            self.draw_button(colour, -left, -top, w, h, button.font_size, bg_colour, button.text, text_colour)
+            self.draw_button(mask, -left, -top, w, h, button.font_size, 255, button.text, 255)
+            sprites[state] = create_sprite(colour, mask, self.alpha)
+        return x + left, y + top, sprites
 
 
     def draw_button(self, overlay, x, y, w, h, text_size, bg_colour, text, text_colour):
@@ -280,16 +347,7 @@ class ActiveModeNameElement(DisplayElement):
 
         # Currently print mode name in left upper corner
         text_pos = (8, 22)
-        image = cv2.putText(
-            image,
-            text=self._active_mode_text,
-            org=text_pos,
-            fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-            fontScale=0.6,
-            color=self._colour_dict["black"],
-            thickness=1,
-            lineType=cv2.LINE_AA
-        )
+        text_cache.draw_text(image, self._active_mode_text, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, self._colour_dict["black"], 1, cv2.LINE_AA)
 
     def update(self, name) -> None:
         """
@@ -323,8 +381,8 @@ class LowLightIndicatorElement(DisplayElement):
         if average_brightness[0] < self._min_brightness:
             msg = "Your camera may be disconnected"
             msg2= "Or there is not enough light where you are"
-            cv2.putText(image, msg, (160, 230), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
-            cv2.putText(image, msg2, (130, 255), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+            text_cache.draw_text(image, msg, (160, 230), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+            text_cache.draw_text(image, msg2, (130, 255), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
             #print("Dark lighting")
     
     def update(self):
@@ -345,8 +403,8 @@ class HelpMessageElement(DisplayElement):
         text_pos = (470, 22)
         # white text with black outline, so that the message can be seen clearly both when
         # there is a black screen at startup (due to multiple cameras) and during normal operation
-        cv2.putText(image, text="Press ? for Help", org=text_pos, fontFace=cv2.FONT_HERSHEY_SIMPLEX, fontScale=0.6, color=(0,0,0), thickness=3, lineType=cv2.LINE_AA)
-        cv2.putText(image, text="Press ? for Help", org=text_pos, fontFace=cv2.FONT_HERSHEY_SIMPLEX, fontScale=0.6, color=(255,255,255), thickness=1, lineType=cv2.LINE_AA)
+        text_cache.draw_text(image, "Press ? for Help", text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0,0,0), 3, cv2.LINE_AA)
+        text_cache.draw_text(image, "Press ? for Help", text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1, cv2.LINE_AA)
     
     def update(self) -> None:
         if self._show:
@@ -370,16 +428,7 @@ class DrawFPSElement(DisplayElement):
             return
 
         text_pos = (600, 470)
-        image = cv2.putText(
-            image,
-            text=self._fps,
-            org=text_pos,
-            fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-            fontScale=0.7,
-            color=(0,)*3,
-            thickness=1,
-            lineType=cv2.LINE_AA
-        )
+        text_cache.draw_text(image, self._fps, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,)*3, 1, cv2.LINE_AA)
 
     def update(self, fps: str) -> None:
         """
@@ -414,26 +463,8 @@ class ChangeCameraElement(DisplayElement):
 
     
     def draw_outlined_text(self, image, text, text_pos, size) -> None:
-        cv2.putText(
-            image,
-            text=text,
-            org=text_pos,
-            fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-            fontScale=size,
-            color=(0,)*3,
-            thickness=2,
-            lineType=cv2.LINE_AA
-        )
-        cv2.putText(
-            image,
-            text=text,
-            org=text_pos,
-            fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-            fontScale=size,
-            color=(255,)*3,
-            thickness=1,
-            lineType=cv2.LINE_AA
-        )
+        text_cache.draw_text(image, text, text_pos, cv2.FONT_HERSHEY_SIMPLEX, size, (0,)*3, 2, cv2.LINE_AA)
+        text_cache.draw_text(image, text, text_pos, cv2.FONT_HERSHEY_SIMPLEX, size, (255,)*3, 1, cv2.LINE_AA)
 
 
     def update(self, display: bool, index: int) -> None:
@@ -749,15 +780,7 @@ class TranscribeModeElement(DisplayElement):
         if self._transcribing:
             # bottom left corner
             text_pos = (5, 470)
-            image = cv2.putText(
-                image,
-                text= "TRANSCRIPTION",
-                org=text_pos,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.6,
-                color=self._colour_dict["red"],
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, "TRANSCRIPTION", text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.6, self._colour_dict["red"], 1, cv2.LINE_AA)
 
     def update(self, transcribing: bool) -> None:
         """
@@ -788,28 +811,12 @@ class CorrectionModeElement(DisplayElement):
         if self._correction_mode:
             # bottom right corner
             text_pos = (5, 450)
-            image = cv2.putText(
-                image,
-                text= "CORRECTION",
-                org=text_pos,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["blue"],
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, "CORRECTION", text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["blue"], 1, cv2.LINE_AA)
 
         # alternative message - Please first activate Transcribe mode
         if self._transcriber_required:
             text_pos2 = (5, 460)
-            image = cv2.putText(
-                image,
-                text= "Correction mode requires Transcription. To activate say 'transcribe'",
-                org=text_pos2,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["blue"],
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, "Correction mode requires Transcription. To activate say 'transcribe'", text_pos2, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["blue"], 1, cv2.LINE_AA)
 
     def update(self, correction_mode: bool, transcriber_required: bool) -> None:
         """
@@ -839,12 +846,7 @@ class SpeakerIdElement(DisplayElement):
         Calculates the size of the text to display and adjust its position accordingly.
         Used to display the id and name of the locked speaker in the top right corner.
         """
-        text_size = cv2.getTextSize(
-        text,
-        fontFace = cv2.FONT_HERSHEY_SIMPLEX,
-        fontScale=0.5,
-        thickness=3
-        )
+        text_size = text_cache.get_text_size(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 3)
         text_length_x = text_size[0][0]
         text_height_y = text_size[0][1]
         return text_length_x, text_height_y
@@ -859,26 +861,8 @@ class SpeakerIdElement(DisplayElement):
             # 1. First message - Speaker Identification on
             text_pos = (440, 22)
             text1 = "SPEAKER IDENTIFICATION"
-            image = cv2.putText(
-                image,
-                text= text1,
-                org=text_pos,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["gray"],
-                thickness=3,
-                lineType=cv2.LINE_AA
-            )
-            image = cv2.putText(
-                image,
-                text= text1,
-                org=text_pos,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["orange2"],
-                thickness=1,
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, text1, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["gray"], 3, cv2.LINE_AA)
+            text_cache.draw_text(image, text1, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["orange2"], 1, cv2.LINE_AA)
 
         # 2.1. Second message - Speaker Locked
         if self._speaker_locked:
@@ -887,26 +871,8 @@ class SpeakerIdElement(DisplayElement):
             # self._text_size(text) return format: ((50, 12), 6)
             text_pos2 = (490, 22)
             text2 = "SPEAKER LOCKED"
-            image = cv2.putText(
-                image,
-                text= text2,
-                org=text_pos2,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["gray"],
-                thickness=3,
-                lineType=cv2.LINE_AA
-            )
-            image = cv2.putText(
-                image,
-                text= text2,
-                org=text_pos2,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["orange2"],
-                thickness=1,
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, text2, text_pos2, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["gray"], 3, cv2.LINE_AA)
+            text_cache.draw_text(image, text2, text_pos2, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["orange2"], 1, cv2.LINE_AA)
 
             # 2.2. Second message - second line
             text3 = f"[{self._speaker_lock_id}]{self._speaker_lock_name}"
@@ -918,39 +884,12 @@ class SpeakerIdElement(DisplayElement):
             text_pos3 = (x_pos, y_pos)
 
             # TODO: The code below makes design nicer but needs more testing for visibility
-            image = cv2.putText(
-                image,
-                text= text3,
-                org=text_pos3,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["gray"],
-                thickness=3,
-                lineType=cv2.LINE_AA
-            )
-            image = cv2.putText(
-                image,
-                text= text3,
-                org=text_pos3,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.5,
-                color=self._colour_dict["orange2"],
-                thickness=1,
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, text3, text_pos3, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["gray"], 3, cv2.LINE_AA)
+            text_cache.draw_text(image, text3, text_pos3, cv2.FONT_HERSHEY_SIMPLEX, 0.5, self._colour_dict["orange2"], 1, cv2.LINE_AA)
             # 2.3. Second message - third line
             text_pos4 = (389, y_pos + text_height_y + 7)
             text4 = "[to unlock say 'stop speaker identify']"
-            image = cv2.putText(
-                image,
-                text= text4,
-                org=text_pos4,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.4,
-                color=self._colour_dict["gray"],
-                thickness=1,
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, text4, text_pos4, cv2.FONT_HERSHEY_SIMPLEX, 0.4, self._colour_dict["gray"], 1, cv2.LINE_AA)
 
     def update(self, speaker_identification: bool, speaker_locked: bool, spk_lock_id: str, spk_lock_name: str) -> None:
         """
@@ -994,15 +933,7 @@ class NoseBoundElement(DisplayElement):
         if self.direction != "none":
             # bottom corner
             text_pos = (10, 440)
-            image = cv2.putText(
-                image,
-                text= self.presented_text,
-                org=text_pos,
-                fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                fontScale=0.7,
-                color=self._colour_dict["white"],
-                lineType=cv2.LINE_AA
-            )
+            text_cache.draw_text(image, self.presented_text, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.7, self._colour_dict["white"], 1, cv2.LINE_AA)
 
     def update(self, direction) -> None:
         """
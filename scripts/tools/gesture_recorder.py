@@ -1,5 +1,6 @@
-import json
+import numpy as np
 
+from scripts.tools import Config
 from scripts.tools.recording_database import RecordingDatabase
 
 
@@ -95,91 +96,68 @@ class GestureRecorder:
         # print(frame_data.keys())
         # print(compress_data)
 
-        for frame_id, data in frame_data.items():
-            compressed = compress_data[frame_id]
-            gesture_json_str = json.dumps(data)
-            # print(gesture_json_str)
-            self.DB.record(frame_id, gesture_json_str, compressed)
+        self.DB.record_frames((frame_id, data, compress_data[frame_id]) for frame_id, data in frame_data.items())
 
         for gesture, gesture_seq in self.gesture_sequences.items():
             for start_id, end_id in gesture_seq:
                 self.DB.record_gesture(gesture, start_id, end_id)
-        self.DB.close_db()
+        self.DB.close_db()  # writes all the rows in one transaction
 
     def recorded_gesture_reduction(self):
-        landmark_num = 0
-        if self.module_name == 'hand':
-            landmark_num = 18
-        elif self.module_name == 'body':
-            landmark_num = 5
-
-        x_threshold = 40
-        y_threshold = 40
-        z_threshold = 30
-
-        x_width = 640
-        y_height = 480
-        z_depth = 1000
+        """Keeps only the key frames of the recording. A frame is dropped (compressed into the key frame before it)
+        if it has the same body parts and landmarks as the key frame and none of its landmarks moved by the
+        threshold (in pixels of the configured frame size) or more. The first and last frames of the gestures are
+        always key frames.
+
+        :return: the key frames and the number of frames compressed into each of them
+        :rtype: Tuple[Dict[int, dict], Dict[int, int]]
+        """
+        config = Config()
+        tolerance = np.array([
+            config.get_data("gesture_recording/x_threshold") / config.get_data("gesture_recording/frame_width"),
+            config.get_data("gesture_recording/y_threshold") / config.get_data("gesture_recording/frame_height"),
+            config.get_data("gesture_recording/z_threshold") / config.get_data("gesture_recording/frame_depth")])
 
         reduced_frame = {}
         reduced_compress = {}
 
-        trivial_count = 0  # count the trivial frame need to be compressed
-        key_frame_index = list(self.recorded_frames.keys())[0]
-        key_frame = self.recorded_frames[key_frame_index]  # first frame as key frame
-        reduced_frame[key_frame_index] = key_frame
-
-        for i in range(1, len(self.recorded_frames.keys())):  # start from 1
-            this_frame_index = list(self.recorded_frames.keys())[i]
-            this_frame = self.recorded_frames[this_frame_index]
-
-            # comment out code is used in bodypart number change senario
-            '''
-            if len(Key_frame.keys()) != len(self.recorded_gesture_sequence["facing_camera"][0][i].keys()):
-                print(Key_frame)
-                Key_frame = self.recorded_gesture_sequence["facing_camera"][0][i]
-                trivial_count = 0
-            '''
-
-            if this_frame_index in self.key_frames or len(key_frame.keys()) != len(this_frame.keys()):
-                if len(this_frame.keys()) != 0:
-                    reduced_compress[key_frame_index] = trivial_count
-                    trivial_count = 0
-                    key_frame_index = this_frame_index
-                    key_frame = this_frame
-                    reduced_frame[this_frame_index] = this_frame
-                    reduced_compress[this_frame_index] = 0
-
-            else:
-                # len(Key_frame.keys())*23 count the number of compared landmark
-                landmark_count = 0
-
-                exit_flag = False
-                for bodypart in key_frame.keys():
-                    if this_frame.get(bodypart, None) is not None:
-                        for landmark in key_frame[bodypart].keys():  # calculate delta
-                            x = abs(key_frame[bodypart][landmark][0] - this_frame[bodypart][landmark][0])
-                            y = abs(key_frame[bodypart][landmark][1] - this_frame[bodypart][landmark][1])
-                            z = abs(key_frame[bodypart][landmark][2] - this_frame[bodypart][landmark][2])
-                            if x * x_width < x_threshold and y * y_height < y_threshold and z * z_depth < z_threshold:
-                                landmark_count = landmark_count + 1
-                            else:
-                                exit_flag = True
-                                break
-                    else:
-                        continue
-                    if exit_flag:
-                        exit_flag = False
-                        break
-                # check whether all landmark delta < threshold, 18 need to be changed in different module
-                if landmark_count == len(key_frame.keys()) * landmark_num:
-                    trivial_count = trivial_count + 1
-                else:
-                    reduced_compress[key_frame_index] = trivial_count
-                    trivial_count = 0
-                    key_frame_index = this_frame_index
-                    key_frame = this_frame
-                    reduced_frame[this_frame_index] = this_frame
-                    reduced_compress[this_frame_index] = 0
+        frame_indices = list(self.recorded_frames.keys())
+        frames = list(self.recorded_frames.values())
+        layouts = [tuple((bodypart, tuple(landmarks.keys())) for bodypart, landmarks in frame.items())
+                   for frame in frames]
+        # runs of frames that can be compressed into one key frame: same layout and no gesture starting or ending
+        run_start = 0
+        for i in range(1, len(frames) + 1):
+            if i == len(frames) or layouts[i] != layouts[run_start] or frame_indices[i] in self.key_frames:
+                positions = np.array([[landmark for landmarks in frame.values() for landmark in landmarks.values()]
+                                      for frame in frames[run_start:i]], dtype=float)  # (frames, landmarks, 3)
+                for key_frame, compressed in self._reduce_run(positions, tolerance):
+                    reduced_frame[frame_indices[run_start + key_frame]] = frames[run_start + key_frame]
+                    reduced_compress[frame_indices[run_start + key_frame]] = compressed
+                run_start = i
 
         return reduced_frame, reduced_compress
+
+    @staticmethod
+    def _reduce_run(positions, tolerance):
+        """Yields the key frames of the run and how many frames are compressed into each. The frames after a
+        key frame are compared to it in growing chunks, until the first one that moved becomes the next key frame.
+
+        :param positions: landmarks of the frames (frames, landmarks, 3)
+        :type positions: np.ndarray
+        :param tolerance: max x, y and z change of a compressed frame (exclusive)
+        :type tolerance: np.ndarray
+        """
+        frame_count = len(positions)
+        key_frame = 0
+        while key_frame < frame_count:
+            next_key_frame = frame_count
+            start, step = key_frame + 1, 16
+            while start < frame_count:
+                moved = (np.abs(positions[start:start + step] - positions[key_frame]) >= tolerance).any(axis=(1, 2))
+                if moved.any():
+                    next_key_frame = start + int(np.argmax(moved))
+                    break
+                start, step = start + step, step * 2
+            yield key_frame, next_key_frame - key_frame - 1
+            key_frame = next_key_frame
@@ -0,0 +1,287 @@
+'''
+Serves the requests of the GUI over a byte stream (a named pipe on Windows, a Unix socket elsewhere) on an asyncio
+event loop of its own thread. The requests are read as soon as they arrive and handed to the Communicator on a
+single worker thread, so that a slow request does not stop the next ones from being read and the state of the
+Communicator is only ever touched by one thread.
+
+Two wire formats (codecs) are supported:
+* legacy: <4 byte length> <message>, one request answered at a time (the format of the current GUI)
+* framed: <4 byte length> <4 byte request id> <1 byte kind> <UTF-8 payload>, all integers little endian.
+  Requests can be pipelined, their responses carry the request id. The server also pushes the state of MI
+  (kind PUSH, request id 0) with a JSON payload {"topic": ..., "data": ...}.
+'''
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# Standard
+import asyncio
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+REQUEST = 1
+RESPONSE = 2
+PUSH = 3
+
+CLOSED_MESSAGE = "Communication Closed"
+
+ConnectionHandler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+
+class LegacyCodec:
+    """ <4 byte length> <message>, no request ids and no pushes """
+    supports_push = False
+    _header = struct.Struct("<I")
+
+    async def read(self, reader: asyncio.StreamReader) -> Tuple[int, str]:
+        (length,) = self._header.unpack(await reader.readexactly(self._header.size))
+        return 0, (await reader.readexactly(length)).decode("utf-8")
+
+    def encode(self, request_id: int, kind: int, message: str) -> bytes:
+        payload = message.encode("utf-8")
+        return self._header.pack(len(payload)) + payload
+
+
+class FramedCodec:
+    """ <4 byte length> <4 byte request id> <1 byte kind> <payload> """
+    supports_push = True
+    _header = struct.Struct("<IIB")
+
+    async def read(self, reader: asyncio.StreamReader) -> Tuple[int, str]:
+        length, request_id, kind = self._header.unpack(await reader.readexactly(self._header.size))
+        payload = (await reader.readexactly(length)).decode("utf-8")
+        if kind != REQUEST:
+            raise ValueError(f"Unexpected message kind from the GUI: {kind}")
+        return request_id, payload
+
+    def encode(self, request_id: int, kind: int, message: str) -> bytes:
+        payload = message.encode("utf-8")
+        return self._header.pack(len(payload), request_id, kind) + payload
+
+
+CODECS = {
+    "legacy": LegacyCodec,
+    "framed": FramedCodec
+}
+
+
+class Transport:
+    """ Opens the byte streams to the GUI """
+
+    async def serve(self, handle_connection: ConnectionHandler) -> None:
+        """Runs until closed, calling handle_connection with the streams of every connection.
+
+        :param handle_connection: coroutine function serving one connection until it ends
+        :type handle_connection: ConnectionHandler
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """ Stops accepting connections, called on the event loop """
+        raise NotImplementedError()
+
+
+class UnixSocketTransport(Transport):
+    """ Listens on a Unix socket, the GUI (or a test) connects to it """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._server = None
+
+    async def serve(self, handle_connection: ConnectionHandler) -> None:
+        if os.path.exists(self._path):
+            os.remove(self._path)  # left over by a previous run
+        self._server = await asyncio.start_unix_server(handle_connection, path=self._path)
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+
+class NamedPipeTransport(Transport):
+    """ Connects to the named pipe served by the GUI, retrying until the GUI has created it """
+
+    def __init__(self, pipe_name: str, connect_timeout: float, retry_interval: float = 0.1):
+        self._pipe_name = pipe_name
+        self._connect_timeout = connect_timeout
+        self._retry_interval = retry_interval
+        self._writer = None
+
+    async def serve(self, handle_connection: ConnectionHandler) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._connect_timeout
+        while True:
+            reader = asyncio.StreamReader()
+            try:
+                # only available on the proactor event loop (the default one on Windows)
+                transport, protocol = await loop.create_pipe_connection(
+                    lambda: asyncio.StreamReaderProtocol(reader), self._pipe_name)
+                break
+            except OSError:  # the pipe does not exist yet or is busy
+                if loop.time() >= deadline:
+                    raise
+                await asyncio.sleep(self._retry_interval)
+        log.info(f"Connected to the GUI pipe {self._pipe_name}")
+        self._writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await handle_connection(reader, self._writer)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class IPCServer:
+    """ Serves the requests of the GUI with the Communicator """
+
+    def __init__(self, communicator, transport: Transport, codec: str = "legacy", push_interval: float = 1.0,
+                 status_provider: Optional[Callable[[], Dict[str, Any]]] = None):
+        """
+        :param communicator: processes the requests (process_command(request) -> response or None to close)
+        :type communicator: Communicator
+        :param transport: opens the streams to the GUI
+        :type transport: Transport
+        :param codec: wire format, one of CODECS
+        :type codec: str
+        :param push_interval: seconds between the pushes of the status, 0 to not push it
+        :type push_interval: float
+        :param status_provider: returns the status pushed to the GUI
+        :type status_provider: Optional[Callable[[], Dict[str, Any]]]
+        """
+        if codec not in CODECS:
+            raise RuntimeError("Unknown IPC codec: " + codec)
+        self._communicator = communicator
+        self._transport = transport
+        self._codec = CODECS[codec]()
+        self._push_interval = push_interval
+        self._status_provider = status_provider
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="Thread IPC request")
+        self._loop = None
+        self._connections = {}  # writer -> lock of its writes
+        self._running = Event()
+        self._running.set()
+
+    def run(self) -> None:
+        """ Serves the GUI until the communication is closed, blocking (to be run on a thread of its own) """
+        try:
+            asyncio.run(self.serve())
+        except Exception as e:
+            log.error(f"IPC server stopped: {e}")
+        finally:
+            self._running.clear()
+            self._executor.shutdown(wait=False)
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self._transport.serve(self._handle_connection)
+
+    def is_running(self) -> bool:
+        return self._running.is_set()
+
+    def stop(self) -> None:
+        """ Closes the communication, can be called from any thread """
+        self._call_soon(self._close)
+
+    def push(self, topic: str, data: Any) -> None:
+        """Pushes the data to all the connected GUIs (with the framed codec), can be called from any thread.
+
+        :param topic: what the data is about, e.g. "status"
+        :type topic: str
+        :param data: JSON serialisable data
+        :type data: Any
+        """
+        if not self._codec.supports_push:
+            return
+        message = self._codec.encode(0, PUSH, json.dumps({"topic": topic, "data": data}, default=str))
+        self._call_soon(self._broadcast, message)
+
+    # ---------------------------------------------------------------------------------------
+    def _call_soon(self, callback: Callable, *args) -> None:
+        if self._loop is None or not self._running.is_set():
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # the loop has just been closed
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.Lock()
+        pushing = None
+        if self._codec.supports_push and self._push_interval > 0 and self._status_provider is not None:
+            pushing = asyncio.create_task(self._push_status())
+        requests = set()
+        try:
+            while True:
+                try:
+                    request_id, message = await self._codec.read(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break  # the GUI went away
+                if self._codec.supports_push:
+                    # the next request is read while this one is processed, the responses carry the request id
+                    task = asyncio.create_task(self._handle_request(writer, request_id, message))
+                    requests.add(task)
+                    task.add_done_callback(requests.discard)
+                elif not await self._handle_request(writer, request_id, message):
+                    break
+        finally:
+            if pushing is not None:
+                pushing.cancel()
+            if requests:
+                await asyncio.gather(*requests, return_exceptions=True)
+            del self._connections[writer]
+            writer.close()
+
+    async def _handle_request(self, writer: asyncio.StreamWriter, request_id: int, message: str) -> bool:
+        log.info(f"Frontend says: {message}")
+        # one worker thread, so the requests are processed one after the other in the order received
+        out = await self._loop.run_in_executor(self._executor, self._communicator.process_command, message)
+        log.info(f"Backend says: {out}")
+        if not out:
+            log.info("Closing communication")
+            if self._codec.supports_push:
+                await self._write(writer, self._codec.encode(request_id, RESPONSE, CLOSED_MESSAGE))
+            self._close()
+            return False
+        await self._write(writer, self._codec.encode(request_id, RESPONSE, out))
+        return True
+
+    async def _push_status(self) -> None:
+        while True:
+            await asyncio.sleep(self._push_interval)
+            try:
+                status = self._status_provider()
+            except Exception as e:
+                log.error(f"Unable to get the status to push: {e}")
+                continue
+            self.push("status", status)
+
+    async def _write(self, writer: asyncio.StreamWriter, message: bytes) -> None:
+        lock = self._connections.get(writer)
+        if lock is None or writer.is_closing():
+            return
+        async with lock:
+            writer.write(message)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    def _broadcast(self, message: bytes) -> None:
+        for writer in list(self._connections):
+            asyncio.ensure_future(self._write(writer, message))
+
+    def _close(self) -> None:
+        self._running.clear()
+        self._transport.close()
+        for writer in list(self._connections):
+            writer.close()
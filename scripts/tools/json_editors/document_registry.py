@@ -0,0 +1,132 @@
+'''
+Comments:
+Keeps one parsed copy of each JSON data file, shared by all the editors reading it.
+The editors only copy the data once they change it (copy on write) and publish
+their copy as the new version of the document when they save it.
+A pickle snapshot of every parsed file is kept in data/cache, so that the JSON
+only has to be parsed again once the file changes.
+'''
+from scripts.tools.logger import get_logger
+log = get_logger(__name__)
+
+# Standard
+import json
+import os
+import pickle
+import zlib
+from threading import Lock
+from typing import Any, Callable, Optional, Tuple
+
+SNAPSHOT_VERSION = 1  # bump when the format of the snapshots changes
+
+
+class Document:
+    """ One version of the parsed contents of a JSON file """
+
+    def __init__(self, data: Any, version: int, stamp: Tuple[int, int]):
+        self.data = data  # shared, must not be changed in place
+        self.version = version
+        self.stamp = stamp  # (mtime_ns, size) of the file the data was read from
+
+
+class DocumentRegistry:
+    """ Registry of the shared documents, keyed by the file path and the iterable type of its lists """
+
+    def __init__(self, cache_path: str):
+        self._cache_path = cache_path
+        self._documents = {}
+        self._lock = Lock()
+
+
+    def get(self, path: str, iter_type: Optional[str],
+            convert: Callable[[Any, Optional[str]], Any]) -> Document:
+        """Returns the current document of the file, reading it if it changed on disk since.
+
+        :param path: path of the JSON file
+        :type path: str
+        :param iter_type: type the JSON lists are converted to by the convert function
+        :type iter_type: Optional[str]
+        :param convert: converts the parsed JSON to the given iter_type
+        :type convert: Callable[[Any, Optional[str]], Any]
+        :return: the shared document
+        :rtype: Document
+        """
+        stamp = self._get_stamp(path)
+        key = (path, iter_type)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None or document.stamp != stamp:
+                version = document.version + 1 if document is not None else 0
+                document = Document(self._load(path, iter_type, stamp, convert), version, stamp)
+                self._documents[key] = document
+            return document
+
+
+    def peek(self, path: str, iter_type: Optional[str]) -> Optional[Document]:
+        """Returns the document currently shared, without checking the file on disk."""
+        return self._documents.get((path, iter_type))
+
+
+    def publish(self, path: str, iter_type: Optional[str], data: Any) -> Document:
+        """Makes the data (just saved to the file by an editor) the new version of the document.
+        The documents of the same file with other iter_types are read again when next used.
+
+        :return: the new document
+        :rtype: Document
+        """
+        stamp = self._get_stamp(path)
+        key = (path, iter_type)
+        with self._lock:
+            for other_key in [k for k in self._documents if k[0] == path and k != key]:
+                del self._documents[other_key]
+            document = self._documents.get(key)
+            version = document.version + 1 if document is not None else 0
+            document = Document(data, version, stamp)
+            self._documents[key] = document
+        self._write_snapshot(path, iter_type, stamp, data)
+        return document
+
+
+    def _load(self, path: str, iter_type: Optional[str], stamp: Tuple[int, int],
+              convert: Callable[[Any, Optional[str]], Any]) -> Any:
+        snapshot_path = self._get_snapshot_path(path, iter_type)
+        try:
+            with open(snapshot_path, "rb") as file:
+                snapshot_version, snapshot_stamp, data = pickle.load(file)
+            if snapshot_version == SNAPSHOT_VERSION and snapshot_stamp == stamp:
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(f"_load: unable to read the snapshot {snapshot_path}: {e}")
+
+        with open(path, "r") as file:
+            data = json.load(file)
+        if iter_type:
+            data = convert(data, iter_type)
+        self._write_snapshot(path, iter_type, stamp, data)
+        return data
+
+
+    def _write_snapshot(self, path: str, iter_type: Optional[str], stamp: Tuple[int, int], data: Any) -> None:
+        snapshot_path = self._get_snapshot_path(path, iter_type)
+        try:
+            os.makedirs(self._cache_path, exist_ok=True)
+            temp_path = snapshot_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                pickle.dump((SNAPSHOT_VERSION, stamp, data), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path) # so that no one reads a half written snapshot
+        except Exception as e:
+            log.warning(f"_write_snapshot: unable to write the snapshot {snapshot_path}: {e}")
+
+
+    def _get_snapshot_path(self, path: str, iter_type: Optional[str]) -> str:
+        name = os.path.splitext(os.path.basename(path.replace("\\", "/")))[0]
+        path_hash = zlib.crc32(path.encode()) # files of the same name in different folders
+        return os.path.join(self._cache_path, f"{name}.{path_hash:08x}.{iter_type or 'json'}.pickle")
+
+
+    @staticmethod
+    def _get_stamp(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
@@ -24,6 +24,7 @@ class EventEditor(JSONEditor):
         super().__init__("events.json", iter_type="tuple")
 
     def remove(self, path):
+        self._make_writable()
         list_path = path.split("/")
         mode = self._traverse_json(list_path)
         mode.pop(list_path[-1], None)
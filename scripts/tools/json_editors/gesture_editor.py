@@ -36,13 +36,10 @@ class GestureEditor(JSONEditor):
         """
         raw_data = super().get_all_data()
         if not self._as_primitives: return raw_data
-        for _, bodypart in enumerate(raw_data):
-            for _, (gesture, primitives) in enumerate(raw_data[bodypart].items()):
-                primitive_set = set()
-                for primitive, val in primitives.items():
-                    primitive_set.add(Primitive(primitive, val))
-                raw_data[bodypart][gesture] = primitive_set
-        return raw_data
+        # built as a new dict, the raw data is shared with the other editors
+        return {bodypart: {gesture: {Primitive(primitive, val) for primitive, val in primitives.items()}
+                           for gesture, primitives in gestures.items()}
+                for bodypart, gestures in raw_data.items()}
 
     def get_data(self, path : str) -> Set[Primitive]:
         """Gets all the primitives of a specified gesture.
@@ -66,6 +63,7 @@ class GestureEditor(JSONEditor):
 
     def remove(self, path):
         if path in MODULES: raise Exception("You almost deleted an entire module worth of gestures, try fixing your path.")
+        self._make_writable()
         list_path = path.split("/")
         mode = self._traverse_json(list_path)
         try:
@@ -26,15 +26,15 @@ class HotkeysEditor(JSONEditor):
         if not(os.path.exists(self.path) and self.path.endswith(".json")):
             log.error(f"__init__: {self.path} path was not found")
             raise FileNotFoundError(f"file_not_found: {self.path}")
+        self._iter_type = iter_type
         self._read_data()
-        if iter_type:
-            self.data = self._to_iter(self.data, iter_type)
 
 
     def remove(self, path):
         """
         Remove
         """
+        self._make_writable()
         list_path = path.split("/")
         mode = self._traverse_json(list_path)
         mode.pop(list_path[-1], None)
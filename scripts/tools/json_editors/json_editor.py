@@ -9,12 +9,15 @@ log = get_logger(__name__)
 
 # Standard
 import ast
+import copy
 import json
 import sys
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Local
+from scripts.tools.json_editors.document_registry import DocumentRegistry
+from scripts.tools.json_editors.json_patch import apply_operation, split_pointer, validate_operation
 from scripts.tools.json_editors.json_encoder import JSONEncoder
 
 
@@ -23,6 +26,8 @@ def get_data_path():
  
 
 DATA_PATH = get_data_path()
+# the parsed data files, shared by all the editors
+DOCUMENTS = DocumentRegistry(os.path.join(DATA_PATH, "cache"))
 ERRORS = {
     "illegal_update": (
         f"Cannot update as path leads to a JSON"
@@ -40,7 +45,15 @@ ERRORS = {
 
 
 class JSONEditor:
-    """ JSON data handler - Used as abstract class for other editors """
+    """ JSON data handler - Used as abstract class for other editors
+
+    The data read is shared by all the editors of the same file (see DocumentRegistry),
+    so it must only be changed through the editor methods, which copy it first.
+    """
+    _iter_type = None
+    _document = None # shared document the data was last read from
+    _owned = False # if self.data is a private copy with unsaved changes
+    _revision = 0 # incremented whenever the data of this editor may have changed
 
     def __init__(self, path: str, iter_type: Optional[str] = None):
         """Initialises JSONEditor object by reading contents of the 
@@ -54,9 +67,8 @@ class JSONEditor:
         if not(os.path.exists(self.path) and self.path.endswith(".json")):
             log.error(f"__init__: {self.path} path was not found")
             raise FileNotFoundError(f"{ERRORS['file_not_found']}{self.path}")
+        self._iter_type = iter_type
         self._read_data()
-        if iter_type:
-            self.data = self._to_iter(self.data, iter_type)
 
 
     def get_all_data(self) -> Dict[str, Any]:
@@ -66,6 +78,7 @@ class JSONEditor:
         :return: The data stored in the JSONEditor Object.
         :rtype: Dict[str, Any]
         """
+        self._refresh()
         return self.data
 
 
@@ -77,6 +90,7 @@ class JSONEditor:
         :return: The retrieved data from the JSON file.
         :rtype: [Dict]
         """
+        self._refresh()
         list_path = path.split("/")
         try:
             out = self._traverse_json(list_path)[list_path[-1]]
@@ -95,6 +109,7 @@ class JSONEditor:
         :type val: Any
         """
         val = self._to_correct_type(val)
+        self._make_writable()
         list_path = path.split("/")
         try:
             obj = self._traverse_json(list_path)
@@ -116,6 +131,7 @@ class JSONEditor:
         :type key: str
         # TODO: Optimise! Handle accurate SPECIFIC exceptions!
         """                
+        self._make_writable()
         list_path = path.split("/")
         if list_path == [""]:
             list_path = []
@@ -126,6 +142,26 @@ class JSONEditor:
             position[list_path[-1]][key] = val
 
 
+    def apply_patch(self, operations: List[Dict[str, Any]]) -> None:
+        """Applies JSON patch operations (add, replace, remove and test) to the data, with the paths
+        relative to this JSON file. The values are JSON values, used as they are, and must have the type
+        of the values they replace. The changes are only kept in memory until saved.
+
+        :param operations: the operations, e.g. [{"op": "replace", "path": "/general/view/preview_fps", "value": 20}]
+        :type operations: List[Dict[str, Any]]
+        :raises KeyError: if a path does not exist
+        :raises TypeError: if a value has the wrong type
+        :raises ValueError: if an operation is invalid or a test fails
+        """
+        for operation in operations:
+            validate_operation(operation)
+        self._make_writable()
+        for operation in operations:
+            if self._iter_type and "value" in operation:
+                operation = dict(operation, value=self._to_iter(operation["value"], self._iter_type))
+            apply_operation(self.data, operation, split_pointer(operation["path"]))
+
+
     def save(self) -> None:
         """
         Saves all changed made to the JSON file
@@ -134,6 +170,23 @@ class JSONEditor:
             self.data, indent=4, sort_keys=True, cls=JSONEncoder)
         with open(self.path, "w") as file:
             file.write(json_object)
+        self._publish()
+
+
+    def get_revision(self) -> int:
+        """
+        :return: a number that changes whenever the data of the editor may have changed
+        :rtype: int
+        """
+        self._refresh()
+        return self._revision
+
+
+    def discard_changes(self) -> None:
+        """
+        Drops the changes not saved yet, going back to the data of the JSON file
+        """
+        self._read_data()
 
 
     @classmethod
@@ -175,10 +228,46 @@ class JSONEditor:
 
     def _read_data(self) -> None:
         """
-        Reads all data from a JSON file
+        Reads all data from a JSON file (the shared document if the file did not change since),
+        dropping any unsaved changes
+        """
+        self._document = DOCUMENTS.get(self.path, self._iter_type, self._to_iter)
+        self.data = self._document.data
+        self._owned = False
+        self._revision += 1
+
+
+    def _refresh(self) -> None:
+        """
+        Picks up the version of the data saved by another editor of the same file
+        (unless this editor has unsaved changes)
+        """
+        if self._owned:
+            return
+        document = DOCUMENTS.peek(self.path, self._iter_type)
+        if document is not None and document is not self._document:
+            self._document = document
+            self.data = document.data
+            self._revision += 1
+
+
+    def _make_writable(self) -> None:
+        """
+        Copies the shared data before it is changed by this editor
+        """
+        self._revision += 1
+        if not self._owned:
+            self._refresh()
+            self.data = copy.deepcopy(self.data)
+            self._owned = True
+
+
+    def _publish(self) -> None:
+        """
+        Shares the data just written to the JSON file with the other editors
         """
-        with open(self.path, "r") as file:
-            self.data = json.load(file)
+        self._document = DOCUMENTS.publish(self.path, self._iter_type, self.data)
+        self._owned = False
 
 
     @staticmethod
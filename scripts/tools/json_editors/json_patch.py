@@ -0,0 +1,122 @@
+'''
+Comments:
+Helpers for changing the JSON data in bulk: JSON patch (RFC 6902) pointers and operations,
+type checks of the new values against the values they replace and the difference of two versions of the data.
+'''
+# Standard
+from typing import Any, Dict, List, Tuple
+
+ERRORS = {
+    "bad_operation": "JSON patch operations must be objects with an 'op' (add, replace, remove or test) and a 'path'",
+    "path_does_not_exist": "JSON path does not exist",
+    "wrong_type": "Wrong type of value for ",
+    "test_failed": "JSON patch test failed for "
+}
+OPERATIONS = ("add", "replace", "remove", "test")
+
+
+def split_pointer(pointer: str) -> List[str]:
+    """
+    :param pointer: JSON pointer ("/a/b~1c") or the path used by the editors ("a/b")
+    :type pointer: str
+    :return: the keys of the path (["a", "b/c"])
+    :rtype: List[str]
+    """
+    if pointer.startswith("/"):
+        return [key.replace("~1", "/").replace("~0", "~") for key in pointer[1:].split("/")]
+    return pointer.split("/")
+
+
+def check_type(path: str, old: Any, new: Any) -> None:
+    """Checks that the new value has the type of the value it replaces (recursively for the known keys of objects).
+    Integers and floats can replace each other, None can be replaced by anything.
+
+    :raises TypeError: if the types differ
+    """
+    if old is None:
+        return
+    if isinstance(old, bool) or isinstance(new, bool):
+        valid = isinstance(old, bool) and isinstance(new, bool)
+    elif isinstance(old, (int, float)):
+        valid = isinstance(new, (int, float))
+    elif isinstance(old, dict):
+        valid = isinstance(new, dict)
+        if valid:
+            for key in old.keys() & new.keys():
+                check_type(f"{path}/{key}", old[key], new[key])
+    elif isinstance(old, (list, tuple, set)):
+        valid = isinstance(new, (list, tuple, set))
+    else:
+        valid = isinstance(new, type(old))
+    if not valid:
+        raise TypeError(f"{ERRORS['wrong_type']}{path}: expected {type(old).__name__}, got {type(new).__name__}")
+
+
+def apply_operation(data: Dict[str, Any], operation: Dict[str, Any], keys: List[str]) -> None:
+    """Applies one JSON patch operation to the data in place.
+    Only objects are traversed, lists are values like the editors treat them.
+
+    :param data: the data to change
+    :type data: Dict[str, Any]
+    :param operation: {"op": ..., "path": ..., "value": ...}
+    :type operation: Dict[str, Any]
+    :param keys: the path of the operation in the data
+    :type keys: List[str]
+    :raises KeyError: if the path does not exist
+    :raises TypeError: if the new value has the wrong type
+    :raises ValueError: if a test operation fails
+    """
+    op = operation["op"]
+    parent = data
+    for key in keys[:-1]:
+        if not isinstance(parent, dict) or key not in parent:
+            raise KeyError(ERRORS["path_does_not_exist"])
+        parent = parent[key]
+    key = keys[-1]
+    if not isinstance(parent, dict) or (op != "add" and key not in parent):
+        raise KeyError(ERRORS["path_does_not_exist"])
+    path = "/".join(keys)
+    if op == "remove":
+        del parent[key]
+    elif op == "test":
+        if parent[key] != operation["value"]:
+            raise ValueError(ERRORS["test_failed"] + path)
+    else:
+        check_type(path, parent.get(key), operation["value"])
+        parent[key] = operation["value"]
+
+
+def validate_operation(operation: Any) -> None:
+    if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS or \
+            not isinstance(operation.get("path"), str) or \
+            (operation["op"] != "remove" and "value" not in operation):
+        raise ValueError(ERRORS["bad_operation"])
+
+
+def diff(old: Any, new: Any, path: str = "") -> Tuple[Dict[str, Any], List[str]]:
+    """Finds the smallest subtrees that differ between two versions of the data.
+
+    :param old: the previous version
+    :param new: the current version
+    :param path: path of the data, prefixed to the returned paths
+    :type path: str
+    :return: the changed or added paths mapped to their new values and the removed paths
+    :rtype: Tuple[Dict[str, Any], List[str]]
+    """
+    changed, removed = {}, []
+    if old is new:
+        return changed, removed
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        if old != new:
+            changed[path] = new
+        return changed, removed
+    prefix = f"{path}/" if path else ""
+    for key, value in new.items():
+        if key not in old:
+            changed[prefix + key] = value
+        elif value is not old[key] and value != old[key]:
+            sub_changed, sub_removed = diff(old[key], value, prefix + key)
+            changed.update(sub_changed)
+            removed.extend(sub_removed)
+    removed.extend(prefix + key for key in old if key not in new)
+    return changed, removed
@@ -15,6 +15,7 @@ class ModeEditor(JSONEditor):
         if not path.startswith("modes"): raise Exception("Only modes can be removed from the mode_controller JSON")
         list_path = path.split("/")
         if len(list_path) == 2:
+            self._make_writable()
             modes = self.data["modes"]
             modes.pop(list_path[-1], None)
         else:
@@ -11,8 +11,12 @@ from scripts.tools.json_editors.json_editor import JSONEditor
 class SPKEditor(JSONEditor):
     def __init__(self):
         super().__init__("speakers_data.json")
+        self.version = 0 # incremented on every write, so that the SpeakerIndex knows when to rebuild
 
 
     def update_json(self, json_data) -> None:
         with open(self.path, "w") as f:
             json.dump(json_data, f, indent=4, sort_keys=True)
+        self.data = json_data
+        self._publish()
+        self.version += 1
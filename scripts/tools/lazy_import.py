@@ -0,0 +1,61 @@
+'''
+Helpers for deferring the imports of the heavy ML and IO dependencies (mediapipe, openvino, vosk, ...)
+until a mode actually needs them.
+'''
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+
+def lazy_attributes(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """Creates a module level __getattr__ (PEP 562) for a package, which imports the exported names only when
+    they are first accessed. e.g. "from scripts.tools import Config" only imports the config and not the View.
+
+    :param package: name of the package (__name__)
+    :type package: str
+    :param exports: exported names mapped to the (relative) names of the modules they are defined in
+    :type exports: Dict[str, str]
+    :return: the __getattr__ function of the package
+    :rtype: Callable[[str], Any]
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        setattr(sys.modules[package], name, value)  # next access will not go through __getattr__
+        return value
+    return __getattr__
+
+
+class LazyRegistry(Mapping):
+    """Read only name -> class mapping, where each class is only imported when it is first looked up."""
+
+    def __init__(self, paths: Dict[str, str]) -> None:
+        """
+        :param paths: names mapped to the "module.path:ClassName" of the class
+        :type paths: Dict[str, str]
+        """
+        self._paths = paths
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._loaded:
+            module_path, class_name = self._paths[name].split(":")
+            self._loaded[name] = getattr(importlib.import_module(module_path), class_name)
+        return self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths  # Mapping would look the class up, which imports it
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def is_loaded(self, name: str) -> bool:
+        """
+        :return: if the class has already been imported
+        :rtype: bool
+        """
+        return name in self._loaded
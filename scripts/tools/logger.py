@@ -9,29 +9,104 @@ logging provides an easy way of tracking actions throughout the application.
 '''
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Tuple
 
 MI_LOGGER_NAME = "motioninput_api"
 
-def logger_config(file_name : str = "", config = None) -> None: 
+# compact structured records: time, level, frame sequence, thread, module:line and the message
+LOG_FORMAT = "%(asctime)s %(levelname).1s frame=%(frame)s thread=%(threadName)s module=%(name)s:%(lineno)d %(message)s"
+
+_listener = None  # writes the queued records to the file, on a thread of its own
+_frame = 0  # sequence number of the frame being processed, added to every record
+
+
+def set_log_frame(frame: int) -> None:
+    """
+    Sets the sequence number of the frame being processed, added to the records logged from now on
+    """
+    global _frame
+    _frame = frame
+
+
+class FrameFilter(logging.Filter):
+    """ Adds the frame sequence number to the records """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.frame = _frame
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most `burst` records of the same call site (logger, level and line) per `interval` seconds,
+    so that a warning logged every frame does not flood the file. The next record let through tells how many
+    records of the call site were dropped. Critical records are never dropped."""
+
+    def __init__(self, interval: float, burst: int):
+        super().__init__()
+        self._interval = interval
+        self._burst = burst
+        self._sites: Dict[Tuple[str, int, int], list] = {}  # call site -> [window start, records let through, dropped]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.CRITICAL or self._interval <= 0:
+            return True
+        now = time.monotonic()
+        site = self._sites.get((record.name, record.levelno, record.lineno))
+        if site is None:
+            self._sites[(record.name, record.levelno, record.lineno)] = [now, 1, 0]
+            return True
+        if now - site[0] >= self._interval:
+            site[0] = now
+            site[1] = 0
+        if site[1] >= self._burst:
+            site[2] += 1
+            return False
+        site[1] += 1
+        if site[2]:
+            record.msg = f"{record.msg} ({site[2]} similar records dropped)"
+            site[2] = 0
+        return True
+
+
+class FastQueueHandler(QueueHandler):
+    """Queues the records as they are, only merging the arguments into the message.
+    The formatting (and the file I/O) is left to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def logger_config(file_name : str = "", config = None) -> logging.Logger:
     """
     Logger Configuration in motioninput_api.py
     Code inspired from https://github.com/yashprakash13/data-another-day 
+
+    The records are only put into a queue by the logging thread. A listener thread formats them
+    and writes them to the (size rotated) file.
     """
+    global _listener
     logger = logging.getLogger(MI_LOGGER_NAME)
     logger_enabled = False
     if config:
         logger_enabled = config.get_data("general/logging_enabled")
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    logger.handlers.clear()
     if logger_enabled and os.path.exists(file_name):
         logger.setLevel(logging.DEBUG)
     else:
-        logger.handlers.clear()
         return logger
+    settings = config.get_data("general/logging")
 
-    fmt = "%(asctime)s <%(levelname)s> ['%(message)s']  -  Path: <%(name)s>  -  Function Name: %(funcName)s - Line: %(lineno)s"
-
-    # Human friendly format
-    formatter = logging.Formatter(fmt)
+    # Compact structured format
+    formatter = logging.Formatter(LOG_FORMAT)
 
     # Optional Detailed format
 #    formatter = logging.Formatter(
@@ -53,15 +128,17 @@ def logger_config(file_name : str = "", config = None) -> None:
 
     fileHandler = RotatingFileHandler(
     filename=file_name, 
-    maxBytes=100_000, 
-    backupCount=3
+    maxBytes=settings["max_bytes"], 
+    backupCount=settings["backup_count"]
     )
-
-    logger.addHandler(fileHandler)
-    fh = logging.FileHandler(file_name)
-    fh.setFormatter(formatter)
-    logger.handlers.clear()
-    logger.addHandler(fh)
+    fileHandler.setFormatter(formatter)
+
+    queueHandler = FastQueueHandler(queue.SimpleQueue())
+    queueHandler.addFilter(RateLimitFilter(settings["rate_limit_interval"], settings["rate_limit_burst"]))
+    queueHandler.addFilter(FrameFilter())
+    logger.addHandler(queueHandler)
+    _listener = QueueListener(queueHandler.queue, fileHandler)
+    _listener.start()
     return logger
 
 
@@ -86,8 +163,12 @@ def get_logger(filename : str):
 def logger_stop() -> None:
     """
     STOP
-    Flush and close all handlers 
+    Write the queued records, then flush and close all handlers 
     """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     logging.shutdown()
 
 
@@ -0,0 +1,94 @@
+'''
+BGRA overlay layers of the display elements.
+An element draws into its layer only when its state changes (the layer is dirty),
+the layer is then alpha blended onto every frame, but only within its bounding box.
+'''
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class OverlayLayer:
+    """A frame sized BGRA image together with the bounding box of everything drawn into it"""
+
+    def __init__(self, height: int, width: int) -> None:
+        self.image = np.zeros((height, width, 4), dtype=np.uint8)
+        self.bbox = None  # (x0, y0, x1, y1) of the drawn area, None if nothing is drawn
+        self.dirty = True  # the element has to redraw the layer before the next composite
+        self._premultiplied = None  # colour * alpha and 255 - alpha within the bbox, cached until the layer changes
+        self._inverse_alpha = None
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.image.shape[0], self.image.shape[1]
+
+    def clear(self) -> None:
+        """Removes everything drawn into the layer"""
+        if self.bbox is not None:
+            x0, y0, x1, y1 = self.bbox
+            self.image[y0:y1, x0:x1] = 0
+        self.bbox = None
+        self._premultiplied = None
+
+    def blit(self, sprite: np.ndarray, x: int, y: int) -> None:
+        """Draws a BGRA sprite with its top left corner at (x, y) over the layer.
+        The pixels of the sprite with zero alpha leave the layer as it was, the sprite is clipped to the layer.
+
+        :param sprite: BGRA image
+        :type sprite: np.ndarray
+        :param x: x position of the top left corner of the sprite in the layer
+        :type x: int
+        :param y: y position of the top left corner of the sprite in the layer
+        :type y: int
+        """
+        height, width = self.get_size()
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite.shape[1], width), min(y + sprite.shape[0], height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        patch = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+        drawn = patch[:, :, 3] > 0
+        self.image[y0:y1, x0:x1][drawn] = patch[drawn]
+
+        if self.bbox is not None:
+            x0, y0 = min(x0, self.bbox[0]), min(y0, self.bbox[1])
+            x1, y1 = max(x1, self.bbox[2]), max(y1, self.bbox[3])
+        self.bbox = (x0, y0, x1, y1)
+        self._premultiplied = None
+
+    def composite(self, frame: np.ndarray) -> None:
+        """Alpha blends the layer onto the BGR frame in place, only the bbox of the layer is touched.
+
+        :param frame: frame of the same size as the layer
+        :type frame: np.ndarray
+        """
+        if self.bbox is None:
+            return
+        x0, y0, x1, y1 = self.bbox
+        if self._premultiplied is None:
+            region = self.image[y0:y1, x0:x1]
+            alpha = region[:, :, 3:].astype(np.uint16)
+            self._premultiplied = region[:, :, :3] * alpha + 127  # + 127 to round the division below
+            self._inverse_alpha = 255 - alpha
+        roi = frame[y0:y1, x0:x1]
+        blended = roi * self._inverse_alpha
+        blended += self._premultiplied
+        blended //= 255
+        roi[:] = blended
+
+
+def create_sprite(colour: np.ndarray, mask: np.ndarray, opacity: float = 1.0) -> np.ndarray:
+    """Makes a BGRA sprite out of the colours drawn on a BGR image and the mask of the drawn pixels.
+
+    :param colour: BGR image with the drawing
+    :type colour: np.ndarray
+    :param mask: single channel image, non zero where something was drawn
+    :type mask: np.ndarray
+    :param opacity: opacity of the drawn pixels between 0 and 1
+    :type opacity: float
+    :return: BGRA sprite
+    :rtype: np.ndarray
+    """
+    sprite = np.empty(colour.shape[:2] + (4,), dtype=np.uint8)
+    sprite[:, :, :3] = colour
+    sprite[:, :, 3] = np.where(mask > 0, int(round(opacity * 255)), 0)
+    return sprite
@@ -1,31 +1,69 @@
+import json
 import sqlite3
 import time
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+Layout = Tuple[Tuple[str, Tuple[str, ...]], ...]  # ((bodypart name, (landmark names, ...)), ...) of a frame
 
 
 class RecordingDatabase:
-    def __init__(self):
-        self.mydb = sqlite3.connect("MotionInput.db", check_same_thread=False)
+    """Stores the recorded landmarks, one row per (key) frame with the landmarks packed into a float32 blob.
+    The order of the body parts and landmarks in the blob (the layout) is stored once in its own table.
+    The rows are buffered and written in one transaction per flush.
+    The days recorded before (Records_<date> with JSON rows and their Gestures_<date>) are still read."""
+
+    def __init__(self, path="MotionInput.db"):
+        self.mydb = sqlite3.connect(path, check_same_thread=False)
+        self.mydb.execute("PRAGMA journal_mode=WAL")
+        self.mydb.execute("PRAGMA synchronous=NORMAL")
         self.mycursor = self.mydb.cursor()
 
         date = time.strftime("%Y%m%d", time.localtime())  # 20220101
 
-        self.record_table_name = "Records_" + date
-        self.gesture_table_name = "Gestures_" + date
-        record = "CREATE TABLE IF NOT EXISTS " + self.record_table_name + " (frame_id INT, data TEXT, compress INT, PRIMARY KEY (frame_id));"
-        gesture = "CREATE TABLE IF NOT EXISTS " + self.gesture_table_name + " (gesture_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, gesture_name VARCHAR(255), start INT, end INT, FOREIGN KEY (start) REFERENCES " + self.record_table_name + "(frame_id), FOREIGN KEY (end) REFERENCES " + self.record_table_name + "(frame_id));"
-        self.mycursor.execute(record)
-        self.mycursor.execute(gesture)
+        self.record_table_name = "Landmarks_" + date
+        self.layout_table_name = "Layouts_" + date
+        # not Gestures_<date>, whose ranges refer to the frame ids of the JSON Records_<date> of the same day
+        self.gesture_table_name = "LandmarkGestures_" + date
+        self._create_tables(date)
+
+        self._pending_frames = []  # (frame_id, layout_id, data, compress)
+        self._pending_gestures = []  # (gesture_name, start, end)
+        self._layouts = {}  # layout -> layout_id
+        self.mycursor.execute("SELECT layout_id, layout FROM " + self.layout_table_name)
+        for layout_id, layout in self.mycursor.fetchall():
+            self._layouts[self._decode_layout(layout)] = layout_id
+
+    def _create_tables(self, date):
+        self.mycursor.execute("CREATE TABLE IF NOT EXISTS " + self.layout_table_name +
+                              " (layout_id INTEGER NOT NULL PRIMARY KEY, layout TEXT);")
+        self.mycursor.execute("CREATE TABLE IF NOT EXISTS " + self.record_table_name +
+                              " (frame_id INT, layout_id INT, data BLOB, compress INT, PRIMARY KEY (frame_id));")
+        self.mycursor.execute("CREATE TABLE IF NOT EXISTS " + self.gesture_table_name +
+                              " (gesture_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, gesture_name VARCHAR(255),"
+                              " start INT, end INT);")
+        self.mycursor.execute("CREATE INDEX IF NOT EXISTS LandmarkGesture_ranges_" + date + " ON " + self.gesture_table_name +
+                              " (gesture_name, start, end);")
+        self.mydb.commit()
 
     def record(self, frame_id, data, compress=0):
         """
             :param int frame_id: The frame id
-            :param str data: The landmark data json string
+            :param dict data: The landmarks of the frame {bodypart name: {landmark name: [x, y, z]}}
             :param int compress: how many frames compressed, 0 if not compressed
         """
-        sql = "INSERT INTO " + self.record_table_name + " (frame_id, data,compress) VALUES (" + str(
-            frame_id) + ", '" + data + "' , " + str(compress) + ")"
-        self.mycursor.execute(sql)
-        self.mydb.commit()  # commit the change to the database, DO NOT REMOVE
+        self.record_frames([(frame_id, data, compress)])
+
+    def record_frames(self, frames: Iterable[Tuple[int, Dict[str, Dict[str, List[float]]], int]]):
+        """
+            :param frames: (frame id, landmarks of the frame, how many frames compressed) of each frame
+        """
+        for frame_id, data, compress in frames:
+            layout = tuple((bodypart, tuple(landmarks.keys())) for bodypart, landmarks in data.items())
+            values = [landmark for landmarks in data.values() for landmark in landmarks.values()]
+            blob = np.asarray(values, dtype=np.float32).tobytes()
+            self._pending_frames.append((frame_id, self._get_layout_id(layout), blob, compress))
 
     def record_gesture(self, name, start, end):
         """
@@ -33,11 +71,20 @@ class RecordingDatabase:
             :param int start: The starting frame id
             :param int end: The ending frame id
         """
-        sql = "INSERT INTO " + self.gesture_table_name + " (gesture_name, start, end) VALUES ('" + name + "' , " + str(
-            start) + ", " + str(end) + ")"
-        # print(sql)
-        self.mycursor.execute(sql)
-        self.mydb.commit()  # commit the change to the database, DO NOT REMOVE
+        self._pending_gestures.append((name, start, end))
+
+    def flush(self):
+        """Writes all the buffered rows in one transaction"""
+        if not self._pending_frames and not self._pending_gestures:
+            return
+        with self.mydb:
+            self.mycursor.executemany("INSERT INTO " + self.record_table_name +
+                                      " (frame_id, layout_id, data, compress) VALUES (?, ?, ?, ?)",
+                                      self._pending_frames)
+            self.mycursor.executemany("INSERT INTO " + self.gesture_table_name +
+                                      " (gesture_name, start, end) VALUES (?, ?, ?)", self._pending_gestures)
+        self._pending_frames = []
+        self._pending_gestures = []
 
     def get_last_line_id(self):
         """
@@ -46,42 +93,115 @@ class RecordingDatabase:
         sql = "SELECT MAX(frame_id) FROM " + self.record_table_name
         self.mycursor.execute(sql)
         myresult = self.mycursor.fetchall()
+        last_id = max([frame_id for frame_id, _, _, _ in self._pending_frames] + [-1])
 
         if myresult[0][0] is not None:
-            return myresult[0][0]
+            return max(myresult[0][0], last_id)
         else:
-            return -1
+            return last_id
+
+    def get_frames(self, date_list, gesture) -> List[Tuple[Layout, np.ndarray]]:
+        """Reads all the recorded frames of the gesture, with the compressed frames filled in.
+
+            :param list date_list: The dates ("20220101") to read
+            :param str gesture: The name of the gesture
+            :return: runs of the consecutive frames with the same layout, as (layout, (frames, landmarks, 3) array)
+        """
+        self.flush()
+        runs = []
+        for date in date_list:
+            if self._has_table("Records_" + date) and self._has_table("Gestures_" + date):
+                runs.extend(self._to_runs(self._get_json_rows(date, gesture)))
+            if self._has_table("Landmarks_" + date):
+                runs.extend(self._to_runs(self._get_rows(date, gesture)))
+        return runs
+
+    def _get_rows(self, date, gesture) -> List[Tuple[int, Layout, bytes, int]]:
+        # all the rows of all the ranges of the gesture at once, in order
+        sql = "SELECT g.gesture_id, r.layout_id, r.data, r.compress FROM LandmarkGestures_" + date + \
+              " AS g JOIN Landmarks_" + date + " AS r ON r.frame_id BETWEEN g.start AND g.end" \
+              " WHERE g.gesture_name = ? ORDER BY g.gesture_id, r.frame_id"
+        self.mycursor.execute(sql, (gesture,))
+        rows = self.mycursor.fetchall()
+        if not rows:
+            return []
+        self.mycursor.execute("SELECT layout_id, layout FROM Layouts_" + date)
+        layouts = {layout_id: self._decode_layout(layout) for layout_id, layout in self.mycursor.fetchall()}
+        return [(gesture_id, layouts[layout_id], data, compress) for gesture_id, layout_id, data, compress in rows]
+
+    def _get_json_rows(self, date, gesture) -> List[Tuple[int, Layout, bytes, int]]:
+        # the rows written before the landmarks were stored as blobs, one JSON text per frame
+        sql = "SELECT g.gesture_id, r.data, r.compress FROM Gestures_" + date + \
+              " AS g JOIN Records_" + date + " AS r ON r.frame_id BETWEEN g.start AND g.end" \
+              " WHERE g.gesture_name = ? ORDER BY g.gesture_id, r.frame_id"
+        self.mycursor.execute(sql, (gesture,))
+        rows = []
+        for gesture_id, data, compress in self.mycursor.fetchall():
+            landmarks = json.loads(data)
+            layout = tuple((bodypart, tuple(values.keys())) for bodypart, values in landmarks.items())
+            values = [value for values in landmarks.values() for value in values.values()]
+            rows.append((gesture_id, layout, np.asarray(values, dtype=np.float32).tobytes(), compress))
+        return rows
+
+    @staticmethod
+    def _to_runs(rows) -> List[Tuple[Layout, np.ndarray]]:
+        """
+            :param rows: (gesture range id, layout, float32 landmarks, compressed frames) of the frames in order
+            :return: runs of the consecutive frames with the same layout, as (layout, (frames, landmarks, 3) array)
+        """
+        if not rows:
+            return []
+        gesture_ids = np.array([row[0] for row in rows])
+        # the compressed frames are repeated, except after the last frame of a range
+        repeats = np.array([row[3] for row in rows]) + 1
+        repeats[np.append(gesture_ids[1:] != gesture_ids[:-1], True)] = 1
+        # split into runs of the same layout
+        run_starts = [0] + [i for i in range(1, len(rows)) if rows[i][1] != rows[i - 1][1]]
+        run_ends = run_starts[1:] + [len(rows)]
+        runs = []
+        for start, end in zip(run_starts, run_ends):
+            frames = np.frombuffer(b"".join(row[2] for row in rows[start:end]), dtype=np.float32)
+            frames = frames.reshape(end - start, -1, 3)
+            runs.append((rows[start][1], np.repeat(frames, repeats[start:end], axis=0)))
+        return runs
+
+    def _has_table(self, table_name) -> bool:
+        self.mycursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+        return self.mycursor.fetchone() is not None
 
     def get_data(self, date_list, gesture):
-        # split the date_string by , if there is more than one day
+        """
+            :param list date_list: The dates ("20220101") to read
+            :param str gesture: The name of the gesture
+            :return: the landmarks {bodypart name: {landmark name: [x, y, z]}} of each frame of the gesture
+        """
         frame_sequence = []
-        for date in date_list:
-            # get all the start and end frame_id of the gesture
-            sql = "SELECT start,end FROM " + "Gestures_" + date + " WHERE gesture_name = " + "'" + gesture + "'"
-            self.mycursor.execute(sql)
-            myresult = self.mycursor.fetchall()
-            keyframe_id_list = myresult
-            for id in keyframe_id_list:
-                # get all the key frame data between start and end
-                sql = "SELECT data,compress FROM " + "Records_" + date + " WHERE frame_id BETWEEN " + str(id[0]) + " AND " + str(id[1])
-                self.mycursor.execute(sql)
-                keyframe_list = self.mycursor.fetchall()
-                counter = 1
-                for data in keyframe_list:
-                    frame_sequence.append(data[0])
-                    if counter != len(keyframe_list):
-                        for i in range(0, data[1]):
-                            # fill sequence with the compress frame
-                            frame_sequence.append(data[0])
-                        counter = counter + 1
+        for layout, frames in self.get_frames(date_list, gesture):
+            names = [(bodypart, landmark) for bodypart, landmarks in layout for landmark in landmarks]
+            for frame in frames.tolist():
+                frame_data = {bodypart: {} for bodypart, _ in layout}
+                for (bodypart, landmark), value in zip(names, frame):
+                    frame_data[bodypart][landmark] = value
+                frame_sequence.append(frame_data)
         return frame_sequence
 
     def close_db(self):
+        self.flush()
         self.mycursor.close()
         self.mydb.close()
 
+    def _get_layout_id(self, layout):
+        if layout not in self._layouts:
+            self.mycursor.execute("INSERT INTO " + self.layout_table_name + " (layout) VALUES (?)",
+                                  (json.dumps(layout),))
+            self._layouts[layout] = self.mycursor.lastrowid
+        return self._layouts[layout]
+
+    @staticmethod
+    def _decode_layout(layout):
+        return tuple((bodypart, tuple(landmarks)) for bodypart, landmarks in json.loads(layout))
+
 
 if __name__ == "__main__":
     mysql = RecordingDatabase()
-    # print(mysql.get_data("20220323","gun"))
-
+    # print(mysql.get_data(["20220323"], "gun"))
@@ -0,0 +1,110 @@
+'''
+Cache of pre-rasterised text for the display elements.
+Most of the elements draw the same strings every frame, so the text is rendered once into a
+BGRA sprite and then only alpha blended onto the frame.
+'''
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+@lru_cache(maxsize=1024)
+def get_text_size(text: str, font: int, scale: float, thickness: int) -> Tuple[Tuple[int, int], int]:
+    """Cached cv2.getTextSize
+
+    :return: ((width, height), baseline)
+    :rtype: Tuple[Tuple[int, int], int]
+    """
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+class TextSprite:
+    """Text rendered with cv2.putText into a BGRA patch, kept premultiplied for blending"""
+
+    def __init__(self, text: str, font: int, scale: float, colour: Tuple[int, ...], thickness: int,
+                 line_type: int) -> None:
+        (width, height), baseline = get_text_size(text, font, scale, thickness)
+        margin = thickness + 2  # the strokes and the anti-aliasing go a bit outside of the text size
+        # position of the text origin (bottom left corner of the text) in the patch
+        self.origin = (margin, margin + height)
+        mask = np.zeros((height + baseline + 2 * margin, width + 2 * margin), dtype=np.uint8)
+        cv2.putText(mask, text, self.origin, font, scale, 255, thickness, line_type)
+
+        alpha = mask[:, :, None].astype(np.uint16)
+        colour = np.array(colour[:3], dtype=np.uint16)
+        self._premultiplied = colour * alpha + 127  # + 127 to round the division in draw
+        self._inverse_alpha = 255 - alpha
+
+    def draw(self, image: np.ndarray, org: Tuple[int, int]) -> None:
+        """Blends the text onto the BGR image, at the same place as cv2.putText(image, text, org, ...) would draw it.
+
+        :param image: image to draw to
+        :type image: np.ndarray
+        :param org: bottom left corner of the text in the image
+        :type org: Tuple[int, int]
+        """
+        x, y = org[0] - self.origin[0], org[1] - self.origin[1]
+        height, width = self._inverse_alpha.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, image.shape[1]), min(y + height, image.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+        roi = image[y0:y1, x0:x1]
+        blended = roi * self._inverse_alpha[y0 - y:y1 - y, x0 - x:x1 - x]
+        blended += self._premultiplied[y0 - y:y1 - y, x0 - x:x1 - x]
+        blended //= 255
+        roi[:] = blended
+
+
+class TextCache:
+    """LRU cache of the text sprites, keyed by everything that changes how the text looks"""
+
+    def __init__(self, max_sprites: int = 256) -> None:
+        self._max_sprites = max_sprites
+        self._sprites = OrderedDict()
+
+    def get(self, text: str, font: int, scale: float, colour: Tuple[int, ...], thickness: int = 1,
+            line_type: int = cv2.LINE_8) -> TextSprite:
+        key = (text, font, scale, tuple(colour), thickness, line_type)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = TextSprite(text, font, scale, colour, thickness, line_type)
+            self._sprites[key] = sprite
+            if len(self._sprites) > self._max_sprites:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        return sprite
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+
+_text_cache = TextCache()
+
+
+def draw_text(image: np.ndarray, text: str, org: Tuple[int, int], font: int, scale: float,
+              colour: Tuple[int, ...], thickness: int = 1, line_type: int = cv2.LINE_8) -> None:
+    """Draws the text like cv2.putText, but from the shared cache of pre-rasterised text.
+
+    :param image: BGR image to draw to
+    :type image: np.ndarray
+    :param text: text to draw
+    :type text: str
+    :param org: bottom left corner of the text in the image
+    :type org: Tuple[int, int]
+    :param font: cv2 font face
+    :type font: int
+    :param scale: font scale
+    :type scale: float
+    :param colour: BGR colour
+    :type colour: Tuple[int, ...]
+    :param thickness: thickness of the strokes
+    :type thickness: int
+    :param line_type: cv2 line type
+    :type line_type: int
+    """
+    _text_cache.get(text, font, scale, colour, thickness, line_type).draw(image, org)
@@ -2,8 +2,10 @@
 Authors: Carmen Meinson, Jason Ho and Oluwaponmile Femi-Sunmaila
 Contributors: Andrzej Szablewski, Anelia Gaydardzhieva
 '''
+import queue
+import threading
 from time import perf_counter
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -41,6 +43,10 @@ class View:
         self._current_camera = 0
         self._window_name = config.get_data("general/view/window_name") + " v%s" %config.get_data("general/version")
         self._display_fps = config.get_data("general/view/show_fps")
+        preview_fps = config.get_data("general/view/preview_fps")
+        self._preview_interval = 1 / preview_fps if preview_fps > 0 else 0
+        self._topmost_interval = config.get_data("general/view/topmost_interval")
+        self._next_preview = 0
         self.frames = 0
         self.second = 0
         self.fps = 0
@@ -127,6 +133,13 @@ class View:
         self._closed_by_user = False
         self._window_open = False
 
+        # the window is owned by the render thread, which shows the latest frame put in the single slot mailbox
+        self._render_thread = None
+        self._rendering = False
+        self._mailbox = None
+        self._mailbox_condition = threading.Condition()
+        self._pressed_keys = queue.Queue()
+
 
     def update_display_element(self, name: str, update_args: Dict[str,str] = {}) -> None:
         """Updates a display element, e.g. area of interest element, by passing in 
@@ -164,40 +177,91 @@ class View:
         #if name == "speaker_identification_element":
         #    print("self._display_element_dict[name]",self._display_element_dict[name])
 
-    def update_display(self, frame: np.ndarray) -> None:
+    def update_display(self, frame: np.ndarray) -> int:
         """Takes an image object and loops through all activated DisplayElements, running their update_display method allowing them to draw to the
-        image
+        image, then passes the image to the render thread to be shown. Frames that come sooner than the preview fps allows
+        are not drawn or shown at all, and nothing is done while the view is hidden.
 
         :param frame: image object for the DisplayElement instances to draw to
         :type frame: np.ndarray
+        :return: code of a key pressed in the window since the last call, -1 if none
+        :rtype: int
         """
         if self._hidden:
-            if self._window_open: self.close()
-            return
+            if self._rendering: self.close()
+            return -1
+
+        if self._display_fps:
+            self._draw_fps(frame)  # counts the processed frames, so also the ones not previewed
+
+        now = perf_counter()
+        if now < self._next_preview:
+            return self._get_pressed_key()
+        self._next_preview = max(self._next_preview + self._preview_interval, now)
 
         self.update_display_element("low_light_indicator_element", {})
         self.update_display_element("change_camera_element", {"display":self._change_camera, "index": self._current_camera})
         self.update_display_element("help_message_element", {})
         if self._display_fps:
-            self._draw_fps(frame)
             self.update_display_element("draw_fps_element", {"fps": str(self.fps)})
 
         for display_element in self._display_element_dict.values():
             display_element.update_display(frame)
 
-        cv2.imshow(self._window_name, np.copy(frame))
-        self._window_open = True
+        if not self._rendering:
+            self._start_render_thread()
+        with self._mailbox_condition:
+            self._mailbox = np.copy(frame)  # the camera can hand out the same array again, so the thread gets a copy
+            self._mailbox_condition.notify()
+        return self._get_pressed_key()
+
+    def _get_pressed_key(self) -> int:
+        try:
+            return self._pressed_keys.get_nowait()
+        except queue.Empty:
+            return -1
 
-        # if esc pressed or closed with x
-        pressed_key = cv2.waitKey(1)
-        if pressed_key == 27 or cv2.getWindowProperty(self._window_name, cv2.WND_PROP_VISIBLE) < 1:
-            self._closed_by_user = True
-            return pressed_key
+    def _start_render_thread(self) -> None:
+        self._rendering = True
+        self._render_thread = threading.Thread(target=self._render, daemon=True, name="view-render")
+        self._render_thread.start()
 
-        # Window always on top regardless of activity:
-        if self._head_screen_top is True:
-            cv2.setWindowProperty(self._window_name, cv2.WND_PROP_TOPMOST, 1)
-        return pressed_key
+    def _render(self) -> None:
+        """Render thread loop. Shows the newest frame from the mailbox (older ones are skipped), forwards the pressed keys
+        and checks if the window was closed. The window is kept on top, which is only reapplied every topmost_interval."""
+        next_topmost = 0
+        while True:
+            with self._mailbox_condition:
+                if self._mailbox is None and self._rendering:
+                    self._mailbox_condition.wait(0.02)  # timeout, so that the window keeps responding without new frames
+                if not self._rendering:
+                    break
+                frame, self._mailbox = self._mailbox, None
+
+            if frame is not None:
+                cv2.imshow(self._window_name, frame)
+                self._window_open = True
+            if not self._window_open:
+                continue
+
+            # if esc pressed or closed with x
+            pressed_key = cv2.waitKey(1)
+            if pressed_key != -1:
+                self._pressed_keys.put(pressed_key)
+            if pressed_key == 27 or cv2.getWindowProperty(self._window_name, cv2.WND_PROP_VISIBLE) < 1:
+                self._closed_by_user = True
+                break
+
+            # Window always on top regardless of activity:
+            now = perf_counter()
+            if self._head_screen_top is True and now >= next_topmost:
+                cv2.setWindowProperty(self._window_name, cv2.WND_PROP_TOPMOST, 1)
+                next_topmost = now + self._topmost_interval
+
+        if self._window_open:
+            self._window_open = False
+            cv2.destroyAllWindows() # I only changed that because it gave me the same error that gave Siam
+            print("close: window destroyed")
 
     def update_change_camera(self, val: bool, index: int):
         self._change_camera = val
@@ -222,10 +286,15 @@ class View:
     def show(self) -> None:
         self._hidden = False
 
-    def close(self):
-        self._window_open = False
-        cv2.destroyAllWindows() # I only changed that because it gave me the same error that gave Siam
-        print("close: window destroyed")
+    def close(self, timeout: Optional[float] = 1.0):
+        """Stops the render thread, which destroys the window"""
+        with self._mailbox_condition:
+            self._rendering = False
+            self._mailbox = None
+            self._mailbox_condition.notify()
+        if self._render_thread is not None and self._render_thread is not threading.current_thread():
+            self._render_thread.join(timeout)
+        self._render_thread = None
 
     def was_closed_by_user(self) -> bool:
         return self._closed_by_user
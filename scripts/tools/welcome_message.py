@@ -9,9 +9,6 @@ since keys are limited and the usefulness of this method has not been concluded
 # Standard
 from threading import Lock
 
-# Third party
-from pyautogui import alert
-
 # Local
 from scripts.tools import Config
 
@@ -33,6 +30,7 @@ class WelcomeMsg:
         """
         Triggers a welcome message if enabled
         """
+        from pyautogui import alert  # only imported when the message is actually shown
         welcome_msg = self.config.get_data("general/welcome_msg") # str
         alert(text=welcome_msg, title='Welcome to UCL MotionInput v3.1!', button='OK')
         with lock:
@@ -0,0 +1,174 @@
+import ast
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+from scripts.tools.json_editors import json_editor
+from scripts.tools.json_editors.document_registry import DocumentRegistry
+from scripts.tools.json_editors.json_editor import JSONEditor
+from scripts.tools.json_editors.mode_editor import ModeEditor
+
+
+class FakeAPI:
+    """ Stands in for MotionInputAPI, which needs the camera libraries, the editors are set by the tests """
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+def import_communicator():
+    api_module = types.ModuleType("motioninput_api")
+    api_module.MotionInputAPI = FakeAPI
+    with patch.dict(sys.modules, {"motioninput_api": api_module}):
+        sys.modules.pop("communicator", None)
+        import communicator
+    return communicator
+
+
+communicator = import_communicator()
+
+
+class TestBulkRequests(unittest.TestCase):
+    """ MGET, MUPDATE and GET_SINCE on editors of temporary JSON files """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        registry = patch.object(json_editor, "DOCUMENTS", DocumentRegistry(os.path.join(self.directory, "cache")))
+        registry.start()
+        self.addCleanup(registry.stop)
+        editors = {
+            "config": self._editor(JSONEditor, "config", {"general": {"view": {"window_name": "MI", "preview_fps": 30}}}),
+            "mode": self._editor(ModeEditor, "mode_controller", {"current_mode": "hand", "modes": {
+                "hand": ["click"], "hand_speech": ["click", "speech_clicking"]}}),
+            "gestures": self._editor(JSONEditor, "gestures", {"hand": {}}),
+            "events": self._editor(JSONEditor, "events", {"click": {"type": "ClickPressEvent"}})
+        }
+        editors_patch = patch.dict(communicator.EDITORS, editors)
+        editors_patch.start()
+        self.addCleanup(editors_patch.stop)
+        self.communicator = communicator.Communicator()
+
+    def _editor(self, editor_class, name, data):
+        path = os.path.join(self.directory, name + ".json")
+        with open(path, "w") as file:
+            json.dump(data, file)
+        editor = object.__new__(editor_class)
+        editor.path = path
+        if editor_class is ModeEditor:
+            editor._iter_type = "set"
+        editor._read_data()
+        return editor
+
+    def _request(self, request):
+        out = self.communicator.process_command(request)
+        self.assertTrue(out.startswith("SUCCESS: "), out)
+        return ast.literal_eval(out[len("SUCCESS: "):]) if out.endswith("}") else out
+
+    def _saved(self, name):
+        with open(os.path.join(self.directory, name + ".json")) as file:
+            return json.load(file)
+
+    def test_mget(self):
+        out = self._request('MGET: ["config/general/view/window_name", "mode/current_mode", "mode/modes/hand"]')
+        self.assertEqual(out, {"config/general/view/window_name": "MI", "mode/current_mode": "hand",
+                               "mode/modes/hand": {"click"}})
+
+    def test_mupdate(self):
+        self._request('MUPDATE: {"config/general/view/window_name": "A_new_name!", '
+                      '"config/general/view/preview_fps": 20.5}')
+        self.assertEqual(self._saved("config"), {"general": {"view": {"window_name": "A_new_name!", "preview_fps": 20.5}}})
+
+    def test_mupdate_adds_and_removes_speech_modes(self):
+        self._request('MUPDATE: [{"op": "add", "path": "/mode/modes/head", "value": ["nod"]}, '
+                      '{"op": "replace", "path": "/mode/current_mode", "value": "head"}]')
+        saved = self._saved("mode_controller")
+        self.assertEqual(saved["current_mode"], "head")
+        # the modes are sets, saved in no particular order
+        self.assertEqual({mode: set(events) for mode, events in saved["modes"].items()}, {
+            "hand": {"click"}, "hand_speech": {"click", "speech_clicking"}, "head": {"nod"}, "head_speech": {"nod"}})
+
+        self._request('MUPDATE: [{"op": "remove", "path": "/mode/modes/hand"}]')
+        self.assertEqual(set(self._saved("mode_controller")["modes"]), {"head", "head_speech"})
+
+    def test_mupdate_wrong_type_changes_nothing(self):
+        out = self.communicator.process_command('MUPDATE: {"config/general/view/window_name": "A_new_name!", '
+                                                '"config/general/view/preview_fps": "fast", "mode/current_mode": "x"}')
+        self.assertTrue(out.startswith("ERROR: Wrong type of value for general/view/preview_fps"), out)
+        self.assertEqual(self._request('MGET: ["config/general/view/window_name", "mode/current_mode"]'),
+                         {"config/general/view/window_name": "MI", "mode/current_mode": "hand"})
+        self.assertEqual(self._saved("config")["general"]["view"]["window_name"], "MI")
+
+    def test_mupdate_cannot_add_to_config(self):
+        out = self.communicator.process_command('MUPDATE: [{"op": "add", "path": "/config/general/x", "value": 1}]')
+        self.assertEqual(out, "ERROR: " + communicator.ERRORS["illegal_config_operation"])
+
+    def test_get_since(self):
+        first = self._request("GET_SINCE: ")
+        self.assertTrue(first["full"])
+        self.assertEqual(first["changed"]["config"], self._saved("config"))
+
+        self._request('MUPDATE: {"config/general/view/window_name": "A_new_name!"}')
+        self._request('MUPDATE: [{"op": "remove", "path": "/events/click"}]')
+        out = self._request(f"GET_SINCE: {first['version']}")
+        self.assertFalse(out["full"])
+        self.assertGreater(out["version"], first["version"])
+        self.assertEqual(out["changed"], {"config/general/view/window_name": "A_new_name!"})
+        self.assertEqual(out["removed"], ["events/click"])
+
+        unchanged = self._request(f"GET_SINCE: {out['version']}")
+        self.assertEqual((unchanged["version"], unchanged["changed"], unchanged["removed"]), (out["version"], {}, []))
+
+
+class RecordingAPI:
+    """ Records until told to finish """
+
+    def __init__(self):
+        self.finish = threading.Event()
+        self.recordings = 0
+        self.state = "idle"
+
+    def record_gesture(self, parameter_dict):
+        self.recordings += 1
+        self.state = "recording"
+        self.finish.wait(2)
+        self.state = "done"
+        return "Customize Gesture created"
+
+    def get_record_progress(self):
+        return {"state": self.state}
+
+
+class TestRecordRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = RecordingAPI()
+        api_patch = patch.object(communicator, "api", self.api)
+        api_patch.start()
+        self.addCleanup(api_patch.stop)
+        self.addCleanup(self.api.finish.set)
+        self.communicator = communicator.Communicator()
+
+    def test_one_recording_at_a_time(self):
+        request = "RECORD: {'name': 'wave', 'background': 'True'}"
+        self.assertEqual(self.communicator.process_command(request), "SUCCESS: Recording started")
+        # rejected whether or not the background thread has started recording yet
+        self.assertEqual(self.communicator.process_command(request),
+                         "ERROR: " + communicator.ERRORS["already_recording"])
+        self.assertEqual(self.communicator.process_command("RECORD: {'name': 'wave'}"),
+                         "ERROR: " + communicator.ERRORS["already_recording"])
+
+        self.api.finish.set()
+        self.communicator._record_thread.join(2)
+        self.assertEqual(self.api.recordings, 1)
+        self.assertEqual(self.communicator.process_command(request), "SUCCESS: Recording started")
+
+
+if __name__ == "__main__":
+    unittest.main()
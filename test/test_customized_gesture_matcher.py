@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from scripts.gesture_events.customized_gesture_matcher import CustomizedGestureEngine, FeatureWindow, \
+    key_frame_samples, trace_distances, is_match
+
+
+class FakePosition:
+    def __init__(self, x, y):
+        self._landmarks = {"wrist": np.array([x, y, 0.0]), "middle_base": np.array([x, y - 0.1, 0.0]),
+                           "index_tip": np.array([x, y - 0.2, 0.0])}
+
+    def get_landmark(self, name):
+        return self._landmarks[name]
+
+
+class TestFeatureWindow(unittest.TestCase):
+
+    def test_matches_list_window(self):
+        size = 40
+        samples = key_frame_samples(size)
+        window = FeatureWindow(size)
+        frame_buffer = []
+        for frame in np.random.default_rng(0).normal(0, 3, (100, 3)).cumsum(axis=0):
+            window.append(frame)
+            frame_buffer.append(frame)
+            if len(frame_buffer) > size:
+                frame_buffer.pop(0)
+            self.assertEqual(len(window), len(frame_buffer))
+            if window.is_full():
+                np.testing.assert_allclose(window.take(samples), np.array(frame_buffer)[samples])
+                expected_path = np.abs(np.diff(frame_buffer, axis=0)).sum(axis=0)
+                np.testing.assert_allclose(window.get_path_length(), expected_path)
+
+        window.clear()
+        self.assertEqual(len(window), 0)
+
+
+class TestCustomizedGestureEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = CustomizedGestureEngine("index_tip", 16 / 9)
+        self.positions = [FakePosition(0.2 + 0.01 * i, 0.5) for i in range(60)]
+
+    def _trace(self, positions, window_size):
+        engine = CustomizedGestureEngine("index_tip", 16 / 9)
+        engine.subscribe("trace", np.zeros((15, 3)), window_size)
+        for position in positions[-window_size:]:
+            engine.push(position)
+        key_frames = engine._window.take(key_frame_samples(window_size))
+        return key_frames[1:] - key_frames[0]
+
+    def test_shared_window_per_gesture(self):
+        self.engine.subscribe("short", self._trace(self.positions, 30), 30)
+        self.engine.subscribe("long", -self._trace(self.positions, 60), 60)
+        for i, position in enumerate(self.positions):
+            self.engine.push(position)
+            self.engine.push(position)  # the other events pushing the same frame
+            if i < 29:
+                self.assertIsNone(self.engine.get_match("short"))
+        distance, similarity, still = self.engine.get_match("short")
+        self.assertAlmostEqual(distance, 0)
+        self.assertAlmostEqual(similarity, 1)
+        self.assertFalse(still)
+        self.assertTrue(is_match([distance], [similarity], 5))
+        distance, similarity, still = self.engine.get_match("long")
+        self.assertFalse(is_match([distance], [similarity], 5))
+
+        self.engine.clear()
+        self.assertIsNone(self.engine.get_match("short"))
+        self.engine.unsubscribe("long")
+        self.assertIsNone(self.engine.get_match("long"))
+
+    def test_still_hand(self):
+        self.engine.subscribe("gesture", np.ones((15, 3)), 30)
+        for _ in range(30):
+            self.engine.push(FakePosition(0.5, 0.5))
+        self.assertTrue(self.engine.get_match("gesture")[2])
+
+    def test_trace_distances_broadcast(self):
+        trace = np.stack([np.linspace(1, 30, 15)] * 3, axis=-1)
+        distance, similarity = trace_distances(trace + 0.5, np.stack([trace, -trace]))
+        np.testing.assert_allclose(distance, [np.sqrt(0.75), np.linalg.norm(2 * trace + 0.5, axis=-1).mean()])
+        np.testing.assert_allclose(similarity, [1, -1], rtol=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from scripts.event_mapper import EventPool
+
+
+class FakeGesture:
+    def __init__(self, name, bodypart_name):
+        self._name = name
+        self._bodypart_name = bodypart_name
+
+    def get_name(self):
+        return self._name
+
+    def get_bodypart_name(self):
+        return self._bodypart_name
+
+
+class TestEventPool(unittest.TestCase):
+
+    def setUp(self):
+        with patch("scripts.gesture_events.click_press_event.Config"):
+            from scripts.gesture_events.click_press_event import ClickPressEvent
+            self.event = ClickPressEvent("index_pinch")
+        self.calls = []
+        self.event.set_trigger_functions({"click": lambda: self.calls.append("click"),
+                                          "release": lambda: self.calls.append("release")})
+        self.event.set_bodypart_names({"Right": "hand"})
+        self.gesture = FakeGesture("index_pinch", "Right")
+
+    def _pinch(self):
+        self.event.notify_gesture_activated(self.gesture)
+        if self.event.get_state():
+            self.event.update()
+
+    def test_held_click_fires_after_reuse(self):
+        pool = EventPool(4)
+        self._pinch()
+        self.assertEqual(self.calls, ["click"])
+
+        # removed from the model while the click is held
+        self.event.force_deactivate()
+        pool.put({"click_event": self.event})
+        self.assertEqual(self.calls, ["click", "release"])
+
+        self.assertIs(pool.take("click_event"), self.event)
+        self.assertFalse(self.event.get_state())
+        self._pinch()
+        self.assertEqual(self.calls, ["click", "release", "click"])
+
+    def test_only_reusable_events_are_kept(self):
+        pool = EventPool(4)
+        self.event._reusable = False
+        pool.put({"click_event": self.event})
+        self.assertIsNone(pool.take("click_event"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import math
+import unittest
+
+from scripts.gesture_event_handlers.filters import ExponentialFilter, KalmanFilter, MovingAverageFilter, \
+    OneEuroFilter, create_filter
+
+DT = 1 / 30
+
+
+def step_response(point_filter, frames):
+    """ Filtered points of a step from (0, 0) to (1, -1) on the second frame, one frame every DT seconds """
+    outputs = [point_filter.filter((0, 0), 0)]
+    outputs += [point_filter.filter((1, -1), i * DT) for i in range(1, frames)]
+    return outputs
+
+
+class TestFilters(unittest.TestCase):
+
+    def test_moving_average(self):
+        outputs = step_response(MovingAverageFilter(2, frames=3), 5)
+        self.assertEqual(outputs, [(0, 0), (0.5, -0.5), (2 / 3, -2 / 3), (1, -1), (1, -1)])
+
+    def test_exponential(self):
+        outputs = step_response(ExponentialFilter(2, alpha=0.5), 4)
+        self.assertEqual(outputs, [(0, 0), (0.5, -0.5), (0.75, -0.75), (0.875, -0.875)])
+
+    def test_one_euro_cutoff(self):
+        # with beta = 0 the cutoff is min_cutoff: alpha = 1 / (1 + tau / dt), tau = 1 / (2 pi cutoff)
+        alpha = 1 / (1 + 1 / (2 * math.pi * 1.0) / DT)
+        self.assertAlmostEqual(alpha, 0.17317, places=5)
+        outputs = step_response(OneEuroFilter(2, min_cutoff=1.0, beta=0.0), 2)
+        self.assertAlmostEqual(outputs[1][0], alpha)
+        self.assertAlmostEqual(outputs[1][1], -alpha)
+
+        # the speed (1 / DT, smoothed with d_cutoff) raises the cutoff to min_cutoff + beta * speed
+        speed = alpha / DT
+        cutoff = 1.0 + 0.1 * speed
+        outputs = step_response(OneEuroFilter(2, min_cutoff=1.0, beta=0.1), 2)
+        self.assertAlmostEqual(outputs[1][0], 1 / (1 + 1 / (2 * math.pi * cutoff) / DT))
+        self.assertAlmostEqual(outputs[1][0], 0.24142, places=5)
+
+    def test_step_responses_converge(self):
+        for point_filter in (MovingAverageFilter(2, frames=5), ExponentialFilter(2, alpha=0.3),
+                             OneEuroFilter(2), KalmanFilter(2)):
+            with self.subTest(point_filter=type(point_filter).__name__):
+                outputs = step_response(point_filter, 300)
+                self.assertEqual(outputs[0], (0, 0))
+                # moves towards the new point from the first frame, without jumping straight to it
+                self.assertTrue(0 < outputs[1][0] < 1 and -1 < outputs[1][1] < 0)
+                self.assertAlmostEqual(outputs[-1][0], 1, places=2)
+                self.assertAlmostEqual(outputs[-1][1], -1, places=2)
+
+    def test_kalman_follows_constant_speed(self):
+        point_filter = KalmanFilter(1)
+        for i in range(100):
+            x = point_filter.filter((10 * i,), i * DT)[0]
+        self.assertAlmostEqual(x, 990, delta=0.5)
+
+    def test_reset(self):
+        for point_filter in (MovingAverageFilter(2, frames=3), ExponentialFilter(2), OneEuroFilter(2), KalmanFilter(2)):
+            with self.subTest(point_filter=type(point_filter).__name__):
+                step_response(point_filter, 10)
+                point_filter.reset()
+                # the first point after the reset is returned as it is
+                self.assertEqual(point_filter.filter((5, 6), 1), (5, 6))
+
+    def test_create_filter(self):
+        point_filter = create_filter({"smoothing": 4})
+        self.assertIsInstance(point_filter, MovingAverageFilter)
+        self.assertEqual(len(point_filter._buffer), 4)
+        point_filter = create_filter({"filter": {"type": "one_euro", "min_cutoff": 2.0}, "smoothing": 4}, dims=1)
+        self.assertIsInstance(point_filter, OneEuroFilter)
+        self.assertEqual(point_filter.filter((3,)), (3,))
+        with self.assertRaisesRegex(RuntimeError, "Unknown filter type: median"):
+            create_filter({"filter": {"type": "median"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
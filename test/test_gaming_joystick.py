@@ -0,0 +1,41 @@
+import unittest
+
+from scripts.gesture_event_handlers.gaming_joystick import GamingJoystick, RecordingBackend
+
+
+class TestGamingJoystick(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = RecordingBackend()
+        self.joystick = GamingJoystick(self.backend)
+
+    def test_one_report_per_frame(self):
+        self.joystick.press_action("a")
+        self.joystick.press_action("x")
+        self.joystick.joystick_left_move(100, -100)
+        self.joystick.joystick_right_move(0, 32767)
+        self.assertEqual(len(self.backend.reports), 0)
+        self.assertTrue(self.joystick.flush())
+        self.assertEqual(self.backend.reports, [(frozenset({"a", "x"}), (100, -100), (0, 32767), 0, 0)])
+
+    def test_no_report_without_change(self):
+        self.joystick.press_action("b")
+        self.joystick.flush()
+        self.joystick.press_action("b")
+        self.joystick.joystick_left_move(0, 0)
+        self.assertFalse(self.joystick.flush())
+        self.assertEqual(len(self.backend.reports), 1)
+
+    def test_press_and_release_in_one_frame(self):
+        self.joystick.press_action("y")
+        self.joystick.release_action("y")
+        self.joystick.flush()
+        self.assertEqual([report[0] for report in self.backend.reports], [frozenset({"y"}), frozenset()])
+
+    def test_unknown_button_ignored(self):
+        self.joystick.press_action("not_a_button")
+        self.assertFalse(self.joystick.flush())
+
+
+if __name__ == "__main__":
+    unittest.main()
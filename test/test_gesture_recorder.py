@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from scripts.tools.gesture_recorder import GestureRecorder
+
+SETTINGS = {
+    "gesture_recording/x_threshold": 40, "gesture_recording/frame_width": 640,
+    "gesture_recording/y_threshold": 40, "gesture_recording/frame_height": 480,
+    "gesture_recording/z_threshold": 30, "gesture_recording/frame_depth": 1000
+}
+TOLERANCE = np.array([40 / 640, 40 / 480, 30 / 1000])
+
+
+def reduce_one_by_one(positions, tolerance):
+    """ Reference: every frame compared to the last key frame """
+    runs = []
+    for i, position in enumerate(positions):
+        if i == 0 or (np.abs(position - positions[runs[-1][0]]) >= tolerance).any():
+            runs.append([i, 0])
+        else:
+            runs[-1][1] += 1
+    return [tuple(run) for run in runs]
+
+
+class TestGestureReduction(unittest.TestCase):
+
+    def test_same_as_one_by_one(self):
+        rng = np.random.default_rng(45)
+        for _ in range(200):
+            frames = int(rng.integers(1, 400))
+            # steps of all sizes, so that the runs are of all lengths, also spanning several chunks
+            steps = rng.normal(0, 10 ** rng.uniform(-4.5, -1.5), (frames, int(rng.integers(1, 5)), 3))
+            positions = np.cumsum(steps, axis=0)
+            with self.subTest(frames=frames):
+                self.assertEqual(list(GestureRecorder._reduce_run(positions, TOLERANCE)),
+                                 reduce_one_by_one(positions, TOLERANCE))
+
+    def test_runs_split_at_layout_changes_and_gestures(self):
+        recorder = object.__new__(GestureRecorder)
+        still = {"Left": {"wrist": [0.5, 0.5, 0.0], "index_tip": [0.25, 0.75, 0.1]}}
+        moved = {"Left": {"wrist": [0.6, 0.5, 0.0], "index_tip": [0.25, 0.75, 0.1]}}
+        both = {"Left": {"wrist": [0.5, 0.5, 0.0]}, "Right": {"wrist": [0.5, 0.5, 0.0]}}
+        frames = [still, still, still, still, still, moved, moved, both, both]
+        recorder.recorded_frames = {10 + i: frame for i, frame in enumerate(frames)}
+        recorder.key_frames = {13}  # a gesture starts at frame 13
+        with patch("scripts.tools.gesture_recorder.Config") as config:
+            config.return_value.get_data.side_effect = SETTINGS.__getitem__
+            key_frames, compressed = recorder.recorded_gesture_reduction()
+        self.assertEqual(key_frames, {10: still, 13: still, 15: moved, 17: both})
+        self.assertEqual(compressed, {10: 2, 13: 1, 15: 1, 17: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+# modules imported when MI starts, before any mode is loaded
+STARTUP_MODULES = ["scripts", "scripts.tools", "scripts.gesture_events", "scripts.gesture_event_handlers",
+                   "scripts.gesture_loader", "scripts.event_mapper"]
+# dependencies that should only be imported once a mode that uses them is loaded
+HEAVY_MODULES = ["cv2", "mediapipe", "openvino", "sklearn", "vosk", "sounddevice", "pyautogui", "vgamepad"]
+# budget for the cumulative import time of the startup modules (numpy included)
+IMPORT_TIME_BUDGET_US = 1_000_000
+
+
+def import_with_importtime(module_names):
+    """Imports the modules in a fresh interpreter with -X importtime.
+
+    :return: names of all the modules imported mapped to their cumulative import time in us
+        and the total import time in us
+    """
+    code = "import " + ", ".join(module_names)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_PATH,
+                            capture_output=True, text=True, check=True)
+    import_times = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        import_times[name.strip()] = int(cumulative)
+        if not name.startswith("  "):  # not nested in another import
+            total += int(cumulative)
+    return import_times, total
+
+
+class TestImportTime(unittest.TestCase):
+
+    def setUp(self):
+        self.import_times, self.total_import_time = import_with_importtime(STARTUP_MODULES)
+
+    def test_heavy_modules_not_imported(self):
+        imported = [name for name in HEAVY_MODULES if name in self.import_times]
+        self.assertEqual(imported, [])
+
+    def test_import_time_budget(self):
+        self.assertLess(self.total_import_time, IMPORT_TIME_BUDGET_US)
+
+    def test_registries_are_lazy(self):
+        from scripts.gesture_events import GestureEvents, events
+        from scripts.gesture_loader import MODULES
+
+        self.assertIn("EyeTrackingEvent", events)
+        self.assertIn("eye", MODULES)
+        self.assertFalse(MODULES.is_loaded("eye"))
+        with self.assertRaises(RuntimeError):
+            GestureEvents.get_event("NotAnEvent")
+
+
+if __name__ == "__main__":
+    unittest.main()
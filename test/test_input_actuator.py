@@ -0,0 +1,106 @@
+import time
+import unittest
+
+from scripts.gesture_event_handlers.input_actuator import InputActuator, NoOpBackend
+
+
+class TimedBackend(NoOpBackend):
+    """ Also keeps the time of each action """
+
+    def __init__(self):
+        super().__init__()
+        self.times = []
+
+    def key_down(self, key):
+        self.times.append(time.perf_counter())
+        super().key_down(key)
+
+    def key_up(self, key):
+        self.times.append(time.perf_counter())
+        super().key_up(key)
+
+
+class TestInputActuator(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = NoOpBackend()
+        self.actuator = InputActuator(self.backend)
+
+    def tearDown(self):
+        self.actuator.close()
+
+    def test_order_is_kept(self):
+        for key in "abc":
+            self.actuator.key_down(key)
+            self.actuator.key_up(key)
+        self.assertTrue(self.actuator.wait_until_idle(1))
+        expected = []
+        for key in "abc":
+            expected += [("key_down", (key,)), ("key_up", (key,))]
+        self.assertEqual(self.backend.actions, expected)
+
+    def test_cursor_moves_are_coalesced(self):
+        with self.actuator._condition:  # hold the worker so that all the moves are pending
+            for i in range(10):
+                self.actuator.move_cursor(i, i)
+        self.assertTrue(self.actuator.wait_until_idle(1))
+        self.assertEqual(self.backend.actions, [("move_cursor", (9, 9))])
+        self.assertEqual(self.actuator.get_metrics()["cursor_coalesced"], 9)
+
+    def test_click_after_move_is_at_new_position(self):
+        with self.actuator._condition:
+            self.actuator.move_cursor(1, 1)
+            self.actuator.click()
+            self.actuator.move_cursor(2, 2)
+        self.assertTrue(self.actuator.wait_until_idle(1))
+        # the button is held down for the press duration, the later move happens meanwhile
+        self.assertEqual(self.backend.actions, [("move_cursor", (1, 1)), ("mouse_down", ("left",)),
+                                                ("move_cursor", (2, 2)), ("mouse_up", ("left",))])
+
+    def test_macro_does_not_block(self):
+        start = time.perf_counter()
+        self.actuator.run_macro([(0, "key_down", ("q",)), (0.2, "key_up", ("q",))])
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(self.actuator.wait_until_idle(1))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+        self.assertEqual(self.backend.actions, [("key_down", ("q",)), ("key_up", ("q",))])
+
+    def test_presses_are_held(self):
+        backend = TimedBackend()
+        actuator = InputActuator(backend, press_duration=0.05)
+        self.addCleanup(actuator.close)
+        start = time.perf_counter()
+        actuator.key_press("e", presses=2, interval=0.02)
+        self.assertTrue(actuator.wait_until_idle(1))
+        self.assertEqual(backend.actions, [("key_down", ("e",)), ("key_up", ("e",))] * 2)
+        # down for the press duration, then up for as long plus the interval
+        _, up, second_down, second_up = (action_time - start for action_time in backend.times)
+        self.assertGreaterEqual(up, 0.05)
+        self.assertGreaterEqual(second_down, 0.05 + 0.05 + 0.02)
+        self.assertGreaterEqual(second_up, 0.05 + 0.05 + 0.02 + 0.05)
+
+    def test_close_releases_what_is_held(self):
+        backend = NoOpBackend()
+        actuator = InputActuator(backend, press_duration=10)
+        actuator.key_down("shift")
+        actuator.click("right")
+        actuator.key_press("e", delay=10)  # not due yet, dropped
+        for _ in range(100):
+            if len(backend.actions) == 2:
+                break
+            time.sleep(0.01)
+        actuator.close()
+        self.assertEqual(backend.actions, [("key_down", ("shift",)), ("mouse_down", ("right",)),
+                                           ("key_up", ("shift",)), ("mouse_up", ("right",))])
+
+    def test_metrics(self):
+        self.actuator.key_press("e", presses=3, interval=0.01)
+        self.assertTrue(self.actuator.wait_until_idle(1))
+        metrics = self.actuator.get_metrics()
+        self.assertEqual(metrics["executed"], 6)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreaterEqual(metrics["max_queue_depth"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
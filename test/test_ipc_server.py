@@ -0,0 +1,101 @@
+import asyncio
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import unittest
+
+from scripts.tools.ipc_server import IPCServer, UnixSocketTransport, REQUEST, RESPONSE, PUSH, CLOSED_MESSAGE
+
+HEADER = struct.Struct("<IIB")
+
+
+class FakeCommunicator:
+    def __init__(self):
+        self.requests = []
+
+    def process_command(self, request):
+        self.requests.append(request)
+        if request == "END":
+            return None
+        if request == "SLOW":
+            time.sleep(0.2)
+        return f"SUCCESS: {request}"
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestIPCServer(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "mi.sock")
+        self.communicator = FakeCommunicator()
+
+    def _start(self, codec, push_interval=0.0):
+        server = IPCServer(self.communicator, UnixSocketTransport(self.path), codec, push_interval,
+                           lambda: {"mode": "test"})
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.01)
+        self.addCleanup(thread.join, 2)
+        self.addCleanup(server.stop)
+        return server
+
+    async def _read(self, reader):
+        length, request_id, kind = HEADER.unpack(await reader.readexactly(HEADER.size))
+        return request_id, kind, (await reader.readexactly(length)).decode("utf-8")
+
+    def test_pipelined_requests(self):
+        server = self._start("framed")
+
+        async def talk():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            for request_id, request in enumerate(["SLOW", "GET: mode/ünïcode", "END"], 1):
+                payload = request.encode("utf-8")
+                writer.write(HEADER.pack(len(payload), request_id, REQUEST) + payload)
+            await writer.drain()
+            responses = [await self._read(reader) for _ in range(3)]
+            writer.close()
+            return responses
+
+        responses = asyncio.run(talk())
+        self.assertEqual(responses, [(1, RESPONSE, "SUCCESS: SLOW"), (2, RESPONSE, "SUCCESS: GET: mode/ünïcode"),
+                                     (3, RESPONSE, CLOSED_MESSAGE)])
+        time.sleep(0.1)
+        self.assertFalse(server.is_running())
+
+    def test_status_push(self):
+        self._start("framed", push_interval=0.05)
+
+        async def listen():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            message = await asyncio.wait_for(self._read(reader), 2)
+            writer.close()
+            return message
+
+        request_id, kind, payload = asyncio.run(listen())
+        self.assertEqual((request_id, kind), (0, PUSH))
+        self.assertEqual(json.loads(payload), {"topic": "status", "data": {"mode": "test"}})
+
+    def test_legacy_codec(self):
+        self._start("legacy")
+
+        async def talk():
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            writer.write(struct.pack("<I", 5) + b"hello")
+            await writer.drain()
+            (length,) = struct.unpack("<I", await reader.readexactly(4))
+            response = (await reader.readexactly(length)).decode("utf-8")
+            writer.close()
+            return response
+
+        self.assertEqual(asyncio.run(talk()), "SUCCESS: hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
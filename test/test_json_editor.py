@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from scripts.tools.json_editors import json_editor
+from scripts.tools.json_editors.document_registry import DocumentRegistry
+from scripts.tools.json_editors.json_editor import JSONEditor
+
+
+class TestSharedData(unittest.TestCase):
+    """ Editors of the same file share the data read, but not their unsaved changes """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        registry = patch.object(json_editor, "DOCUMENTS", DocumentRegistry(os.path.join(self.directory, "cache")))
+        registry.start()
+        self.addCleanup(registry.stop)
+        self.path = os.path.join(self.directory, "events.json")
+        with open(self.path, "w") as file:
+            json.dump({"click": {"type": "ClickPressEvent", "args": {"gestures": ["index_pinch"]}}}, file)
+
+    def _editor(self):
+        editor = object.__new__(JSONEditor)
+        editor.path = self.path
+        editor._read_data()
+        return editor
+
+    def test_editors_are_isolated_until_saved(self):
+        reader, writer = self._editor(), self._editor()
+        read = reader.get_all_data()
+        self.assertIs(read, writer.get_all_data())
+
+        writer.update("click/type", "TouchPressEvent")
+        writer.add("click/args", ["middle_pinch"], "gestures")
+        self.assertEqual(reader.get_data("click/type"), "ClickPressEvent")
+        self.assertEqual(read["click"]["args"]["gestures"], ["index_pinch"])
+        with open(self.path) as file:
+            self.assertEqual(json.load(file)["click"]["type"], "ClickPressEvent")
+
+        writer.save()
+        self.assertEqual(reader.get_data("click"), {"type": "TouchPressEvent", "args": {"gestures": ["middle_pinch"]}})
+        # what was read before stays as it was
+        self.assertEqual(read["click"]["type"], "ClickPressEvent")
+
+    def test_discarded_changes_are_not_shared(self):
+        reader, writer = self._editor(), self._editor()
+        writer.update("click/type", "TouchPressEvent")
+        writer.discard_changes()
+        self.assertEqual(writer.get_data("click/type"), "ClickPressEvent")
+        self.assertEqual(self._editor().get_data("click/type"), "ClickPressEvent")
+        self.assertIs(reader.get_all_data(), writer.get_all_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from scripts.tools.json_editors.json_patch import apply_operation, check_type, diff, split_pointer
+
+
+class TestJSONPatch(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {"general": {"view": {"preview_fps": 30, "show_fps": False}, "levels": [0, 0.1]}}
+
+    def test_split_pointer(self):
+        self.assertEqual(split_pointer("/a/b~1c/d~0"), ["a", "b/c", "d~"])
+        self.assertEqual(split_pointer("a/b"), ["a", "b"])
+
+    def test_apply_operations(self):
+        apply_operation(self.data, {"op": "replace", "value": 20.5}, ["general", "view", "preview_fps"])
+        apply_operation(self.data, {"op": "add", "value": "MI"}, ["general", "view", "window_name"])
+        apply_operation(self.data, {"op": "remove"}, ["general", "levels"])
+        self.assertEqual(self.data, {"general": {"view": {"preview_fps": 20.5, "show_fps": False, "window_name": "MI"}}})
+        with self.assertRaises(KeyError):
+            apply_operation(self.data, {"op": "replace", "value": 1}, ["general", "missing"])
+        with self.assertRaises(ValueError):
+            apply_operation(self.data, {"op": "test", "value": True}, ["general", "view", "show_fps"])
+
+    def test_check_type(self):
+        check_type("a", 1, 2.5)
+        check_type("a", [1], (1, 2))
+        with self.assertRaises(TypeError):
+            check_type("a", False, 0)
+        with self.assertRaises(TypeError):
+            check_type("a", {"b": "text"}, {"b": 1})
+
+    def test_diff(self):
+        new = {"general": {"view": {"preview_fps": 30, "show_fps": True}, "camera": {}}}
+        changed, removed = diff(self.data, new, "config")
+        self.assertEqual(changed, {"config/general/view/show_fps": True, "config/general/camera": {}})
+        self.assertEqual(removed, ["config/general/levels"])
+        self.assertEqual(diff(self.data, self.data), ({}, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
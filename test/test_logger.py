@@ -0,0 +1,27 @@
+import logging
+import time
+import unittest
+
+from scripts.tools.logger import RateLimitFilter
+
+
+class TestRateLimitFilter(unittest.TestCase):
+
+    def _record(self, level=logging.WARNING, line=10):
+        return logging.LogRecord("motioninput_api.test", level, __file__, line, "per frame warning", None, None)
+
+    def test_drops_records_of_the_same_call_site(self):
+        rate_limit = RateLimitFilter(interval=0.05, burst=2)
+        let_through = [rate_limit.filter(self._record()) for _ in range(5)]
+        self.assertEqual(let_through, [True, True, False, False, False])
+        self.assertTrue(rate_limit.filter(self._record(line=11)))  # other call site
+        self.assertTrue(rate_limit.filter(self._record(logging.CRITICAL)))
+
+        time.sleep(0.06)
+        record = self._record()
+        self.assertTrue(rate_limit.filter(record))
+        self.assertEqual(record.getMessage(), "per frame warning (3 similar records dropped)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from scripts.tools.overlay_layer import OverlayLayer, create_sprite
+
+
+class TestOverlayLayer(unittest.TestCase):
+
+    def setUp(self):
+        self.layer = OverlayLayer(48, 64)
+        self.frame = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+    def test_blend_matches_add_weighted(self):
+        colour = np.full((10, 20, 3), (0, 255, 0), dtype=np.uint8)
+        mask = np.ones((10, 20), dtype=np.uint8)
+        self.layer.blit(create_sprite(colour, mask, 0.7), 5, 8)
+        expected = self.frame.astype(float)
+        expected[8:18, 5:25] = expected[8:18, 5:25] * (1 - 0.7) + colour * 0.7
+
+        self.layer.composite(self.frame)
+        self.assertLessEqual(np.abs(self.frame - expected).max(), 1)
+
+    def test_only_bbox_is_touched(self):
+        original = self.frame.copy()
+        sprite = create_sprite(np.zeros((4, 4, 3), dtype=np.uint8), np.ones((4, 4)))
+        self.layer.blit(sprite, 60, 46)  # partly outside of the layer
+        self.assertEqual(self.layer.bbox, (60, 46, 64, 48))
+
+        self.layer.composite(self.frame)
+        self.assertTrue((self.frame[46:, 60:] == 0).all())
+        self.frame[46:, 60:] = original[46:, 60:]
+        self.assertTrue((self.frame == original).all())
+
+    def test_transparent_pixels_keep_layer(self):
+        self.layer.blit(create_sprite(np.full((4, 4, 3), 255, dtype=np.uint8), np.ones((4, 4))), 0, 0)
+        mask = np.zeros((4, 4))
+        mask[0, 0] = 1
+        self.layer.blit(create_sprite(np.zeros((4, 4, 3), dtype=np.uint8), mask), 0, 0)
+        self.assertEqual(self.layer.image[0, 0].tolist(), [0, 0, 0, 255])
+        self.assertEqual(self.layer.image[1, 1].tolist(), [255, 255, 255, 255])
+
+        self.layer.clear()
+        self.assertIsNone(self.layer.bbox)
+        self.assertFalse(self.layer.image.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
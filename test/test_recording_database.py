@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from scripts.tools.recording_database import RecordingDatabase
+
+LEFT = {"Left": {"wrist": [0.5, 0.5, 0.0], "index_tip": [0.25, 0.75, 0.125]}}
+BOTH = {"Left": {"wrist": [0.5, 0.5, 0.0]}, "Right": {"wrist": [1.0, 0.0, 0.5]}}
+
+
+class TestRecordingDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = RecordingDatabase(os.path.join(self.directory.name, "MotionInput.db"))
+        self.date = time.strftime("%Y%m%d", time.localtime())
+
+    def tearDown(self):
+        self.db.close_db()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        # frame 1 stands for 2 more frames, the compressed frames of the last frame of a range are not filled in
+        self.db.record_frames([(0, LEFT, 0), (1, LEFT, 2), (2, BOTH, 1), (3, BOTH, 4)])
+        self.db.record_gesture("wave", 0, 3)
+        self.db.record_frames([(4, BOTH, 0)])
+        self.db.record_gesture("other", 4, 4)
+        self.assertEqual(self.db.get_last_line_id(), 4)
+
+        frames = self.db.get_data([self.date], "wave")
+        self.assertEqual(frames, [LEFT] * 4 + [BOTH] * 3)
+        layouts = [layout for layout, _ in self.db.get_frames([self.date], "wave")]
+        self.assertEqual(layouts, [(("Left", ("wrist", "index_tip")),), (("Left", ("wrist",)), ("Right", ("wrist",)))])
+
+    def test_reads_json_records(self):
+        # a day recorded before the landmarks were stored as blobs
+        date = "20220323"
+        cursor = self.db.mycursor
+        cursor.execute(f"CREATE TABLE Records_{date} (frame_id INT, data TEXT, compress INT, PRIMARY KEY (frame_id))")
+        cursor.execute(f"CREATE TABLE Gestures_{date} (gesture_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,"
+                       " gesture_name VARCHAR(255), start INT, end INT)")
+        cursor.executemany(f"INSERT INTO Records_{date} VALUES (?, ?, ?)",
+                           [(0, json.dumps(LEFT), 1), (1, json.dumps(LEFT), 0)])
+        cursor.execute(f"INSERT INTO Gestures_{date} (gesture_name, start, end) VALUES ('gun', 0, 1)")
+        self.db.mydb.commit()
+
+        self.assertEqual(self.db.get_data([date], "gun"), [LEFT] * 3)
+        self.assertEqual(self.db.get_data([date, self.date], "wave"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()